@@ -0,0 +1,236 @@
+"""
+프로세스 내부 메트릭 (Prometheus text exposition 0.0.4 형식으로 /metrics 에 노출).
+
+외부 의존성 없이 카운터/게이지/히스토그램만 구현한다.
+크롤러 스레드(브라우저 풀 루프/폴백 스레드)에서도 기록하므로 메트릭마다 잠금 하나를 둔다.
+기록 비용은 dict 조회 + 덧셈 수준이라 핫패스에 그대로 넣어도 된다.
+"""
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, Iterator, List, Sequence, Tuple
+import asyncio, bisect, threading, time
+
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 초 단위 기본 구간 (DB 쿼리 ~ 크롤링 전체까지)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+def _escape(v) -> str:
+    return str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _num(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(float(v)) if isinstance(v, float) and not v.is_integer() else str(int(v))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> Tuple:
+        return tuple(labels.get(n, "") for n in self.labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        # 라벨 없는 메트릭은 처음부터 0 으로 노출
+        self._values: Dict[Tuple, float] = {} if self.labelnames else {(): 0}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_labels(self.labelnames, k)} {_num(v)}" for k, v in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    @contextmanager
+    def track(self, **labels) -> Iterator[None]:
+        """with 블록 동안 1 올려 둔다 (진행 중 작업 수)."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self, name: str, help: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [구간별 개수..., 합계, 전체 개수]
+        self._values: Dict[Tuple, List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                row[i] += 1
+            row[-2] += value
+            row[-1] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """with 블록의 경과 시간(초)을 기록한다. 예외로 빠져나가도 기록."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def timed(self, **labels):
+        """함수 데코레이터 (async/sync 모두)."""
+        def deco(fn):
+            if asyncio.iscoroutinefunction(fn):
+                @wraps(fn)
+                async def _async(*a, **kw):
+                    with self.time(**labels):
+                        return await fn(*a, **kw)
+                return _async
+
+            @wraps(fn)
+            def _sync(*a, **kw):
+                with self.time(**labels):
+                    return fn(*a, **kw)
+            return _sync
+        return deco
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        out = self.header()
+        for key, row in items:
+            acc = 0
+            for le, n in zip(self.buckets, row):
+                acc += n
+                lbl = _labels(self.labelnames, key, 'le="%s"' % _num(le))
+                out.append(f"{self.name}_bucket{lbl} {int(acc)}")
+            lbl = _labels(self.labelnames, key, 'le="+Inf"')
+            out.append(f"{self.name}_bucket{lbl} {int(row[-1])}")
+            out.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_num(row[-2])}")
+            out.append(f"{self.name}_count{_labels(self.labelnames, key)} {int(row[-1])}")
+        return out
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _add(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(
+        self, name: str, help: str, labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for m in metrics:
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# ---- 공용 메트릭 ----
+HTTP_LATENCY = registry.histogram(
+    "specguard_http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status"),
+)
+HTTP_INFLIGHT = registry.gauge(
+    "specguard_http_requests_in_flight", "처리 중인 HTTP 요청 수",
+)
+STAGE_LATENCY = registry.histogram(
+    "specguard_stage_duration_seconds", "크롤링/LLM 단계별 소요 시간", ("stage",),
+)
+DB_LATENCY = registry.histogram(
+    "specguard_db_query_duration_seconds", "SQL 문장별 실행 시간", ("statement",),
+)
+DB_ERRORS = registry.counter(
+    "specguard_db_query_errors_total", "SQL 실행 실패 수", ("statement",),
+)
+CRAWLS_INFLIGHT = registry.gauge(
+    "specguard_crawls_in_flight", "진행 중인 크롤링 수 (엔진별)", ("engine",),
+)
+CRAWLS_TOTAL = registry.counter(
+    "specguard_crawls_total", "끝난 크롤링 수", ("engine", "outcome"),
+)
+BROWSER_PAGES = registry.gauge(
+    "specguard_browser_pages_open", "열려 있는 브라우저 페이지 수",
+)
+POSTS_TOTAL = registry.counter(
+    "specguard_crawl_posts_total", "글 단위 수집 결과 (fetched/failed/retried/reused/skipped)", ("result",),
+)
+GEMINI_CALLS = registry.counter(
+    "specguard_gemini_calls_total", "Gemini 호출 수", ("model", "outcome"),
+)
+HOST_RATE = registry.gauge(
+    "specguard_crawler_host_rate", "호스트별 현재 초당 요청 한도 (AIMD)", ("host",),
+)
+HOST_CONCURRENCY = registry.gauge(
+    "specguard_crawler_host_concurrency_limit", "호스트별 현재 동시 요청 한도 (AIMD)", ("host",),
+)
+CACHE_LOOKUPS = registry.counter(
+    "specguard_cache_lookups_total", "캐시 조회 결과", ("cache", "result"),
+)
@@ -0,0 +1,107 @@
+"""
+실행 중인 프로세스용 샘플링 프로파일러.
+
+요청이 들어왔을 때만 샘플러 스레드를 띄워 N초 동안 sys._current_frames() 로
+모든 스레드(이벤트 루프, 브라우저 풀 스레드, _worker_thread 실행자, CPU 풀)의 스택을 주기적으로 찍고,
+collapsed stack 형식("스레드;바깥프레임;...;안쪽프레임 개수")으로 돌려준다.
+flamegraph.pl / speedscope 에 그대로 넣을 수 있다. 평소(프로파일 중이 아닐 때)엔 비용이 없다.
+"""
+from collections import Counter
+from typing import Dict, Optional
+import os, sys, threading, time
+
+PROFILER_MAX_SEC = float(os.getenv("PROFILER_MAX_SEC", "60"))
+PROFILER_MAX_HZ = int(os.getenv("PROFILER_MAX_HZ", "250"))
+
+# 이 함수들이 맨 안쪽이면 '대기 중' 스택으로 본다 (이벤트 루프 select, 락/큐 대기)
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+
+
+class ProfilerBusy(Exception):
+    """다른 프로파일이 이미 돌고 있음"""
+    pass
+
+
+_lock = threading.Lock()
+
+
+def _short(path: str) -> str:
+    """app/... 는 패키지 기준 경로, 나머지(표준 라이브러리/서드파티)는 파일 이름만."""
+    norm = path.replace("\\", "/")
+    i = norm.rfind("/app/")
+    if i >= 0:
+        return norm[i + 1:]
+    return norm.rsplit("/", 1)[-1]
+
+
+def _frame_label(code, cache: Dict[object, str]) -> str:
+    label = cache.get(code)
+    if label is None:
+        label = cache[code] = f"{code.co_name} ({_short(code.co_filename)}:{code.co_firstlineno})"
+    return label
+
+
+def sample(seconds: float, hz: int = 100, include_idle: bool = False) -> dict:
+    """
+    seconds 동안 초당 hz 번 모든 스레드의 스택을 찍는다(블로킹 - 스레드에서 호출).
+    {"collapsed": str, "samples": int, "duration_sec": float, "threads": int}
+    """
+    if not _lock.acquire(blocking=False):
+        raise ProfilerBusy("profiler already running")
+    try:
+        seconds = max(0.1, min(float(seconds), PROFILER_MAX_SEC))
+        interval = 1.0 / max(1, min(int(hz), PROFILER_MAX_HZ))
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        labels: Dict[object, str] = {}
+        seen_threads = set()
+        ticks = 0
+
+        start = time.perf_counter()
+        deadline = start + seconds
+        next_tick = start
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                leaf = frame.f_code
+                if not include_idle and (_short(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES:
+                    continue
+                parts = []
+                f: Optional[object] = frame
+                while f is not None:
+                    parts.append(_frame_label(f.f_code, labels))
+                    f = f.f_back
+                thread = names.get(ident, f"thread-{ident}")
+                parts.append(thread.replace(";", ":").replace(" ", "_"))
+                parts.reverse()
+                stacks[";".join(parts)] += 1
+                seen_threads.add(ident)
+            ticks += 1
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # 샘플링이 밀리면 따라잡으려 몰아 찍지 않는다
+                next_tick = time.perf_counter()
+
+        lines = [f"{stack} {n}" for stack, n in stacks.most_common()]
+        return {
+            "collapsed": "\n".join(lines) + ("\n" if lines else ""),
+            "samples": ticks,
+            "duration_sec": round(time.perf_counter() - start, 3),
+            "threads": len(seen_threads),
+        }
+    finally:
+        _lock.release()
@@ -26,17 +26,113 @@ CONF = {
     },
     "list": {
         "max_scrolls": _env_int("CRAWLER_MAX_SCROLLS", 150),
-        # 고정 딜레이(폴백) + 지터 범위(설정 시 우선)
-        "pause_sec": _env_float("CRAWLER_PAUSE_SEC", 1.0),
-        "pause_sec_range": (
-            _env_float("CRAWLER_PAUSE_MIN", 0.8),
-            _env_float("CRAWLER_PAUSE_MAX", 1.6),
-        ),
         "timeout_ms": _env_int("CRAWLER_LIST_TIMEOUT_MS", 25_000),
-        "stagnant_rounds": _env_int("CRAWLER_STAGNANT_ROUNDS", 3),
+        "stagnant_rounds": _env_int("CRAWLER_STAGNANT_ROUNDS", 2),
+        # 스크롤 후 새 글 카드가 붙기를 기다리는 최대 시간
+        "scroll_wait_ms": _env_int("CRAWLER_SCROLL_WAIT_MS", 3000),
     },
     "post": {
         "timeout_ms": _env_int("CRAWLER_POST_TIMEOUT_MS", 20_000),
         "hard_extra_sec": _env_int("CRAWLER_HARD_EXTRA_SEC", 4),
+        # 페이지 준비 판정: selector(DOM 준비 + 셀렉터 등장) | networkidle(기존 방식)
+        "wait_mode": _env_str("CRAWLER_WAIT_MODE", "selector"),
+        "ready_selector": _env_str("CRAWLER_POST_READY_SELECTOR", "article, h1"),
+        "ready_timeout_ms": _env_int("CRAWLER_READY_TIMEOUT_MS", 5000),
+        # 글 페이지 재사용: 한 페이지로 N개 글을 돈 뒤 닫고 새로 연다
+        "page_max_uses": _env_int("CRAWLER_PAGE_MAX_USES", 25),
+    },
+    # 요청 가로채기: allowlist(1st-party 문서/XHR/스크립트만) | legacy(이미지/폰트만 차단) | off
+    "intercept": {
+        "mode": _env_str("CRAWLER_INTERCEPT_MODE", "allowlist"),
+        "allow_types": tuple(
+            t.strip() for t in _env_str(
+                "CRAWLER_ALLOW_RESOURCE_TYPES", "document,xhr,fetch,script"
+            ).split(",") if t.strip()
+        ),
+        # 크롤링 대상 호스트 외에 1st-party 로 볼 도메인(하위 도메인 포함)
+        "first_party": tuple(
+            h.strip().lower() for h in _env_str("CRAWLER_FIRST_PARTY_HOSTS", "velog.io").split(",")
+            if h.strip()
+        ),
+    },
+    # 호스트별 공용 레이트 리미터 (토큰 버킷 + AIMD 동시성)
+    "rate": {
+        "enabled": _env_int("CRAWLER_RATE_ENABLED", 1) == 1,
+        "rate": _env_float("CRAWLER_HOST_RATE", 4.0),          # 초당 요청 (시작값)
+        "burst": _env_float("CRAWLER_HOST_BURST", 8.0),
+        "min_rate": _env_float("CRAWLER_HOST_MIN_RATE", 0.5),
+        "max_rate": _env_float("CRAWLER_HOST_MAX_RATE", 20.0),
+        "concurrency": _env_int("CRAWLER_HOST_CONCURRENCY", 4),  # 동시 요청 (시작값)
+        "min_concurrency": _env_int("CRAWLER_HOST_MIN_CONCURRENCY", 1),
+        "max_concurrency": _env_int("CRAWLER_HOST_MAX_CONCURRENCY", 16),
+        # 응답이 이보다 느리면 혼잡으로 보고 줄인다
+        "target_latency_ms": _env_int("CRAWLER_HOST_TARGET_LATENCY_MS", 3000),
+    },
+    # 크롤러 엔진: auto(HTTP 우선, 실패 시 브라우저) | http | browser
+    "engine": _env_str("CRAWLER_ENGINE", "auto"),
+    # 같은 핸들 동시 크롤링을 하나로 합침
+    "singleflight": _env_int("CRAWLER_SINGLEFLIGHT", 1) == 1,
+    "http": {
+        "graphql_url": _env_str("VELOG_GRAPHQL_URL", "https://v2.velog.io/graphql"),
+        "timeout_sec": _env_float("CRAWLER_HTTP_TIMEOUT_SEC", 15.0),
+        "page_size": _env_int("CRAWLER_HTTP_PAGE_SIZE", 50),
+        "max_pages": _env_int("CRAWLER_HTTP_MAX_PAGES", 100),
+        "max_concurrency": _env_int("CRAWLER_HTTP_MAX_CONCURRENCY", 8),
+    },
+    # 핸들별 글 인덱스(증분 재크롤링)
+    "index": {
+        "enabled": _env_int("CRAWLER_INDEX_ENABLED", 1) == 1,
+        "dir": _env_str("CRAWLER_INDEX_DIR", ".crawl_index"),
+        # 이보다 오래된 인덱스는 무시하고 전체 재수집(수정/삭제 글 반영)
+        "max_age_sec": _env_int("CRAWLER_INDEX_MAX_AGE_SEC", 7 * 24 * 3600),
+        # 브라우저 엔진은 목록에서 수정 여부를 알 수 없으므로, 본문을 받은 지 이보다 오래된
+        # 최근 N일 글은 다시 받아 content_hash 로 바뀌었는지 확인한다 (0이면 재검증 안 함)
+        "revalidate_sec": _env_int("CRAWLER_INDEX_REVALIDATE_SEC", 24 * 3600),
+    },
+    # 목록 단계 날짜 컷오프: 최근 N일(RECENT_WINDOW_DAYS) 밖의 글은 본문을 받지 않는다
+    "cutoff": {
+        "enabled": _env_int("CRAWLER_DATE_CUTOFF_ENABLED", 1) == 1,
+        "days": _env_int("RECENT_WINDOW_DAYS", 365),
+        # 타임존/상대 날짜 오차 여유
+        "margin_days": _env_int("CRAWLER_CUTOFF_MARGIN_DAYS", 2),
+        # 목록에서 컷오프 밖 글이 연속 N개 나오면 스크롤 중단 (UI 전체 글 수를 얻은 경우만)
+        "stop_after_old": _env_int("CRAWLER_STOP_AFTER_OLD", 5),
+    },
+    # 글 단위 재시도 (지수 백오프 + 작업당 재시도 예산 + 저동시성 2차 패스)
+    "retry": {
+        "attempts": _env_int("CRAWLER_POST_ATTEMPTS", 3),
+        "base_backoff_sec": _env_float("CRAWLER_BACKOFF_BASE_SEC", 0.5),
+        "max_backoff_sec": _env_float("CRAWLER_BACKOFF_MAX_SEC", 8.0),
+        "budget": _env_int("CRAWLER_RETRY_BUDGET", 30),
+        "second_pass_concurrency": _env_int("CRAWLER_SECOND_PASS_CONCURRENCY", 1),
+        "second_pass_attempts": _env_int("CRAWLER_SECOND_PASS_ATTEMPTS", 2),
+    },
+    # 작업 단위 체크포인트(실패/재기동 후 이어서 수집)
+    "checkpoint": {
+        "enabled": _env_int("CRAWLER_CHECKPOINT_ENABLED", 1) == 1,
+        "dir": _env_str("CRAWLER_CHECKPOINT_DIR", ".crawl_checkpoint"),
+        # 이보다 오래된 체크포인트는 버리고 처음부터
+        "max_age_sec": _env_int("CRAWLER_CHECKPOINT_MAX_AGE_SEC", 24 * 3600),
+    },
+    # 끝난 크롤링 결과 캐시: 같은 프로필이 여러 이력서에 붙어 있을 때 TTL 안에서는 다시 크롤링하지 않는다
+    "result_cache": {
+        "enabled": _env_int("CRAWL_CACHE_ENABLED", 1) == 1,
+        # memory | disk | off
+        "backend": _env_str("CRAWL_CACHE_BACKEND", "disk").lower(),
+        "ttl_sec": _env_int("CRAWL_CACHE_TTL_SEC", 6 * 3600),
+        "max_entries": _env_int("CRAWL_CACHE_MAX_ENTRIES", 200),
+        "dir": _env_str("CRAWL_CACHE_DIR", ".crawl_cache"),
+    },
+    # 앱 수명주기 동안 유지되는 공유 브라우저 풀
+    "pool": {
+        "enabled": _env_int("CRAWLER_POOL_ENABLED", 1) == 1,
+        "browsers": _env_int("CRAWLER_POOL_BROWSERS", 2),
+        "contexts_per_browser": _env_int("CRAWLER_POOL_CONTEXTS", 2),
+        # 브라우저 하나가 컨텍스트를 N번 내준 뒤 재기동(메모리 누수 방지)
+        "max_uses": _env_int("CRAWLER_POOL_MAX_USES", 50),
+        "launch_timeout_sec": _env_float("CRAWLER_POOL_LAUNCH_TIMEOUT_SEC", 60.0),
+        # 재기동 실패 시 재시도 간격(지수 백오프)
+        "relaunch_backoff_sec": _env_float("CRAWLER_POOL_RELAUNCH_BACKOFF_SEC", 2.0),
+        "relaunch_backoff_max_sec": _env_float("CRAWLER_POOL_RELAUNCH_BACKOFF_MAX_SEC", 300.0),
     },
 }
\ No newline at end of file
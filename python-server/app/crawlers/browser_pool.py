@@ -0,0 +1,245 @@
+import asyncio, logging, sys, threading
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from playwright.async_api import async_playwright
+
+from . import CONF, UA
+
+logger = logging.getLogger(__name__)
+
+
+class PoolUnavailable(Exception):
+    """풀의 브라우저가 모두 기동에 실패한 상태 (호출 측은 호출별 브라우저로 폴백)"""
+    pass
+
+
+class _BrowserSlot:
+    """브라우저 1개와 사용 통계."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser = None
+        self.active = 0        # 현재 내준 컨텍스트 수
+        self.uses = 0          # 기동 이후 내준 컨텍스트 누적 수
+        self.recycling = False
+        self.failures = 0      # 연속 재기동 실패 수 (성공하면 0)
+
+    def healthy(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    앱 수명주기 동안 유지되는 Chromium 풀.
+
+    Playwright 객체는 자신을 만든 이벤트 루프에 묶이므로, 풀은 전용 스레드의
+    이벤트 루프에서 돌고 크롤링 코루틴은 run()으로 그 루프에 제출한다.
+    (Windows에선 해당 루프를 Proactor로 만들어 서브프로세스를 지원)
+    """
+
+    def __init__(self, browsers: int, contexts_per_browser: int, max_uses: int):
+        self.size = max(1, browsers)
+        self.contexts_per_browser = max(1, contexts_per_browser)
+        self.max_uses = max(1, max_uses)
+        self._slots = [_BrowserSlot(i) for i in range(self.size)]
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pw = None
+        self._cond: Optional[asyncio.Condition] = None
+        self._closing = False
+
+    @property
+    def running(self) -> bool:
+        return self._loop is not None and self._loop.is_running()
+
+    @property
+    def available(self) -> bool:
+        """재기동 실패 중이 아닌 슬롯이 하나라도 있으면 True."""
+        return any(slot.failures == 0 for slot in self._slots)
+
+    # ---- 수명주기 (호출 측 루프에서 사용) ----
+
+    async def start(self, timeout: float) -> None:
+        ready = threading.Event()
+
+        def _thread_main():
+            if sys.platform.startswith("win"):
+                self._loop = asyncio.ProactorEventLoop()
+            else:
+                self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+            self._loop.call_soon(ready.set)
+            try:
+                self._loop.run_forever()
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=_thread_main, name="browser-pool", daemon=True)
+        self._thread.start()
+        await asyncio.get_running_loop().run_in_executor(None, ready.wait)
+        try:
+            await asyncio.wait_for(self.run(self._startup()), timeout)
+        except BaseException:
+            await self.stop()
+            raise
+
+    async def stop(self) -> None:
+        if self._loop is None:
+            return
+        try:
+            if self._loop.is_running():
+                await self.run(self._shutdown())
+        except Exception as e:
+            logger.warning("browser pool shutdown error: %s", e)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._thread is not None:
+                await asyncio.get_running_loop().run_in_executor(None, self._thread.join, 10)
+            self._loop, self._thread = None, None
+
+    async def run(self, coro):
+        """코루틴을 풀 루프에서 실행하고 결과를 기다린다(취소 전파)."""
+        fut = asyncio.run_coroutine_threadsafe(coro, self._loop)
+        return await asyncio.wrap_future(fut)
+
+    # ---- 아래는 풀 루프 안에서만 실행 ----
+
+    async def _startup(self) -> None:
+        self._cond = asyncio.Condition()
+        self._pw = await async_playwright().start()
+        for slot in self._slots:
+            await self._launch(slot)
+
+    async def _shutdown(self) -> None:
+        self._closing = True
+        for slot in self._slots:
+            await self._close(slot)
+        if self._pw is not None:
+            await self._pw.stop()
+            self._pw = None
+
+    async def _launch(self, slot: _BrowserSlot) -> None:
+        slot.browser = await self._pw.chromium.launch(headless=True)
+        slot.uses = 0
+
+    async def _close(self, slot: _BrowserSlot) -> None:
+        browser, slot.browser = slot.browser, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+
+    async def _recycle(self, slot: _BrowserSlot) -> None:
+        """
+        사용 한도 초과/연결 끊김 브라우저를 재기동. active == 0 일 때만 호출.
+        실패하면 recycling 상태를 유지한 채 지수 백오프 후 다시 시도한다
+        (_pick 이 바로 다시 재기동을 거는 무한 루프 방지).
+        """
+        if self._closing:
+            return
+        logger.info("recycling pooled browser #%d (uses=%d)", slot.index, slot.uses)
+        try:
+            await self._close(slot)
+            await self._launch(slot)
+            slot.failures = 0
+            slot.recycling = False
+        except Exception as e:
+            slot.failures += 1
+            cfg = CONF["pool"]
+            delay = min(
+                cfg["relaunch_backoff_max_sec"],
+                cfg["relaunch_backoff_sec"] * (2 ** (slot.failures - 1)),
+            )
+            logger.error(
+                "browser #%d relaunch failed (%d in a row), retrying in %.0fs: %s",
+                slot.index, slot.failures, delay, e,
+            )
+            loop = asyncio.get_running_loop()
+            loop.call_later(delay, lambda: loop.create_task(self._recycle(slot)))
+        async with self._cond:
+            self._cond.notify_all()
+
+    def _needs_recycle(self, slot: _BrowserSlot) -> bool:
+        return not slot.healthy() or slot.uses >= self.max_uses
+
+    def _pick(self) -> Optional[_BrowserSlot]:
+        best = None
+        for slot in self._slots:
+            if slot.recycling:
+                continue
+            if self._needs_recycle(slot):
+                # 유휴 상태가 되면 재기동, 그 전까지는 새 컨텍스트를 주지 않음
+                if slot.active == 0:
+                    slot.recycling = True
+                    asyncio.get_running_loop().create_task(self._recycle(slot))
+                continue
+            if slot.active >= self.contexts_per_browser:
+                continue
+            if best is None or slot.active < best.active:
+                best = slot
+        return best
+
+    @asynccontextmanager
+    async def context(self):
+        """풀에서 브라우저를 골라 새 BrowserContext를 내준다."""
+        async with self._cond:
+            while True:
+                slot = self._pick()
+                if slot is not None:
+                    slot.active += 1
+                    slot.uses += 1
+                    break
+                if not self.available:
+                    raise PoolUnavailable("all pooled browsers are failing to launch")
+                await self._cond.wait()
+        ctx = None
+        try:
+            ctx = await slot.browser.new_context(user_agent=UA, viewport=CONF["viewport"])
+            yield ctx
+        finally:
+            if ctx is not None:
+                try:
+                    await ctx.close()
+                except Exception:
+                    pass
+            async with self._cond:
+                slot.active -= 1
+                if slot.active == 0 and self._needs_recycle(slot) and not slot.recycling:
+                    slot.recycling = True
+                    asyncio.get_running_loop().create_task(self._recycle(slot))
+                self._cond.notify_all()
+
+
+_POOL: Optional[BrowserPool] = None
+
+
+def get_pool() -> Optional[BrowserPool]:
+    """
+    기동된 공유 풀. 없거나 모든 브라우저가 재기동 실패 중이면 None
+    (크롤러는 호출마다 브라우저를 띄우는 경로로 폴백).
+    """
+    return _POOL if _POOL is not None and _POOL.running and _POOL.available else None
+
+
+async def start_pool() -> Optional[BrowserPool]:
+    global _POOL
+    cfg = CONF["pool"]
+    if not cfg["enabled"] or _POOL is not None:
+        return _POOL
+    pool = BrowserPool(cfg["browsers"], cfg["contexts_per_browser"], cfg["max_uses"])
+    try:
+        await pool.start(cfg["launch_timeout_sec"])
+    except Exception as e:
+        logger.error("browser pool start failed, falling back to per-crawl launch: %s", e)
+        return None
+    _POOL = pool
+    return pool
+
+
+async def stop_pool() -> None:
+    global _POOL
+    pool, _POOL = _POOL, None
+    if pool is not None:
+        await pool.stop()
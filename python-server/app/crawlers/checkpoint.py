@@ -0,0 +1,125 @@
+"""
+작업 단위 크롤링 체크포인트 (FAILED/재기동 후 이어서 수집).
+
+작업 키(보통 "{resume_id}-{link_id}")마다 두 파일을 둔다.
+- {key}.links.json  : 프로필에서 모은 글 링크 목록 + 목록 날짜 + post_count (스크롤 재수행 방지)
+- {key}.posts.jsonl : 본문까지 받은 글을 한 줄씩 추가 기록
+
+같은 작업이 다시 돌면 기록된 글은 건너뛰고 나머지만 받는다.
+결과 저장(COMPLETED)까지 끝나면 서비스 쪽에서 discard() 로 지운다.
+"""
+from typing import Dict, Iterator, List, Optional, Set
+import json, logging, os, re, time
+
+from . import CONF
+
+logger = logging.getLogger(__name__)
+
+_SAFE_RE = re.compile(r"[^A-Za-z0-9_\-]")
+
+
+class Checkpoint:
+    def __init__(self, key: str, base_dir: Optional[str] = None):
+        self.key = key
+        base = base_dir or CONF["checkpoint"]["dir"]
+        stem = os.path.join(base, _SAFE_RE.sub("_", key))
+        self.links_path = f"{stem}.links.json"
+        self.posts_path = f"{stem}.posts.jsonl"
+        self._fh = None
+
+    def _fresh(self, path: str) -> bool:
+        try:
+            age = time.time() - os.path.getmtime(path)
+        except OSError:
+            return False
+        return age <= CONF["checkpoint"]["max_age_sec"]
+
+    def load_links(self) -> Optional[dict]:
+        """{"links": [...], "post_count": int|None, "dates": {url: 목록 날짜}} 또는 None"""
+        if not self._fresh(self.links_path):
+            return None
+        try:
+            with open(self.links_path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("checkpoint %s unreadable, ignoring: %s", self.links_path, e)
+            return None
+        if not isinstance(data.get("links"), list):
+            return None
+        return data
+
+    def save_links(
+        self, links: List[str], post_count: Optional[int], dates: Optional[Dict[str, str]] = None
+    ) -> None:
+        os.makedirs(os.path.dirname(self.links_path) or ".", exist_ok=True)
+        tmp = f"{self.links_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"links": links, "post_count": post_count, "dates": dates or {}},
+                    f, ensure_ascii=False,
+                )
+            os.replace(tmp, self.links_path)
+        except OSError as e:
+            logger.warning("checkpoint %s save failed: %s", self.links_path, e)
+
+    def iter_posts(self) -> Iterator[dict]:
+        """기록된 글을 하나씩. 마지막 줄이 잘려 있으면(기록 중 종료) 그 줄만 버린다."""
+        if not self._fresh(self.posts_path):
+            return
+        seen: Set[str] = set()
+        try:
+            with open(self.posts_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        p = json.loads(line)
+                    except ValueError:
+                        continue
+                    if p.get("url") and p.get("text") and p["url"] not in seen:
+                        seen.add(p["url"])
+                        yield p
+        except OSError as e:
+            logger.warning("checkpoint %s unreadable, ignoring: %s", self.posts_path, e)
+
+    def load_urls(self) -> Set[str]:
+        """이미 받은 글 URL 만 (본문은 iter_posts 로 필요할 때 흘려 읽는다)"""
+        return {p["url"] for p in self.iter_posts()}
+
+    def append_post(self, post: dict) -> None:
+        try:
+            if self._fh is None:
+                os.makedirs(os.path.dirname(self.posts_path) or ".", exist_ok=True)
+                self._fh = open(self.posts_path, "a", encoding="utf-8")
+            self._fh.write(json.dumps(post, ensure_ascii=False))
+            self._fh.write("\n")
+            self._fh.flush()
+        except OSError as e:
+            logger.warning("checkpoint %s append failed: %s", self.posts_path, e)
+
+    def close(self) -> None:
+        fh, self._fh = self._fh, None
+        if fh is not None:
+            try:
+                fh.close()
+            except OSError:
+                pass
+
+
+def open_checkpoint(key: Optional[str]) -> Optional[Checkpoint]:
+    if not key or not CONF["checkpoint"]["enabled"]:
+        return None
+    return Checkpoint(key)
+
+
+def discard(key: Optional[str]) -> None:
+    """작업이 끝났을 때 체크포인트 파일을 지운다."""
+    ck = open_checkpoint(key)
+    if ck is None:
+        return
+    for path in (ck.links_path, ck.posts_path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning("checkpoint %s remove failed: %s", path, e)
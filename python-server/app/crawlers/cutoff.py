@@ -0,0 +1,18 @@
+"""
+목록 단계 날짜 컷오프.
+
+recent_activity 는 최근 N일(RECENT_WINDOW_DAYS) 글만 쓰므로, 목록에서 이미 날짜가 보이는
+오래된 글은 본문을 받을 필요가 없다. post_count 는 UI/GraphQL 전체 글 수를 그대로 쓴다.
+"""
+from typing import Optional
+
+from . import CONF
+from app.utils.dates import older_than
+
+
+def too_old(raw: Optional[str]) -> bool:
+    """목록/글 날짜가 최근 N일(+여유) 밖인지. 날짜를 모르면 False(수집 대상)."""
+    cfg = CONF["cutoff"]
+    if not cfg["enabled"] or not raw:
+        return False
+    return older_than(raw, cfg["days"] + cfg["margin_days"])
@@ -0,0 +1,157 @@
+"""
+핸들별 글 인덱스 (증분 재크롤링용).
+
+핸들마다 gzip JSONL 파일 하나에 이미 수집한 글을 기록한다.
+각 줄은 {"post": {url, title, published_at, text, tags, content_hash}, "updated_at": ..., "fetched_at": ...}.
+updated_at 은 목록(GraphQL)이 알려 준 수정 시각, fetched_at 은 본문을 실제로 받은 시각(epoch 초).
+재크롤링 시 목록 수집은 이미 인덱싱된 글을 만나면 멈추고(재검증 주기가 된 글이 남았으면 계속),
+새 글(또는 목록 메타로 수정이 확인된 글)만 본문을 다시 받는다.
+목록을 끝까지 받았을 때 목록에 없는 인덱스 글은 삭제된 것으로 보고 인덱스에서 뺀다.
+"""
+from typing import Dict, Iterable, Iterator, Optional
+import gzip, json, logging, os, re, time
+
+from . import CONF
+
+logger = logging.getLogger(__name__)
+
+_SAFE_RE = re.compile(r"[^A-Za-z0-9_]")
+
+
+class PostIndex:
+    def __init__(self, handle: str, base_dir: Optional[str] = None):
+        self.handle = handle
+        base = base_dir or CONF["index"]["dir"]
+        self.path = os.path.join(base, f"{_SAFE_RE.sub('_', handle)}.jsonl.gz")
+
+    def is_fresh(self) -> bool:
+        return self._fresh()
+
+    def _fresh(self) -> bool:
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+        except OSError:
+            return False
+        return age <= CONF["index"]["max_age_sec"]
+
+    def _iter_lines(self) -> Iterator[dict]:
+        if not self._fresh():
+            return
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        yield json.loads(line)
+        except (OSError, ValueError) as e:
+            logger.warning("post index %s unreadable, ignoring: %s", self.path, e)
+
+    def load_meta(self) -> Dict[str, dict]:
+        """url -> {published_at, content_hash, updated_at, fetched_at} (본문 제외)"""
+        out: Dict[str, dict] = {}
+        for row in self._iter_lines():
+            p = row.get("post") or {}
+            if p.get("url"):
+                out[p["url"]] = {
+                    "published_at": p.get("published_at") or "",
+                    "content_hash": p.get("content_hash") or "",
+                    "updated_at": row.get("updated_at"),
+                    "fetched_at": row.get("fetched_at"),
+                }
+        return out
+
+    def iter_posts(self, exclude: Iterable[str] = ()) -> Iterator[dict]:
+        """인덱싱된 글 본문을 순서대로 꺼낸다(exclude의 url은 제외)."""
+        skip = set(exclude)
+        for row in self._iter_lines():
+            p = row.get("post") or {}
+            if p.get("url") and p["url"] not in skip:
+                yield p
+
+    def writer(self, updated_at: Optional[Dict[str, str]] = None) -> "IndexWriter":
+        return IndexWriter(self, updated_at)
+
+    def save(self, posts: Iterable[dict], updated_at: Optional[Dict[str, str]] = None) -> None:
+        """인덱스를 통째로 다시 쓴다(임시 파일 → rename 으로 원자적 교체)."""
+        w = self.writer(updated_at)
+        for p in posts:
+            w.add(p)
+        w.commit()
+
+
+class IndexWriter:
+    """
+    새 인덱스를 임시 파일에 한 줄씩 써 두었다가 commit() 때 원자적으로 교체한다.
+    글 본문을 메모리에 모아 두지 않고 크롤링하면서 바로 기록하기 위함.
+    """
+
+    def __init__(self, index: PostIndex, updated_at: Optional[Dict[str, str]] = None):
+        self.index = index
+        self.updated_at = updated_at or {}
+        self._tmp = f"{index.path}.{os.getpid()}.{id(self)}.tmp"
+        self._fh = None
+        self._failed = False
+
+    def add(self, post: dict, fetched_at: Optional[float] = None) -> None:
+        """fetched_at 이 없으면 지금 받은 글로 본다(재사용 글은 원래 시각을 넘긴다)."""
+        if self._failed:
+            return
+        try:
+            if self._fh is None:
+                os.makedirs(os.path.dirname(self.index.path) or ".", exist_ok=True)
+                self._fh = gzip.open(self._tmp, "wt", encoding="utf-8", compresslevel=6)
+            row = {
+                "post": post,
+                "updated_at": self.updated_at.get(post.get("url")),
+                "fetched_at": fetched_at or time.time(),
+            }
+            self._fh.write(json.dumps(row, ensure_ascii=False))
+            self._fh.write("\n")
+        except (OSError, ValueError) as e:
+            # ValueError: 취소로 abort() 가 먼저 파일을 닫은 뒤 스레드에서 늦게 도착한 쓰기
+            logger.warning("post index %s write failed: %s", self.index.path, e)
+            self._failed = True
+
+    def commit(self) -> None:
+        if self._fh is None and not self._failed:
+            # 쓸 글이 하나도 없었음 → 기존 인덱스 유지
+            return
+        try:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
+            if not self._failed:
+                os.replace(self._tmp, self.index.path)
+                return
+        except OSError as e:
+            logger.warning("post index %s save failed: %s", self.index.path, e)
+        self.abort()
+
+    def abort(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except OSError:
+                pass
+            self._fh = None
+        try:
+            os.remove(self._tmp)
+        except OSError:
+            pass
+
+
+def needs_revalidation(meta: dict, now: Optional[float] = None) -> bool:
+    """본문을 받은 지 revalidate_sec 가 지난 인덱스 글인지 (fetched_at 이 없는 예전 줄도 포함)."""
+    max_age = CONF["index"]["revalidate_sec"]
+    if max_age <= 0:
+        return False
+    fetched_at = meta.get("fetched_at")
+    if not fetched_at:
+        return True
+    return (now or time.time()) - float(fetched_at) > max_age
+
+
+def open_index(handle: str) -> Optional[PostIndex]:
+    if not handle or not CONF["index"]["enabled"]:
+        return None
+    return PostIndex(handle)
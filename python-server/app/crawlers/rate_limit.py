@@ -0,0 +1,164 @@
+"""
+호스트별 공용 레이트 리미터.
+
+모든 크롤링(브라우저 풀 루프, 폴백 스레드 루프, HTTP 엔진의 메인 루프)이 한 인스턴스를
+공유하므로 동기화는 threading.Lock 으로 하고, 대기는 각자의 루프에서 asyncio.sleep 으로 한다.
+
+- 토큰 버킷: 초당 rate 개, 최대 burst 개까지 모아 둠
+- 동시성 한도(limit): AIMD
+    성공 + 목표 지연 이내 → limit += 1/limit, rate 조금 증가 (가산 증가)
+    429/5xx/예외/목표 지연 초과 → limit, rate 절반 (승법 감소)
+"""
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import asyncio, threading, time
+
+from . import CONF
+from app.core.metrics import HOST_RATE, HOST_CONCURRENCY
+
+_DECREASE = 0.5
+_EWMA_ALPHA = 0.2
+# 같은 혼잡 신호가 몰려 올 때 한 번만 줄이도록 두는 간격
+_DECREASE_COOLDOWN_SEC = 1.0
+
+
+class ThrottledError(Exception):
+    """대상 서버가 429/5xx 로 응답함 (재시도 대상)"""
+    pass
+
+
+class _Ticket:
+    __slots__ = ("status",)
+
+    def __init__(self):
+        self.status: Optional[int] = None
+
+
+class HostLimiter:
+    def __init__(self, host: str, cfg: dict):
+        self.host = host
+        self.cfg = cfg
+        self.rate = float(cfg["rate"])
+        self.limit = float(cfg["concurrency"])
+        self.tokens = float(cfg["burst"])
+        self.inflight = 0
+        self.ewma_latency_ms = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.throttled = 0
+        self._last = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+        self._export()
+
+    def _export(self) -> None:
+        # AIMD 조정 결과를 /metrics 로 (동시성은 try_acquire 가 실제로 쓰는 정수 한도)
+        HOST_RATE.set(self.rate, host=self.host)
+        HOST_CONCURRENCY.set(int(self.limit), host=self.host)
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.cfg["burst"], self.tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def try_acquire(self) -> float:
+        """획득하면 0, 아니면 다시 시도하기까지 기다릴 초."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if self.inflight >= int(self.limit):
+                return 0.05
+            if self.tokens < 1.0:
+                return max(0.01, (1.0 - self.tokens) / self.rate)
+            self.tokens -= 1.0
+            self.inflight += 1
+            return 0.0
+
+    def release(self, latency_sec: float, status: Optional[int], failed: bool) -> None:
+        cfg = self.cfg
+        latency_ms = latency_sec * 1000
+        congested = failed or (status is not None and (status == 429 or status >= 500))
+        slow = latency_ms > cfg["target_latency_ms"]
+        with self._lock:
+            self.inflight -= 1
+            self.requests += 1
+            self.ewma_latency_ms = (
+                latency_ms if self.requests == 1
+                else (1 - _EWMA_ALPHA) * self.ewma_latency_ms + _EWMA_ALPHA * latency_ms
+            )
+            if congested:
+                self.errors += 1
+                if status == 429:
+                    self.throttled += 1
+            now = time.monotonic()
+            if congested or slow:
+                if now - self._last_decrease >= _DECREASE_COOLDOWN_SEC:
+                    self._last_decrease = now
+                    self.limit = max(cfg["min_concurrency"], self.limit * _DECREASE)
+                    self.rate = max(cfg["min_rate"], self.rate * _DECREASE)
+            else:
+                self.limit = min(cfg["max_concurrency"], self.limit + 1.0 / max(self.limit, 1.0))
+                self.rate = min(cfg["max_rate"], self.rate + 0.1)
+            self._export()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "rate_per_sec": round(self.rate, 3),
+                "concurrency_limit": round(self.limit, 2),
+                "inflight": self.inflight,
+                "ewma_latency_ms": round(self.ewma_latency_ms, 1),
+                "requests": self.requests,
+                "errors": self.errors,
+                "throttled": self.throttled,
+            }
+
+
+class RateLimiter:
+    def __init__(self, cfg: dict):
+        self.cfg = cfg
+        self._hosts: Dict[str, HostLimiter] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> HostLimiter:
+        host = (urlparse(url).netloc or "").lower()
+        with self._lock:
+            lim = self._hosts.get(host)
+            if lim is None:
+                lim = self._hosts[host] = HostLimiter(host, self.cfg)
+            return lim
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """
+        요청 하나를 감싼다. 블록 안에서 ticket.status 에 HTTP 상태코드를 넣어 주면
+        지연/상태를 보고 호스트 한도를 조정한다.
+        """
+        ticket = _Ticket()
+        if not self.cfg["enabled"]:
+            yield ticket
+            return
+        lim = self.for_url(url)
+        while True:
+            wait = lim.try_acquire()
+            if wait == 0.0:
+                break
+            await asyncio.sleep(wait)
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield ticket
+        except Exception:
+            # 취소(CancelledError)는 혼잡 신호가 아니므로 제외
+            failed = True
+            raise
+        finally:
+            lim.release(time.perf_counter() - start, ticket.status, failed)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hosts = list(self._hosts.values())
+        return {h.host: h.snapshot() for h in hosts}
+
+
+limiter = RateLimiter(CONF["rate"])
@@ -0,0 +1,286 @@
+"""
+끝난 크롤링 결과(글 목록) 캐시.
+
+같은 공개 프로필이 여러 이력서에 붙어 있으면(여러 공고에 지원) 매번 처음부터 크롤링하게 된다.
+키(보통 "velog:@handle")마다 마지막으로 끝난 크롤링의 글 전체와 메타(post_count, 통계)를 두고,
+TTL 안에서는 크롤링 없이 그대로 돌려준다.
+
+- memory : 프로세스 메모리 LRU (글 본문을 그대로 들고 있음)
+- disk   : {dir}/{키 해시}.jsonl.gz + .json(메타). 조회 때 메타 파일 mtime 을 갱신해 LRU 로 쓴다.
+- off    : 사용 안 함
+항목 수가 max_entries 를 넘으면 가장 오래 안 쓴 것부터 지운다.
+"""
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Tuple
+import gzip, hashlib, json, logging, os, threading, time
+
+from . import CONF
+from app.core.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+Hit = Tuple[float, dict, Iterator[dict]]   # (나이 초, 메타, 글 이터레이터)
+
+
+def _strip(meta: dict) -> dict:
+    return {k: v for k, v in meta.items() if k != "posts"}
+
+
+class _MemoryBackend:
+    def __init__(self, ttl: int, max_entries: int):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, Tuple[float, dict, List[dict]]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Hit]:
+        now = time.time()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            created_at, meta, posts = item
+            if now - created_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return now - created_at, dict(meta), iter(posts)
+
+    def put(self, key: str, meta: dict, posts: List[dict]) -> None:
+        with self._lock:
+            self._data[key] = (time.time(), _strip(meta), posts)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def writer(self, key: str) -> "_MemoryWriter":
+        return _MemoryWriter(self, key)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class _MemoryWriter:
+    def __init__(self, backend: _MemoryBackend, key: str):
+        self._backend = backend
+        self._key = key
+        self._posts: List[dict] = []
+        self._urls = set()
+
+    def add(self, post: dict) -> None:
+        if post.get("url") in self._urls:
+            return
+        self._urls.add(post.get("url"))
+        self._posts.append(post)
+
+    def commit(self, meta: dict) -> None:
+        self._backend.put(self._key, meta, self._posts)
+
+    def abort(self) -> None:
+        self._posts = []
+
+
+class _DiskBackend:
+    def __init__(self, base_dir: str, ttl: int, max_entries: int):
+        self.dir = base_dir
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+
+    def _stem(self, key: str) -> str:
+        name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.dir, name)
+
+    def get(self, key: str) -> Optional[Hit]:
+        stem = self._stem(key)
+        try:
+            with open(f"{stem}.json", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("crawl cache %s unreadable, ignoring: %s", stem, e)
+            return None
+        if meta.get("key") != key or not os.path.exists(f"{stem}.jsonl.gz"):
+            return None
+        age = time.time() - float(meta.get("created_at") or 0)
+        if age > self.ttl:
+            self._remove_stem(stem)
+            return None
+        try:
+            os.utime(f"{stem}.json")
+        except OSError:
+            pass
+        return age, meta.get("meta") or {}, self._iter_posts(f"{stem}.jsonl.gz")
+
+    def _iter_posts(self, path: str) -> Iterator[dict]:
+        # 열어 둔 파일은 교체(os.replace)돼도 끝까지 읽힌다
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+
+    def remove(self, key: str) -> None:
+        self._remove_stem(self._stem(key))
+
+    def _remove_stem(self, stem: str) -> None:
+        for path in (f"{stem}.json", f"{stem}.jsonl.gz"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("crawl cache %s remove failed: %s", path, e)
+
+    def writer(self, key: str) -> "_DiskWriter":
+        return _DiskWriter(self, key)
+
+    def _entries(self) -> List[Tuple[float, str]]:
+        out = []
+        try:
+            names = os.listdir(self.dir)
+        except OSError:
+            return out
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.dir, name)
+            try:
+                out.append((os.path.getmtime(path), path[: -len(".json")]))
+            except OSError:
+                continue
+        return out
+
+    def evict(self) -> None:
+        with self._lock:
+            entries = sorted(self._entries())
+            for _, stem in entries[: max(0, len(entries) - self.max_entries)]:
+                self._remove_stem(stem)
+
+    def size(self) -> int:
+        return len(self._entries())
+
+
+class _DiskWriter:
+    """글을 임시 파일에 바로 써 두었다가 commit() 때 원자적으로 교체한다(본문을 메모리에 모으지 않음)."""
+
+    def __init__(self, backend: _DiskBackend, key: str):
+        self._backend = backend
+        self._key = key
+        self._stem = backend._stem(key)
+        self._tmp = f"{self._stem}.{os.getpid()}.{id(self)}.tmp"
+        self._fh = None
+        self._failed = False
+        self._urls = set()
+
+    def add(self, post: dict) -> None:
+        if self._failed or post.get("url") in self._urls:
+            return
+        self._urls.add(post.get("url"))
+        try:
+            if self._fh is None:
+                os.makedirs(self._backend.dir, exist_ok=True)
+                self._fh = gzip.open(self._tmp, "wt", encoding="utf-8", compresslevel=6)
+            self._fh.write(json.dumps(post, ensure_ascii=False))
+            self._fh.write("\n")
+        except OSError as e:
+            logger.warning("crawl cache %s write failed: %s", self._stem, e)
+            self._failed = True
+
+    def commit(self, meta: dict) -> None:
+        if self._failed:
+            self.abort()
+            return
+        try:
+            if self._fh is None:
+                # 글이 없는 프로필도 결과로 캐시한다
+                os.makedirs(self._backend.dir, exist_ok=True)
+                self._fh = gzip.open(self._tmp, "wt", encoding="utf-8")
+            self._fh.close()
+            self._fh = None
+            os.replace(self._tmp, f"{self._stem}.jsonl.gz")
+            meta_tmp = f"{self._stem}.json.{os.getpid()}.tmp"
+            with open(meta_tmp, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"key": self._key, "created_at": time.time(), "meta": _strip(meta)},
+                    f, ensure_ascii=False,
+                )
+            os.replace(meta_tmp, f"{self._stem}.json")
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("crawl cache %s save failed: %s", self._stem, e)
+            self.abort()
+            return
+        self._backend.evict()
+
+    def abort(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            except OSError:
+                pass
+            self._fh = None
+        try:
+            os.remove(self._tmp)
+        except OSError:
+            pass
+
+
+class CrawlResultCache:
+    def __init__(self, conf: Optional[dict] = None):
+        conf = conf or CONF["result_cache"]
+        self._conf = conf
+        self.backend_name = conf["backend"]
+        self.ttl = conf["ttl_sec"]
+        if self.backend_name == "memory":
+            self._backend = _MemoryBackend(self.ttl, conf["max_entries"])
+        elif self.backend_name == "disk":
+            self._backend = _DiskBackend(conf["dir"], self.ttl, conf["max_entries"])
+        else:
+            self._backend = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        # 실행 중에 끌 수 있도록 매번 설정을 본다 (벤치 등)
+        return self._conf.get("enabled", True) and self._backend is not None and self.ttl > 0
+
+    def lookup(self, key: str) -> Optional[Hit]:
+        """TTL 안의 결과가 있으면 (나이 초, 메타, 글 이터레이터). 디스크 백엔드는 블로킹 I/O."""
+        if not self.enabled:
+            return None
+        hit = self._backend.get(key)
+        if hit is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        CACHE_LOOKUPS.inc(cache="crawl_result", result="miss" if hit is None else "hit")
+        return hit
+
+    def writer(self, key: str):
+        """크롤링하면서 글을 add() 하고, 성공하면 commit(meta), 실패하면 abort()."""
+        if not self.enabled:
+            return None
+        return self._backend.writer(key)
+
+    def invalidate(self, key: str) -> None:
+        if self._backend is not None:
+            self._backend.remove(key)
+
+    def stats(self) -> dict:
+        return {
+            "backend": self.backend_name if self.enabled else "off",
+            "ttl_sec": self.ttl,
+            "entries": self._backend.size() if self._backend is not None else 0,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+result_cache = CrawlResultCache()
@@ -0,0 +1,148 @@
+"""
+글 단위 재시도 정책 (두 엔진 공용).
+
+- 1차: 설정된 동시성으로 받으면서 실패한 글은 지수 백오프(+지터)로 몇 번 더 시도
+- 2차: 그래도 실패한 글만 모아 낮은 동시성으로 한 번 더
+- 작업 단위 재시도 예산: 한 작업에서 쓸 수 있는 재시도 총량. 바닥나면 더 기다리지 않고 실패 처리
+- 404 같은 영구 오류는 재시도하지 않는다
+결과 수치(fetched/failed/retried)는 crawl 결과의 "stats" 로 올라가 payload 에 함께 저장된다.
+"""
+from typing import Awaitable, Callable, Iterable, List, Optional
+import asyncio, logging, random
+
+from . import CONF
+
+logger = logging.getLogger(__name__)
+
+
+def backoff_delay(attempt: int) -> float:
+    """attempt(0부터) 번째 재시도 전 대기 시간. 지수 백오프 + 지터(상한의 절반~상한)."""
+    cfg = CONF["retry"]
+    cap = min(cfg["max_backoff_sec"], cfg["base_backoff_sec"] * (2 ** attempt))
+    return random.uniform(cap / 2, cap)
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """HTTP 4xx(429 제외)는 다시 시도해도 같으므로 제외."""
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int) and 400 <= status < 500 and status != 429:
+        return False
+    return True
+
+
+class FetchStats:
+    def __init__(self):
+        self.fetched = 0
+        self.failed = 0
+        self.retried = 0
+        self.reused = 0          # 인덱스/체크포인트에서 그대로 가져온 글
+        self.skipped = 0         # 목록 날짜가 컷오프 밖이라 받지 않은 글
+        self.revalidated = 0     # 인덱스에 있던 글을 다시 받아 확인한 수
+        self.changed = 0         # 그중 content_hash 가 달라진(수정된) 글
+        self.failed_urls: List[str] = []
+
+    def as_dict(self) -> dict:
+        return {
+            "fetched": self.fetched,
+            "failed": self.failed,
+            "retried": self.retried,
+            "reused": self.reused,
+            "skipped": self.skipped,
+            "revalidated": self.revalidated,
+            "changed": self.changed,
+        }
+
+
+class RetryBudget:
+    """한 작업 안에서만 쓰는 카운터라 잠금 없이 둔다(같은 루프에서만 접근)."""
+
+    def __init__(self, total: int):
+        self.remaining = total
+
+    def take(self) -> bool:
+        if self.remaining <= 0:
+            return False
+        self.remaining -= 1
+        return True
+
+
+async def fetch_all(
+    urls: Iterable[str],
+    fetch_one: Callable[[str], Awaitable[Optional[dict]]],
+    concurrency: int,
+    stats: FetchStats,
+    budget: Optional[RetryBudget] = None,
+    on_post: Optional[Callable[[dict], Awaitable[None]]] = None,
+) -> List[dict]:
+    """
+    fetch_one(url) → post dict(성공) / None(본문 없음, 재시도 안 함) / 예외(재시도 대상).
+    성공한 글 목록을 돌려주고 stats 를 채운다.
+    on_post 가 있으면 목록에 모으지 않고 성공할 때마다 넘긴다(빈 목록 반환).
+    """
+    cfg = CONF["retry"]
+    budget = budget or RetryBudget(cfg["budget"])
+    out: List[dict] = []
+    retry_later: List[str] = []
+
+    async def _attempt(u: str, attempts: int) -> bool:
+        """True: 끝(성공/빈 본문/영구 실패), False: 다음 패스로 넘길 실패"""
+        for n in range(attempts):
+            if n > 0:
+                if not budget.take():
+                    return False
+                stats.retried += 1
+                await asyncio.sleep(backoff_delay(n - 1))
+            try:
+                post = await fetch_one(u)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if not is_retryable(e):
+                    stats.failed += 1
+                    stats.failed_urls.append(u)
+                    return True
+                logger.debug("fetch failed (attempt %d) %s: %s", n + 1, u, e)
+                continue
+            if post is None:
+                stats.failed += 1
+                stats.failed_urls.append(u)
+            else:
+                stats.fetched += 1
+                if on_post is not None:
+                    await on_post(post)
+                else:
+                    out.append(post)
+            return True
+        return False
+
+    async def _run(targets: List[str], limit: int, attempts: int, failed: List[str]):
+        sem = asyncio.Semaphore(max(1, limit))
+
+        async def _one(u: str):
+            async with sem:
+                if not await _attempt(u, attempts):
+                    failed.append(u)
+
+        await asyncio.gather(*(_one(u) for u in targets))
+
+    # 1차 패스
+    await _run(list(urls), concurrency, cfg["attempts"], retry_later)
+
+    # 2차 패스: 남은 실패를 낮은 동시성으로 (예산이 허락하는 만큼만)
+    if retry_later:
+        second = [u for u in retry_later if budget.take()]
+        still: List[str] = retry_later[len(second):]
+        if second:
+            stats.retried += len(second)
+            await asyncio.sleep(backoff_delay(cfg["attempts"]))
+            await _run(
+                second, cfg["second_pass_concurrency"], cfg["second_pass_attempts"], still
+            )
+        retry_later = still
+
+    for u in retry_later:
+        stats.failed += 1
+        stats.failed_urls.append(u)
+    if stats.failed:
+        logger.warning("%d post(s) failed after retries (retried=%d)", stats.failed, stats.retried)
+    return out
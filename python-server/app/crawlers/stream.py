@@ -0,0 +1,135 @@
+"""
+크롤링 결과를 글 단위로 흘려보내기 위한 도구.
+
+- PostSink  : 크롤러 안에서 글 하나가 확정될 때마다 인덱스 파일에 바로 쓰고
+              콜백(스트리밍) 또는 리스트(기존 반환 방식)로 넘긴다.
+              인덱스 gzip 읽기/쓰기는 동기 I/O 라 스레드에서 한다(HTTP 엔진은 메인 루프에서 돈다).
+- PostStream: 크롤러(브라우저 풀 루프/폴백 스레드 루프/메인 루프 어디든) → 소비자 루프로
+              글을 넘기는 유한 큐. 가득 차면 크롤러 쪽 put 이 기다린다(메모리 상한).
+"""
+from itertools import islice
+from typing import Awaitable, Callable, Dict, Optional, Set
+import asyncio
+
+from .post_index import PostIndex
+
+# 인덱스에서 재사용할 글을 스레드에서 한 번에 읽어 올 개수
+_INDEX_READ_BATCH = 16
+
+
+class PostSink:
+    def __init__(
+        self,
+        index: Optional[PostIndex],
+        known: Dict[str, dict],
+        on_post: Optional[Callable[[dict], Awaitable[None]]] = None,
+        updated_at: Optional[Dict[str, str]] = None,
+    ):
+        self.on_post = on_post
+        self.posts: list = []          # on_post 가 없을 때만 채운다
+        self.count = 0
+        self._index = index
+        self._known = known
+        self._writer = None
+        if index is not None:
+            stamps = {u: m.get("updated_at") for u, m in known.items()}
+            stamps.update(updated_at or {})
+            self._writer = index.writer(stamps)
+        self._urls: Set[str] = set()
+        # 글 추가는 동시에 불릴 수 있는데(fetch_all 의 on_post) 압축 스트림은 스레드 안전하지 않다
+        self._write_lock = asyncio.Lock()
+
+    async def emit(self, post: dict, fetched_at: Optional[float] = None) -> None:
+        self._urls.add(post["url"])
+        if self._writer is not None:
+            async with self._write_lock:
+                await asyncio.to_thread(self._writer.add, post, fetched_at)
+        self.count += 1
+        if self.on_post is not None:
+            await self.on_post(post)
+        else:
+            self.posts.append(post)
+
+    async def emit_index_rest(self) -> None:
+        """이번에 새로 받지 않은 인덱스 글을 그대로 재사용한다."""
+        if self._index is None:
+            return
+        rest = self._index.iter_posts(exclude=set(self._urls))
+        while True:
+            # 전부 읽어 두지 않고 조금씩 (작업당 메모리 상한 유지)
+            batch = await asyncio.to_thread(list, islice(rest, _INDEX_READ_BATCH))
+            if not batch:
+                break
+            for p in batch:
+                if p["url"] not in self._known:
+                    continue    # 크롤러가 삭제된 글로 판정해 known 에서 뺀 글
+                # 본문을 받은 시각은 원래 값 유지 (재검증 주기 계산용)
+                await self.emit(p, (self._known.get(p["url"]) or {}).get("fetched_at"))
+
+    def commit(self) -> None:
+        if self._writer is not None:
+            self._writer.commit()
+            self._writer = None
+
+    def abort(self) -> None:
+        if self._writer is not None:
+            self._writer.abort()
+            self._writer = None
+
+
+class StreamAbandoned(Exception):
+    """소비자가 먼저 끝나(실패/취소) 더 받을 필요가 없음"""
+    pass
+
+
+_END = object()
+
+
+class PostStream:
+    """
+    소비자 루프에서 만들고 `async for` 로 읽는다. put 은 어느 루프에서 불러도 된다.
+    같은 URL 은 한 번만 넘긴다(HTTP 엔진이 일부 흘린 뒤 브라우저로 폴백하는 경우).
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self._loop = asyncio.get_running_loop()
+        self._q: asyncio.Queue = asyncio.Queue(max(1, maxsize))
+        self._seen: Set[str] = set()
+        self._error: Optional[BaseException] = None
+        self._abandoned = False
+
+    async def put(self, post: dict) -> None:
+        if self._abandoned:
+            raise StreamAbandoned()
+        url = post.get("url")
+        if url in self._seen:
+            return
+        self._seen.add(url)
+        if asyncio.get_running_loop() is self._loop:
+            await self._q.put(post)
+        else:
+            fut = asyncio.run_coroutine_threadsafe(self._q.put(post), self._loop)
+            await asyncio.wrap_future(fut)
+
+    async def close(self, error: Optional[BaseException] = None) -> None:
+        """생산 종료(소비자 루프에서 호출). error 가 있으면 소비자 쪽에서 다시 올린다."""
+        self._error = error
+        await self._q.put(_END)
+
+    def abandon(self) -> None:
+        """소비자가 중간에 빠질 때: 이후 put 은 실패시키고 막힌 put 은 풀어 준다."""
+        self._abandoned = True
+        while not self._q.empty():
+            self._q.get_nowait()
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        while True:
+            item = await self._q.get()
+            if item is _END:
+                if self._error is not None:
+                    raise self._error
+                return
+            yield item
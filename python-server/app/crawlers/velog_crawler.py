@@ -1,110 +1,177 @@
-from typing import List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Set
 from urllib.parse import urlparse, urljoin
-import re, asyncio, time, os, random, logging
+from contextlib import asynccontextmanager
+import re, asyncio, time, os, logging, threading
 from playwright.async_api import async_playwright, TimeoutError as PWTimeout
 
 from app.crawlers import velog_crawler as vc
 
 from . import CONF, UA
+from .browser_pool import get_pool, PoolUnavailable
+from . import velog_http
+from .post_index import open_index, needs_revalidation
+from .stream import PostSink, StreamAbandoned
+from .checkpoint import open_checkpoint
+from .rate_limit import limiter, ThrottledError
+from .retry import FetchStats, backoff_delay, fetch_all
+from .cutoff import too_old
+from .result_cache import result_cache
 from app.utils.text import mask_pii, content_hash
+from app.utils.singleflight import SingleFlight
+from app.core.metrics import (
+    STAGE_LATENCY, CRAWLS_INFLIGHT, CRAWLS_TOTAL, BROWSER_PAGES, POSTS_TOTAL,
+)
+
+logger = logging.getLogger(__name__)
 
-DELAY_LOW  = float(os.environ.get("CRAWL_DELAY_LOW_SEC", "0.8"))
-DELAY_HIGH = float(os.environ.get("CRAWL_DELAY_HIGH_SEC", "2.0"))
 MAX_CONCURRENCY = int(os.environ.get("CRAWLER_MAX_CONCURRENCY", "4"))
 
 
 _HANDLE_RE = re.compile(r"/@(?P<handle>[A-Za-z0-9_]{1,30})")
-_POST_PATH_RE_TPL = (
-    r"^/@{handle}/"
-    r"(?!posts$|series(?:/|$)|about(?:/|$)|followers(?:/|$)|following(?:/|$)|"
-    r"likes(?:/|$)|portfolio(?:/|$)|lists(?:/|$)|tag(?:/|$)|categories(?:/|$))"
-    r"posts\?tag=)" 
-    r"[^/?#]+$"
-)
+# 프로필 하위 경로 중 글이 아닌 것들
+_NON_POST_SEGMENTS = {
+    "posts", "series", "about", "followers", "following", "likes",
+    "portfolio", "lists", "tag", "tags", "categories",
+}
 
 def _is_post_permalink(href: str, handle: str) -> bool:
-    pat = _POST_PATH_RE_TPL.format(handle=re.escape(handle))
-    return re.match(pat, href or "") is not None
-
-async def collect_post_links(ctx, base_url: str, max_scrolls: int) -> list[str]:
-    page = await ctx.new_page()
-    try:
-        page.set_default_timeout(CONF["list"]["timeout_ms"])
-        page.set_default_navigation_timeout(CONF["list"]["timeout_ms"])
-        await _safe_goto(page, base_url)
-
-        handle = _extract_handle_from_url(base_url) or ""
-        seen, hrefs = set(), []
-
-        async def collect_once() -> list[str]:
-            anchors = await page.eval_on_selector_all(
-                f'a[href^="/@{handle}/"]',
-                "els => els.map(e => e.getAttribute('href') || '')"
-            )
-            out = []
-            for h in anchors:
-                if h and _is_post_permalink(h, handle):
-                    full = urljoin("https://velog.io", h)
-                    if full not in seen:
-                        seen.add(full)
-                        out.append(full)
-            return out
-
-        last_len, stagnant = -1, 0
-        for _ in range(max_scrolls):
-            new_links = await collect_once()
-            if new_links:
-                hrefs.extend(new_links)
-
-            stagnant = stagnant + 1 if len(hrefs) == last_len else 0
-            last_len = len(hrefs)
-            if stagnant >= CONF["list"]["stagnant_rounds"]:
-                break
-
-            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await _sleep_with_jitter()
-
-        return list(dict.fromkeys(hrefs))
-    finally:
-        await page.close()
-
-
-
-def _delay_range():
-    pr = CONF["list"].get("pause_sec_range", (None, None))
-    if pr and pr[0] is not None and pr[1] is not None:
-        return pr
-    return (DELAY_LOW, DELAY_HIGH)
-
-async def _sleep_with_jitter():
-    low, high = _delay_range()
-    if low is None or high is None:
-        await asyncio.sleep(CONF["list"]["pause_sec"])
-    else:
-        await asyncio.sleep(random.uniform(low, high))
+    """'/@handle/slug' 형태의 글 링크인지 (시리즈/소개/태그 목록 등 제외)."""
+    path = (href or "").split("?", 1)[0].split("#", 1)[0]
+    parts = path.strip("/").split("/")
+    return (
+        len(parts) == 2
+        and parts[0] == f"@{handle}"
+        and bool(parts[1])
+        and parts[1] not in _NON_POST_SEGMENTS
+    )
+
+
+# 아직 읽지 않은 앵커만 꺼내고 표시해 둔다 → 라운드마다 새로 붙은 것만 전송
+# 각 앵커의 글 카드(다른 글 링크가 섞이지 않는 가장 가까운 조상)에서 목록 날짜도 같이 뽑는다
+_COLLECT_NEW_ANCHORS_JS = r"""
+(prefix) => {
+    const DATE = /(\d{4}\s*년\s*\d{1,2}\s*월\s*\d{1,2}\s*일|\d{4}[.-]\s*\d{1,2}[.-]\s*\d{1,2}|\d+\s*(?:분|시간|일|주)\s*전|어제|그제|오늘|방금)/;
+    const isPost = (h) => h && !h.includes("?") && !/\/posts\/?$/.test(h);
+    const dateOf = (a) => {
+        let el = a;
+        for (let i = 0; i < 6 && el && el !== document.body; i++) {
+            const links = new Set();
+            el.querySelectorAll(`a[href^="${prefix}"]`).forEach(x => {
+                const h = x.getAttribute("href");
+                if (isPost(h)) links.add(h);
+            });
+            if (links.size > 1) break;
+            const m = (el.textContent || "").match(DATE);
+            if (m) return m[0];
+            el = el.parentElement;
+        }
+        return "";
+    };
+    const els = document.querySelectorAll(`a[href^="${prefix}"]`);
+    const out = [];
+    for (const a of els) {
+        if (a.dataset.sgSeen) continue;
+        a.dataset.sgSeen = "1";
+        const href = a.getAttribute("href") || "";
+        out.push({href, date: isPost(href) ? dateOf(a) : ""});
+    }
+    return {items: out, total: els.length};
+}
+"""
+
+# 스크롤 후 피드가 늘어날 때까지(또는 타임아웃) 대기
+_WAIT_FEED_GROWTH_JS = """
+([prefix, n]) => document.querySelectorAll(`a[href^="${prefix}"]`).length > n
+"""
+
+
+class _RequestCounter:
+    """컨텍스트 하나에서 통과/차단한 요청 수 (리소스 타입별)"""
+
+    def __init__(self):
+        self.allowed = 0
+        self.blocked: dict = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "blocked": sum(self.blocked.values()),
+            "blocked_by_type": dict(self.blocked),
+        }
+
+
+def _is_first_party(host: str, base_host: str) -> bool:
+    host = (host or "").lower()
+    for suffix in (base_host, *CONF["intercept"]["first_party"]):
+        if suffix and (host == suffix or host.endswith("." + suffix)):
+            return True
+    return False
+
+
+async def _install_interception(ctx, base_url: str) -> _RequestCounter:
+    """
+    allowlist: 1st-party 의 document/xhr/fetch/script 만 통과(스타일/미디어/트래커/광고/외부 JS 차단)
+    legacy   : 이미지/폰트만 차단(이전 동작)
+    """
+    cfg = CONF["intercept"]
+    counter = _RequestCounter()
+    if cfg["mode"] == "off":
+        return counter
+    base_host = (urlparse(base_url).hostname or "").lower()
+    allow_types = set(cfg["allow_types"])
 
-async def _block_heavy_assets(ctx):
     async def _route(route):
-        rtype = route.request.resource_type
-        if rtype in {"image", "font"}:
+        req = route.request
+        rtype = req.resource_type
+        if cfg["mode"] == "legacy":
+            block = rtype in {"image", "font"}
+        else:
+            block = rtype not in allow_types or not _is_first_party(
+                urlparse(req.url).hostname or "", base_host
+            )
+        if block:
+            counter.blocked[rtype] = counter.blocked.get(rtype, 0) + 1
             await route.abort()
         else:
+            counter.allowed += 1
             await route.continue_()
+
     await ctx.route("**/*", _route)
+    return counter
+
+
+async def _wait_ready(page, selector: Optional[str], timeout_ms: Optional[int] = None):
+    """
+    selector 모드: DOM 준비(goto 의 domcontentloaded) 뒤 셀렉터가 붙을 때까지만 기다린다.
+    networkidle 모드: 네트워크가 잠잠해질 때까지(외부 스크립트가 있으면 오래 걸림).
+    """
+    cfg = CONF["post"]
+    timeout_ms = timeout_ms or cfg["ready_timeout_ms"]
+    try:
+        if cfg["wait_mode"] == "networkidle":
+            await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+        elif selector:
+            await page.wait_for_selector(selector, state="attached", timeout=timeout_ms)
+    except PWTimeout:
+        pass
 
-async def _safe_goto(page, url, retries=2, wait="domcontentloaded"):
+@STAGE_LATENCY.timed(stage="safe_goto")
+async def _safe_goto(page, url, retries=2, wait="domcontentloaded", ready_selector=None):
     last = None
-    for _ in range(retries + 1):
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(backoff_delay(attempt - 1))
         try:
-            await page.goto(url, wait_until=wait)
-            try:
-                await page.wait_for_load_state("networkidle", timeout=5000)
-            except PWTimeout:
-                pass
+            # 호스트별 공용 리미터 안에서 이동 (429/5xx/지연에 따라 속도 자동 조절)
+            async with limiter.slot(url) as ticket:
+                resp = await page.goto(url, wait_until=wait)
+                ticket.status = resp.status if resp is not None else None
+                if ticket.status is not None and (ticket.status == 429 or ticket.status >= 500):
+                    raise ThrottledError(f"HTTP {ticket.status} for {url}")
+            await _wait_ready(page, ready_selector)
             return
         except Exception as e:
             last = e
-            await _sleep_with_jitter()
     raise last
 
 _HANDLE_RE = re.compile(r"/@(?P<handle>[A-Za-z0-9_]{1,30})")
@@ -115,177 +182,238 @@ def _extract_handle_from_url(url: str) -> Optional[str]:
     m = _HANDLE_RE.search(p.path or "")
     return m.group("handle") if m else None
 
-async def collect_post_links(ctx, base_url: str, max_scrolls: int) -> List[str]:
+@STAGE_LATENCY.timed(stage="collect_post_links")
+async def collect_post_links(
+    ctx,
+    base_url: str,
+    max_scrolls: int,
+    known: Optional[Set[str]] = None,
+    dates: Optional[Dict[str, str]] = None,
+    stop_when_old: bool = False,
+) -> List[str]:
+    """
+    프로필을 스크롤하며 글 링크를 모은다.
+    - 고정 sleep 대신 '피드 앵커 수 증가'(DOM 신호)를 기다렸다가 다음 라운드로 넘어감
+    - 라운드마다 새로 붙은 앵커만 페이지에서 꺼냄(전체 재조회 X)
+    - CRAWLER_SCROLL_WAIT_MS 안에 늘지 않는 라운드가 stagnant_rounds 번이면 끝
+    known(이미 인덱싱된 글 URL)이 주어지면 그 글에 닿는 순간 스크롤을 멈춘다
+    (목록은 최신순이라 그 이후는 전부 이미 수집한 글).
+    dates 를 주면 url -> 목록 카드의 날짜 텍스트를 채우고, stop_when_old 면
+    컷오프 밖 글이 연속 stop_after_old 개 나오는 순간 스크롤을 멈춘다.
+    """
     page = await ctx.new_page()
     try:
         page.set_default_timeout(CONF["list"]["timeout_ms"])
         page.set_default_navigation_timeout(CONF["list"]["timeout_ms"])
-        await _safe_goto(page, base_url)
+        handle = _extract_handle_from_url(base_url) or ""
+        prefix = f"/@{handle}/" if handle else "/@"
+        await _safe_goto(page, base_url, ready_selector=f'a[href^="{prefix}"]')
 
         seen: Set[str] = set()
         hrefs: List[str] = []
+        total = 0
+
+        old_streak = 0
 
         async def collect() -> List[str]:
-            anchors = await page.eval_on_selector_all(
-                "a", "els => els.map(e => e.getAttribute('href') || '')"
-            )
+            nonlocal total, old_streak
+            res = await page.evaluate(_COLLECT_NEW_ANCHORS_JS, prefix)
+            total = res.get("total", total)
             out: List[str] = []
-            for h in anchors:
-                if not h:
+            for it in res.get("items") or []:
+                h = it.get("href") or ""
+                if not h or (handle and not _is_post_permalink(h, handle)):
                     continue
-                full = urljoin("https://velog.io", h)
-            
-                if _HANDLE_RE.search(h) and h.count("/") >= 2:
-                    if full not in seen:
-                        seen.add(full)
-                        out.append(full)
+                full = urljoin(base_url, h)
+                if full in seen:
+                    continue
+                seen.add(full)
+                out.append(full)
+                if dates is not None and it.get("date"):
+                    dates[full] = it["date"]
+                    old_streak = old_streak + 1 if too_old(it["date"]) else 0
             return out
 
-        last_count, stagnant = -1, 0
+        stagnant = 0
         for _ in range(max_scrolls):
             new_links = await collect()
             if new_links:
                 hrefs.extend(new_links)
-
-            if len(hrefs) == last_count:
-                stagnant += 1
-            else:
-                stagnant = 0
-            last_count = len(hrefs)
-
-            if stagnant >= CONF["list"]["stagnant_rounds"]:
+            if known and any(u in known for u in new_links):
+                break
+            # 최신순 목록에서 오래된 글이 연속으로 나오면 그 뒤는 전부 컷오프 밖
+            if stop_when_old and old_streak >= CONF["cutoff"]["stop_after_old"]:
                 break
 
             await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            await _sleep_with_jitter()
+            try:
+                await page.wait_for_function(
+                    _WAIT_FEED_GROWTH_JS, arg=[prefix, total],
+                    timeout=CONF["list"]["scroll_wait_ms"],
+                )
+                stagnant = 0
+            except PWTimeout:
+                stagnant += 1
+                if stagnant >= CONF["list"]["stagnant_rounds"]:
+                    break
 
+        # 마지막 라운드에서 붙은 앵커까지
+        hrefs.extend(await collect())
         return hrefs
     finally:
         await page.close()
 
 
-async def fetch_post(ctx, url: str) -> Tuple[str, str, List[str], List[str], Optional[str]]:
-    start = time.perf_counter()
-    HARD_LIMIT = max(8, CONF["post"]["timeout_ms"] / 1000 + CONF["post"]["hard_extra_sec"])
+# 글 페이지에서 제목/본문/태그/날짜를 한 번에 추출 (CDP 왕복 1회)
+# - 본문: article → main → div#root → body 순 폴백
+# - 날짜: time[datetime] 의 ISO 우선, 없으면 짧은 time/span/div 텍스트 중
+#         'YYYY년 M월 D일' / 'YYYY.MM.DD' / 'N시간 전' 같은 첫 항목 (긴 컨테이너는 건너뜀)
+_EXTRACT_POST_JS = r"""
+() => {
+    const txt = (el) => (el ? (el.innerText || "").trim() : "");
+
+    const h1 = document.querySelector("h1");
+    const title = txt(h1);
+
+    let text = "";
+    for (const sel of ["article", "main", "div#root", "body"]) {
+        text = txt(document.querySelector(sel));
+        if (text) break;
+    }
+
+    const tags = new Set();
+    const pick = (t) => {
+        if (!t) return;
+        t = t.trim().replace(/^#/, "");
+        if (t && t.length <= 50) tags.add(t);
+    };
+    document.querySelectorAll(
+        'a[href^="/tags/"], a[href*="/tag/"], a[class*="tag"], a[class*="Tag"]'
+    ).forEach(a => pick(a.textContent));
+    document.querySelectorAll('meta[property="article:tag"]').forEach(m => pick(m.getAttribute("content")));
+
+    let published = "";
+    const t = document.querySelector("time[datetime]");
+    if (t) published = (t.getAttribute("datetime") || "").trim();
+    if (!published) {
+        const ko = /\d{4}\s*년\s*\d{1,2}\s*월\s*\d{1,2}\s*일/;
+        const dot = /\d{4}[.-]\s*\d{1,2}[.-]\s*\d{1,2}/;
+        const rel = /(시간 전|분 전|일 전)/;
+        for (const el of document.querySelectorAll("time, span, div")) {
+            const raw = el.textContent || "";
+            if (!raw || raw.length > 60) continue;
+            const s = txt(el);
+            if (ko.test(s) || dot.test(s) || rel.test(s)) { published = s; break; }
+        }
+    }
+
+    return {title, text, tags: Array.from(tags), published};
+}
+"""
+
+
+class _PagePool:
+    """
+    한 크롤링 안에서 글 페이지를 재사용한다.
+    워커는 같은 페이지로 다음 URL 로 이동하고, max_uses 번 쓰였거나
+    에러가 난 페이지는 닫고 새로 만든다(렌더러 메모리 상한).
+    """
+
+    def __init__(self, ctx, size: int, max_uses: int):
+        self.ctx = ctx
+        self.max_uses = max(1, max_uses)
+        self._sem = asyncio.Semaphore(max(1, size))
+        self._idle: List[Tuple[object, int]] = []
+        self.created = 0
+        self.recycled = 0
+
+    async def _new_page(self):
+        page = await self.ctx.new_page()
+        page.set_default_timeout(CONF["post"]["timeout_ms"])
+        page.set_default_navigation_timeout(CONF["post"]["timeout_ms"])
+        self.created += 1
+        return page
+
+    @asynccontextmanager
+    async def page(self):
+        async with self._sem:
+            if self._idle:
+                page, uses = self._idle.pop()
+            else:
+                page, uses = await self._new_page(), 0
+            ok = False
+            try:
+                yield page
+                ok = True
+            finally:
+                uses += 1
+                if ok and uses < self.max_uses and not page.is_closed():
+                    self._idle.append((page, uses))
+                else:
+                    self.recycled += 1
+                    await _close_quietly(page)
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for page, _ in idle:
+            await _close_quietly(page)
+
+    def as_dict(self) -> dict:
+        return {"created": self.created, "recycled": self.recycled}
+
+
+async def _close_quietly(page) -> None:
+    try:
+        await page.close()
+    except Exception:
+        pass
+
+
+@STAGE_LATENCY.timed(stage="fetch_post")
+async def fetch_post(ctx, url: str, pages: Optional[_PagePool] = None) -> Tuple[str, str, List[str], List[str], Optional[str]]:
+    """pages 가 있으면 풀의 페이지를 빌려 쓰고, 없으면 이번 글 전용 페이지를 연다."""
+    if pages is not None:
+        async with pages.page() as page:
+            return await _extract_post(page, url)
     page = await ctx.new_page()
     try:
         page.set_default_timeout(CONF["post"]["timeout_ms"])
         page.set_default_navigation_timeout(CONF["post"]["timeout_ms"])
-        await _safe_goto(page, url)
-
-        # 제목
-        title = ""
-        try:
-            loc = page.locator("h1").first
-            if await loc.count() > 0:
-                title = (await loc.inner_text()).strip()
-        except Exception:
-            pass
+        return await _extract_post(page, url)
+    finally:
+        await page.close()
 
-        # 태그 (유지)
-        tags: List[str] = []
-        try:
-            tags = await page.evaluate("""
-                () => {
-                    const out = new Set();
-                    const pick = (txt) => {
-                        if (!txt) return;
-                        const t = txt.trim().replace(/^#/, "");
-                        if (t && t.length <= 50) out.add(t);
-                    };
-                    document.querySelectorAll(
-                        'a[href^="/tags/"], a[href*="/tag/"], a[class*="tag"], a[class*="Tag"]'
-                    ).forEach(a => pick(a.textContent));
-                    document.querySelectorAll('meta[property="article:tag"]').forEach(m => {
-                        const c = m.getAttribute("content");
-                        pick(c);
-                    });
-                    return Array.from(out);
-                }
-            """) or []
-            tags = sorted({t.strip() for t in tags if t and t.strip()})
-        except Exception:
-            pass
 
-    
-        text = ""
-        try:
-            if await page.locator("article").count() > 0:
-                text = (await page.locator("article").first.inner_text()).strip()
-        except Exception:
-            pass
+async def _extract_post(page, url: str) -> Tuple[str, str, List[str], List[str], Optional[str]]:
+    start = time.perf_counter()
+    HARD_LIMIT = max(8, CONF["post"]["timeout_ms"] / 1000 + CONF["post"]["hard_extra_sec"])
+    # 재시도는 글 단위 정책(retry.fetch_all)이 맡는다
+    await _safe_goto(page, url, retries=0, ready_selector=CONF["post"]["ready_selector"])
 
-        if not text:
-            for sel in ["main", "div#root", "body"]:
-                try:
-                    if await page.locator(sel).count() > 0:
-                        text = (await page.locator(sel).first.inner_text()).strip()
-                        if text:
-                            break
-                except Exception:
-                    continue
+    # 제목/본문/태그/날짜를 한 번의 evaluate 로 (폴백도 페이지 안에서 처리)
+    data = await page.evaluate(_EXTRACT_POST_JS) or {}
 
-        # 느린 로딩 대비 한 번 더 시도
-        if not text and (time.perf_counter() - start) < HARD_LIMIT:
-            try:
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await page.wait_for_load_state("networkidle", timeout=2000)
-                if await page.locator("article").count() > 0:
-                    text = (await page.locator("article").first.inner_text()).strip()
-            except Exception:
-                pass
-
-        # 날짜
-        published = None
-        # try:
-        #     texts = await page.locator("time, span, div").all_inner_texts()
-        #     for s in texts:
-        #         s2 = s.strip()
-        #         if re.search(r"\d{4}[.\-]\s*\d{1,2}[.\-]\s*\d{1,2}", s2) or \
-        #            ("시간 전" in s2) or ("분 전" in s2) or ("일 전" in s2):
-        #             published = s2; break
-        # except Exception:
-        #     pass
-        # 1) ISO 우선
+    # 느린 로딩 대비 한 번 더 시도
+    if not data.get("text") and (time.perf_counter() - start) < HARD_LIMIT:
         try:
-            if await page.locator("time[datetime]").count() > 0:
-                iso = await page.locator("time[datetime]").first.get_attribute("datetime")
-                if iso:
-                    published = iso.strip()
+            await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            await _wait_ready(page, "article", timeout_ms=2000)
+            data = await page.evaluate(_EXTRACT_POST_JS) or data
         except Exception:
             pass
 
-        # 2) 한국어 날짜 텍스트/상대시간 fallback
-        if not published:
-            try:
-                texts = await page.locator("time, span, div").all_inner_texts()
-                for s in texts:
-                    s2 = s.strip()
-                    if re.search(r"\d{4}\s*년\s*\d{1,2}\s*월\s*\d{1,2}\s*일", s2) or \
-                    re.search(r"\d{4}[.-]\s*\d{1,2}[.-]\s*\d{1,2}", s2) or \
-                    ("시간 전" in s2) or ("분 전" in s2) or ("일 전" in s2):
-                        published = s2
-                        break
-            except Exception:
-                pass
-
-
-        
-
-
-        # if text:
-        #     import re as _re
-        #     text = _re.sub(r"(로그인|팔로우|목록 보기)\s*", " ", text)
-        #     text = _re.sub(r"\s{2,}", " ", text).strip()
-        #     text = mask_pii(text)
-
-        return title or "", text or "", [], tags, (published or "")
-    finally:
-        await page.close()
-
-
+    title = (data.get("title") or "").strip()
+    text = (data.get("text") or "").strip()
+    tags = sorted({t.strip() for t in (data.get("tags") or []) if t and t.strip()})
+    published = (data.get("published") or "").strip()
 
+    # if text:
+    #     import re as _re
+    #     text = _re.sub(r"(로그인|팔로우|목록 보기)\s*", " ", text)
+    #     text = _re.sub(r"\s{2,}", " ", text).strip()
+    #     text = mask_pii(text)
 
+    return title, text, [], tags, published
 
 
 async def try_extract_total_count_on(ctx, base_url: str) -> Optional[int]:
@@ -396,63 +524,149 @@ async def try_extract_total_count(page) -> Optional[int]:
 
 
 
-async def _crawl_all_with_url_async(base_url: str) -> dict:
-    handle = _extract_handle_from_url(base_url) or ""
+def _track_pages(ctx) -> None:
+    """컨텍스트에서 열리고 닫히는 페이지 수를 게이지에 반영한다."""
+    def _on_page(page):
+        BROWSER_PAGES.inc()
+        page.on("close", lambda _: BROWSER_PAGES.dec())
+    ctx.on("page", _on_page)
+
+
+@asynccontextmanager
+async def _open_context(pool=None):
+    """
+    공유 풀이 있으면 풀에서 컨텍스트를 빌리고,
+    없으면(스크립트/풀 기동 실패) 이번 크롤링 전용 브라우저를 띄운다.
+    """
+    if pool is not None:
+        async with pool.context() as ctx:
+            yield ctx
+        return
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
         try:
-            ctx = await browser.new_context(user_agent=UA, viewport=CONF["viewport"])
-            await _block_heavy_assets(ctx)
+            yield await browser.new_context(user_agent=UA, viewport=CONF["viewport"])
+        finally:
+            await browser.close()
 
-            # (1) UI에서 전체 글 수 시도
-            page = await ctx.new_page()
-            await _safe_goto(page, base_url)
-            ui_count = await try_extract_total_count(page)
-            await page.close()
 
-            # (2) 실제 글 링크 수집
-            links = await collect_post_links(ctx, base_url, CONF["list"]["max_scrolls"])
+async def _crawl_all_with_url_async(
+    base_url: str, pool=None, job_key: Optional[str] = None, on_post=None
+) -> dict:
+    """
+    on_post(post) 코루틴을 주면 글을 모아 두지 않고 확정될 때마다 넘긴다
+    (결과의 "posts" 는 빈 리스트, 개수는 "streamed").
+    """
+    handle = _extract_handle_from_url(base_url) or ""
+    # 같은 작업의 이전 시도가 남긴 링크 목록/본문이 있으면 이어서 수집
+    ckpt = open_checkpoint(job_key)
+    saved = await asyncio.to_thread(ckpt.load_links) if ckpt else None
+    done = await asyncio.to_thread(ckpt.load_urls) if ckpt else set()
+    sink = None
+    try:
+        async with _open_context(pool) as ctx:
+            req_counter = await _install_interception(ctx, base_url)
+            _track_pages(ctx)
+            index = open_index(handle)
+            known = await asyncio.to_thread(index.load_meta) if index else {}
+
+            if saved is not None:
+                links, ui_count = saved["links"], saved.get("post_count")
+                dates = saved.get("dates") or {}
+            else:
+                # (1) UI에서 전체 글 수 시도
+                page = await ctx.new_page()
+                await _safe_goto(page, base_url, ready_selector=f'a[href^="/@{handle}/"]')
+                ui_count = await try_extract_total_count(page)
+                await page.close()
+
+                # (2) 실제 글 링크 수집 (인덱스가 있으면 이미 본 글에서 멈춤)
+                # UI 전체 글 수를 얻었으면 post_count 가 링크 수에 의존하지 않으므로
+                # 컷오프 밖 글이 이어지는 지점에서 스크롤을 끊어도 된다
+                dates: Dict[str, str] = {}
+                links = await collect_post_links(
+                    ctx, base_url, CONF["list"]["max_scrolls"], known=set(known),
+                    dates=dates, stop_when_old=ui_count is not None,
+                )
+                if ckpt:
+                    await asyncio.to_thread(ckpt.save_links, links, ui_count, dates)
 
             # (3) post_count 결정: UI에서 성공하면 그 값, 실패 시 링크 수
-            post_count = ui_count if ui_count is not None else len(links)
-
-            # (4) 각 글로 들어가 본문만 추출
-            sem = asyncio.Semaphore(MAX_CONCURRENCY)
-            results = []
-
-            async def _one(u: str):
-                async with sem:
-                    try:
-                        title, text, _, tags, pub = await fetch_post(ctx, u)
-                        # 본문이 비어버린 글은 스킵(프리뷰/페이지 오류 방지)
-                        if text:
-                            results.append((u, title, text, tags, pub))
-                    except Exception:
-                        pass
-
-            await asyncio.gather(*(_one(u) for u in links))
-
-            posts = [{
-                "url": u,
-                "title": t,
-                "published_at": (pub or ""),
-                "text": txt,
-                "tags": tags or [],
-                "content_hash": content_hash(txt or "", fallback=u),
-            } for (u, t, txt, tags, pub) in results]
+            post_count = ui_count if ui_count is not None else len(set(links) | set(known))
+
+            # 인덱스 갱신 + 스트리밍/리스트 반환을 한 곳에서
+            sink = PostSink(index, known, on_post)
+            if ckpt:
+                for p in ckpt.iter_posts():
+                    await sink.emit(p)
+
+            # (4) 각 글로 들어가 본문만 추출 (받은 글은 바로 체크포인트에 기록)
+            async def _one(u: str) -> Optional[dict]:
+                title, text, _, tags, pub = await fetch_post(ctx, u, pages)
+                # 본문이 비어버린 글은 스킵(프리뷰/페이지 오류 방지)
+                if not text:
+                    return None
+                post = {
+                    "url": u,
+                    "title": title,
+                    "published_at": (pub or ""),
+                    "text": text,
+                    "tags": tags or [],
+                    "content_hash": content_hash(text or "", fallback=u),
+                }
+                old = known.get(u)
+                if old is not None:
+                    stats.revalidated += 1
+                    if old.get("content_hash") != post["content_hash"]:
+                        stats.changed += 1
+                if ckpt:
+                    ckpt.append_post(post)
+                return post
+
+            pending = [u for u in links if u not in known and u not in done]
+            # 목록 날짜로 최근 N일 밖이 확실한 글은 본문을 받지 않는다
+            targets = [u for u in pending if not too_old(dates.get(u))]
+            stats = FetchStats()
+            stats.skipped = len(pending) - len(targets)
+            # 목록 카드엔 수정 시각이 없어서, 오래전에 받은 최근 글은 다시 받아 해시로 비교한다
+            targets += [
+                u for u, m in known.items()
+                if u not in done and needs_revalidation(m)
+                and not too_old(dates.get(u) or m.get("published_at"))
+            ]
+            # 워커 수만큼의 페이지를 돌려 쓰며 이동 (글마다 new_page/close 하지 않음)
+            pages = _PagePool(ctx, MAX_CONCURRENCY, CONF["post"]["page_max_uses"])
+            try:
+                await fetch_all(targets, _one, MAX_CONCURRENCY, stats, on_post=sink.emit)
+            finally:
+                await pages.close()
+
+            # (5) 인덱스에 있던 글은 본문을 다시 받지 않고 재사용
+            await sink.emit_index_rest()
+            sink.commit()
+            stats.reused = sink.count - stats.fetched
 
             return {
                 "source": "velog",
                 "author": {"handle": handle},
-                "posts": posts,
+                "posts": sink.posts,
                 "post_count": post_count,
+                "streamed": sink.count if on_post is not None else 0,
+                "stats": {
+                    **stats.as_dict(),
+                    "requests": req_counter.as_dict(),
+                    "pages": pages.as_dict(),
+                },
             }
-        finally:
-            await browser.close()
+    finally:
+        if sink is not None:
+            sink.abort()
+        if ckpt:
+            ckpt.close()
 
 
 
-def _worker_thread(base_url: str) -> dict:
+def _worker_thread(base_url: str, job_key: Optional[str] = None, on_post=None) -> dict:
     """
     별도 스레드에서 실행: Windows일 때 Proactor 정책을 강제하고,
     그 전용 이벤트 루프에서 _crawl_all_with_url_async()를 실행.
@@ -463,7 +677,7 @@ def _worker_thread(base_url: str) -> dict:
     loop = asyncio.new_event_loop()
     try:
         asyncio.set_event_loop(loop)
-        return loop.run_until_complete(_crawl_all_with_url_async(base_url))
+        return loop.run_until_complete(_crawl_all_with_url_async(base_url, job_key=job_key, on_post=on_post))
     finally:
         # 잔여 태스크 정리
         try:
@@ -473,11 +687,201 @@ def _worker_thread(base_url: str) -> dict:
         loop.close()
 
 
-async def crawl_all_with_url(base_url: str) -> dict:
+async def _measured(engine: str, coro) -> dict:
+    """크롤링 한 번의 진행 수/결과/글 단위 통계를 메트릭에 남긴다."""
+    outcome = "error"
+    try:
+        with CRAWLS_INFLIGHT.track(engine=engine), STAGE_LATENCY.time(stage=f"crawl_{engine}"):
+            meta = await coro
+        outcome = "ok"
+    finally:
+        CRAWLS_TOTAL.inc(engine=engine, outcome=outcome)
+    for k, v in (meta.get("stats") or {}).items():
+        if isinstance(v, int) and v:
+            POSTS_TOTAL.inc(v, result=k)
+    return meta
+
+
+async def _crawl_once(base_url: str, job_key: Optional[str] = None, on_post=None) -> dict:
     """
-    서비스에서 호출하는 공개 API.
-    메인 이벤트 루프(Selector일 수도 있음)와 분리하기 위해
+    엔진이 auto/http면 먼저 HTTP(GraphQL+HTML) 경로를 시도하고,
+    실패했을 때만 브라우저 경로로 넘어간다.
+    공유 브라우저 풀이 떠 있으면 풀 전용 루프에서 크롤링하고,
+    없으면 메인 이벤트 루프(Selector일 수도 있음)와 분리하기 위해
     '스레드 실행자'에서 Playwright를 돌린다.
     """
+    engine = CONF["engine"]
+    if engine in ("auto", "http"):
+        try:
+            return await _measured("http", velog_http.crawl_all_with_url(
+                base_url, _extract_handle_from_url(base_url) or "",
+                job_key=job_key, on_post=on_post,
+            ))
+        except velog_http.HttpCrawlError as e:
+            if engine == "http":
+                raise
+            logger.info("http engine failed for %s, falling back to browser: %s", base_url, e)
+
+    pool = get_pool()
+    if pool is not None:
+        try:
+            return await _measured("browser", pool.run(_crawl_all_with_url_async(base_url, pool, job_key, on_post)))
+        except PoolUnavailable as e:
+            # 컨텍스트를 받기 전에 실패하므로 아직 흘린 글이 없다 → 호출별 브라우저로
+            logger.warning("browser pool unavailable, using a per-crawl browser: %s", e)
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, lambda: _worker_thread(base_url))
+    return await _measured(
+        "browser", loop.run_in_executor(None, lambda: _worker_thread(base_url, job_key, on_post))
+    )
+
+
+class _FanOut:
+    """
+    진행 중인 크롤링 하나의 글을 여러 호출자에게 나눠 준다.
+    emit 은 크롤러 루프(풀/폴백 스레드)에서, subscribe 는 메인 루프에서 불리므로 잠금으로 보호.
+    첫 글이 나간 뒤에 온 구독자는 늦은 것으로 보고 받지 않는다(끝난 뒤 인덱스에서 다시 읽음).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subs: list = []
+        self._sent: Set[str] = set()
+        self._started = False
+
+    def subscribe(self, cb) -> bool:
+        with self._lock:
+            if self._started:
+                return False
+            self._subs.append(cb)
+            return True
+
+    async def emit(self, post: dict) -> None:
+        with self._lock:
+            self._started = True
+            # HTTP 엔진이 일부 흘린 뒤 브라우저로 폴백하면 같은 글이 다시 온다
+            if post["url"] in self._sent:
+                return
+            self._sent.add(post["url"])
+            subs = list(self._subs)
+        for cb in subs:
+            try:
+                await cb(post)
+            except StreamAbandoned:
+                # 그 구독자만 떠남 → 나머지에게는 계속 보낸다
+                with self._lock:
+                    if cb in self._subs:
+                        self._subs.remove(cb)
+
+
+_flights = SingleFlight()
+
+
+async def _replay(it, cb) -> int:
+    """(디스크를 읽는) 이터레이터에서 글을 조금씩 꺼내 콜백으로 흘려 준다. 흘린 글 수를 돌려준다."""
+    n = 0
+    while True:
+        batch = await asyncio.to_thread(lambda: [p for _, p in zip(range(32), it)])
+        if not batch:
+            return n
+        for p in batch:
+            await cb(p)
+        n += len(batch)
+
+
+async def _replay_index(handle: str, cb) -> bool:
+    """
+    끝난 크롤링이 남긴 인덱스에서 글을 다시 흘려 준다.
+    인덱스가 없거나 오래돼(max_age) 무시되는 경우, 또는 흘린 글이 없으면 False → 호출자가 직접 크롤링.
+    """
+    index = open_index(handle)
+    if index is None or not index.is_fresh():
+        return False
+    return await _replay(index.iter_posts(), cb) > 0
+
+
+async def _replay_cache(key: str, cb) -> Optional[dict]:
+    """TTL 안의 캐시 결과가 있으면 글을 흘려 주고 메타(+cache_age_sec)를 돌려준다."""
+    if not result_cache.enabled:
+        return None
+    hit = await asyncio.to_thread(result_cache.lookup, key)
+    if hit is None:
+        return None
+    age, meta, posts = hit
+    await _replay(posts, cb)
+    return {**meta, "cache_age_sec": int(age)}
+
+
+async def _crawl_and_cache(base_url: str, key: str, job_key: Optional[str], on_post) -> dict:
+    """크롤링하면서 글을 결과 캐시에도 기록하고, 성공했을 때만 캐시에 올린다."""
+    writer = result_cache.writer(key)
+    if writer is None:
+        return await _crawl_once(base_url, job_key, on_post)
+
+    async def _emit(p: dict) -> None:
+        writer.add(p)
+        await on_post(p)
+
+    try:
+        meta = await _crawl_once(base_url, job_key, _emit)
+    except BaseException:
+        writer.abort()
+        raise
+    await asyncio.to_thread(writer.commit, meta)
+    return meta
+
+
+async def crawl_all_with_url(base_url: str, job_key: Optional[str] = None, on_post=None) -> dict:
+    """
+    서비스에서 호출하는 공개 API.
+    job_key 를 주면 작업 단위 체크포인트를 남겨, 같은 키로 다시 호출될 때 이어서 수집한다.
+    on_post 를 주면 글을 결과에 모으지 않고 하나씩 넘긴다(stream.PostStream.put 등).
+    TTL 안에 같은 프로필을 크롤링한 결과가 캐시에 있으면 크롤링 없이 그 결과를 준다(cache_age_sec).
+    같은 핸들을 동시에 크롤링하려는 호출은 하나의 크롤링으로 합쳐진다(single-flight):
+    모두 같은 결과를 기다리고, 마지막 대기자까지 취소돼야 크롤링이 취소된다.
+    """
+    handle = (_extract_handle_from_url(base_url) or "").lower()
+    cache_key = f"velog:@{handle}" if handle else base_url.strip().rstrip("/")
+
+    collected: Optional[list] = None
+    if on_post is None:
+        collected = []
+
+        async def on_post(p: dict) -> None:
+            collected.append(p)
+
+    def _result(meta: dict, coalesced: bool = False) -> dict:
+        return {
+            **meta,
+            "posts": collected if collected is not None else [],
+            "streamed": 0 if collected is not None else meta.get("streamed", 0),
+            "coalesced": coalesced,
+        }
+
+    cached = await _replay_cache(cache_key, on_post)
+    if cached is not None:
+        logger.info("crawl cache hit for %s (age %ss)", cache_key, cached["cache_age_sec"])
+        return _result(cached)
+
+    if not handle or not CONF["singleflight"]:
+        return _result(await _crawl_and_cache(base_url, cache_key, job_key, on_post))
+
+    def _factory(call):
+        fan = call.data["fanout"] = _FanOut()
+        return _crawl_and_cache(base_url, cache_key, job_key, fan.emit)
+
+    call, leader = _flights.start(handle, _factory)
+    joined = call.data["fanout"].subscribe(on_post)
+    if not leader:
+        logger.info("joining in-flight crawl for @%s", handle)
+    meta = await _flights.wait(call)
+
+    # 이미 글이 흘러가던 크롤링에 늦게 붙었으면 끝난 결과를 캐시/인덱스에서 다시 읽고,
+    # 둘 다 없으면 따로 한 번 더 크롤링한다
+    if not joined:
+        cached = await _replay_cache(cache_key, on_post)
+        if cached is not None:
+            return _result(cached, coalesced=True)
+        if not await _replay_index(handle, on_post):
+            return _result(await _crawl_once(base_url, job_key, on_post))
+
+    return _result(meta, coalesced=not leader)
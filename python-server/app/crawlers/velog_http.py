@@ -0,0 +1,316 @@
+"""
+헤드리스 브라우저 없이 Velog를 수집하는 HTTP 엔진.
+
+- 글 목록: Velog GraphQL `posts` 쿼리를 커서(마지막 글 id) 기반으로 페이지네이션
+- 전체 글 수: GraphQL `userTags.posts_count` ('전체보기 (N)'과 같은 값)
+- 본문: 서버 렌더링된 글 HTML을 BeautifulSoup(lxml)으로 파싱
+
+실패하면 HttpCrawlError를 던지고, 호출 측(velog_crawler)이 Playwright 경로로 폴백한다.
+GraphQL 엔드포인트는 VELOG_GRAPHQL_URL, 글 페이지는 base_url의 origin 기준이라
+녹화한 픽스처를 로컬 서버로 띄워 그대로 돌려볼 수 있다.
+"""
+from typing import List, Optional, Set, Tuple
+from urllib.parse import quote, urlparse
+import asyncio, logging, time
+
+import httpx
+
+from . import CONF
+from .post_index import open_index, needs_revalidation
+from .stream import PostSink
+from .checkpoint import open_checkpoint
+from .retry import FetchStats, fetch_all
+from .cutoff import too_old
+from .rate_limit import limiter
+from app.utils.text import content_hash
+from app.utils.offload import run_cpu
+from app.core.metrics import STAGE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:  # 선택 의존성: 없으면 HTTP 엔진 비활성 → 브라우저 폴백
+    BeautifulSoup = None
+
+try:
+    import lxml  # noqa: F401
+    _BS_PARSER = "lxml"
+except ImportError:
+    _BS_PARSER = "html.parser"
+
+
+class HttpCrawlError(Exception):
+    """HTTP 엔진으로 수집 불가(브라우저 경로로 폴백해야 함)"""
+    pass
+
+
+_POSTS_QUERY = """
+query Posts($cursor: ID, $username: String, $limit: Int) {
+  posts(cursor: $cursor, username: $username, limit: $limit) {
+    id
+    title
+    url_slug
+    released_at
+    updated_at
+    tags
+  }
+}
+"""
+
+_USER_TAGS_QUERY = """
+query UserTags($username: String) {
+  userTags(username: $username) {
+    posts_count
+  }
+}
+"""
+
+_TAG_SELECTOR = 'a[href^="/tags/"], a[href*="/tag/"], a[class*="tag"], a[class*="Tag"]'
+
+
+def _origin_of(base_url: str) -> str:
+    p = urlparse(base_url)
+    return f"{p.scheme or 'https'}://{p.netloc or 'velog.io'}"
+
+
+def post_url(origin: str, handle: str, url_slug: str) -> str:
+    return f"{origin}/@{handle}/{quote(url_slug, safe='')}"
+
+
+async def _graphql(client: httpx.AsyncClient, query: str, variables: dict) -> dict:
+    url = CONF["http"]["graphql_url"]
+    try:
+        async with limiter.slot(url) as ticket:
+            r = await client.post(url, json={"query": query, "variables": variables})
+            ticket.status = r.status_code
+        r.raise_for_status()
+        body = r.json()
+    except (httpx.HTTPError, ValueError) as e:
+        raise HttpCrawlError(f"graphql request failed: {e}") from e
+    if body.get("errors"):
+        raise HttpCrawlError(f"graphql errors: {body['errors']}")
+    return body.get("data") or {}
+
+
+async def fetch_total_count(client: httpx.AsyncClient, handle: str) -> Optional[int]:
+    try:
+        data = await _graphql(client, _USER_TAGS_QUERY, {"username": handle})
+        n = (data.get("userTags") or {}).get("posts_count")
+        return int(n) if n is not None else None
+    except (HttpCrawlError, TypeError, ValueError):
+        return None
+
+
+@STAGE_LATENCY.timed(stage="http_list_posts")
+async def list_posts(
+    client: httpx.AsyncClient, handle: str, origin: str = "",
+    stop_at: Optional[dict] = None, cover: Optional[Set[str]] = None,
+) -> Tuple[List[dict], bool]:
+    """
+    커서 기반 페이지네이션으로 글 목록 메타데이터(id, url_slug, released_at ...)를 모은다.
+    stop_at(이미 인덱싱된 글 URL)이 포함된 페이지를 받으면 더 넘기지 않는다.
+    단 cover(재검증 주기가 된 인덱스 글 URL)가 아직 목록에 다 나오지 않았으면 계속 넘긴다.
+    (글 목록, 끝까지 받았는지) 를 돌려준다.
+    """
+    cfg = CONF["http"]
+    out: List[dict] = []
+    seen = set()
+    pending = set(cover or ())
+    complete = False
+    cursor = None
+    for _ in range(cfg["max_pages"]):
+        data = await _graphql(
+            client, _POSTS_QUERY,
+            {"cursor": cursor, "username": handle, "limit": cfg["page_size"]},
+        )
+        page = data.get("posts")
+        if page is None:
+            raise HttpCrawlError("graphql response has no posts field")
+        for item in page:
+            if item.get("id") in seen or not item.get("url_slug"):
+                continue
+            seen.add(item["id"])
+            item["url"] = post_url(origin, handle, item["url_slug"])
+            pending.discard(item["url"])
+            out.append(item)
+        if len(page) < cfg["page_size"]:
+            complete = True
+            break
+        if stop_at and not pending and any(it.get("url") in stop_at for it in page):
+            break
+        cursor = page[-1].get("id")
+    return out, complete
+
+
+def parse_post_html(html: str) -> Tuple[str, str, List[str], Optional[str]]:
+    """글 HTML에서 (제목, 본문, 태그, 게시시각)을 뽑는다. 선택자는 브라우저 경로와 동일."""
+    soup = BeautifulSoup(html, _BS_PARSER)
+    for t in soup(["script", "style", "noscript"]):
+        t.decompose()
+
+    h1 = soup.find("h1")
+    title = h1.get_text(strip=True) if h1 else ""
+
+    tags = set()
+    for a in soup.select(_TAG_SELECTOR):
+        t = a.get_text(strip=True).lstrip("#")
+        if t and len(t) <= 50:
+            tags.add(t)
+    for m in soup.select('meta[property="article:tag"]'):
+        t = (m.get("content") or "").strip().lstrip("#")
+        if t and len(t) <= 50:
+            tags.add(t)
+
+    text = ""
+    for sel in ["article", "main", "div#root", "body"]:
+        node = soup.select_one(sel)
+        if node is not None:
+            text = node.get_text("\n", strip=True)
+            if text:
+                break
+
+    published = None
+    tm = soup.select_one("time[datetime]")
+    if tm is not None and tm.get("datetime"):
+        published = tm["datetime"].strip()
+
+    return title, text, sorted(tags), published
+
+
+@STAGE_LATENCY.timed(stage="http_fetch_post")
+async def fetch_post(client: httpx.AsyncClient, url: str) -> Tuple[str, str, List[str], Optional[str]]:
+    async with limiter.slot(url) as ticket:
+        r = await client.get(url)
+        ticket.status = r.status_code
+    r.raise_for_status()
+    # BeautifulSoup 파싱은 CPU 작업이라 루프 밖에서 (CPU_POOL_KIND=process 여도 잡히도록 여기서 잰다)
+    with STAGE_LATENCY.time(stage="parse_post_html"):
+        return await run_cpu(parse_post_html, r.text)
+
+
+async def crawl_all_with_url(
+    base_url: str, handle: str, job_key: Optional[str] = None, on_post=None
+) -> dict:
+    """
+    velog_crawler._crawl_all_with_url_async 와 같은 모양의 결과를 HTTP만으로 만든다.
+    on_post 를 주면 글을 모으지 않고 하나씩 넘긴다(같은 URL 중복 제거는 받는 쪽 몫).
+    """
+    if BeautifulSoup is None:
+        raise HttpCrawlError("beautifulsoup4 is not installed")
+    if not handle:
+        raise HttpCrawlError("velog handle not found in url")
+
+    cfg = CONF["http"]
+    origin = _origin_of(base_url)
+    index = open_index(handle)
+    known = await asyncio.to_thread(index.load_meta) if index else {}
+    # 목록은 GraphQL 로 싸게 다시 받으니 본문만 체크포인트에서 이어받는다
+    ckpt = open_checkpoint(job_key)
+    done = await asyncio.to_thread(ckpt.load_urls) if ckpt else set()
+    # 본문을 받은 지 오래된 인덱스 글: 목록에 다시 나올 때까지 페이지를 넘겨 수정 여부를 확인한다
+    due = {u for u, m in known.items() if needs_revalidation(m)}
+    sink = None
+    try:
+        async with httpx.AsyncClient(
+            headers=CONF["headers"],
+            timeout=cfg["timeout_sec"],
+            follow_redirects=True,
+        ) as client:
+            ui_count, (items, complete) = await asyncio.gather(
+                fetch_total_count(client, handle),
+                list_posts(client, handle, origin, stop_at=known, cover=due),
+            )
+            listed = {it["url"] for it in items}
+            # 목록을 끝까지 받았는데 없는 인덱스 글은 삭제된 글 → 인덱스에서 뺀다
+            if complete and known and (ui_count is None or len(listed) >= ui_count):
+                gone = set(known) - listed
+                for u in gone:
+                    del known[u]
+                if gone:
+                    logger.info("dropping %d deleted post(s) from @%s index", len(gone), handle)
+
+            stats = FetchStats()
+            # 목록의 updated_at 이 인덱스와 같으면 본문을 다시 받지 않고 재검증된 것으로 본다
+            now = time.time()
+            for it in items:
+                m = known.get(it["url"])
+                if (
+                    m is not None and it["url"] in due
+                    and it.get("updated_at") and it.get("updated_at") == m.get("updated_at")
+                ):
+                    m["fetched_at"] = now
+                    stats.revalidated += 1
+            post_count = (
+                ui_count if ui_count is not None
+                else len(listed | set(known))
+            )
+            if not items and post_count:
+                raise HttpCrawlError("graphql listed no posts for a non-empty profile")
+
+            def _changed(item: dict) -> bool:
+                # 인덱스에 없거나, 목록의 updated_at이 달라진 글만 본문을 다시 받는다
+                if item["url"] in done:
+                    return False
+                m = known.get(item["url"])
+                if m is None:
+                    return True
+                return bool(item.get("updated_at")) and item.get("updated_at") != m.get("updated_at")
+
+            pending = [it for it in items if _changed(it)]
+            # 목록의 released_at 으로 최근 N일 밖이 확실한 글은 본문을 받지 않는다
+            by_url = {it["url"]: it for it in pending if not too_old(it.get("released_at"))}
+
+            sink = PostSink(
+                index, known, on_post,
+                updated_at={it["url"]: it.get("updated_at") for it in items},
+            )
+            if ckpt:
+                for p in ckpt.iter_posts():
+                    await sink.emit(p)
+
+            async def _one(u: str) -> Optional[dict]:
+                item = by_url[u]
+                title, text, tags, pub = await fetch_post(client, u)
+                if not text:
+                    return None
+                post = {
+                    "url": u,
+                    "title": title or item.get("title") or "",
+                    "published_at": item.get("released_at") or pub or "",
+                    "text": text,
+                    "tags": tags or sorted(item.get("tags") or []),
+                    "content_hash": content_hash(text, fallback=u),
+                }
+                m = known.get(u)
+                if m is not None:
+                    stats.revalidated += 1
+                    if m.get("content_hash") != post["content_hash"]:
+                        stats.changed += 1
+                if ckpt:
+                    ckpt.append_post(post)
+                return post
+
+            stats.skipped = len(pending) - len(by_url)
+            await fetch_all(list(by_url), _one, cfg["max_concurrency"], stats, on_post=sink.emit)
+
+        if by_url and not stats.fetched:
+            raise HttpCrawlError("no post body could be extracted over http")
+
+        await sink.emit_index_rest()
+        sink.commit()
+    finally:
+        if sink is not None:
+            sink.abort()
+        if ckpt:
+            ckpt.close()
+    stats.reused = sink.count - stats.fetched
+
+    return {
+        "source": "velog",
+        "author": {"handle": handle},
+        "posts": sink.posts,
+        "post_count": post_count,
+        "streamed": sink.count if on_post is not None else 0,
+        "stats": stats.as_dict(),
+    }
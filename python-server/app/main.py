@@ -1,13 +1,38 @@
 import platform
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
+from fastapi.responses import Response
 from app.core.errors import install_error_handlers
 from app.routers.velog import router as velog_router
 from app.routers.crawlingResult import router as crawling_router
-import sys, asyncio
+from app.routers.admin import router as admin_router
+import sys, asyncio, os, time
 from dotenv import load_dotenv; load_dotenv()
 from app.routers import summary, keywords   # ✅ keywords 라우터 추가
+from app.crawlers import browser_pool
+from app.services import ingest_queue
+from app.utils import offload
+from app.core import metrics
+from app.services import gemini_service
 
-app = FastAPI(title="SpecGuard Python API", version="1.3.0")
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+
+
+# 앱 수명주기: 스키마 확인 + 공유 브라우저 풀 + 수집 워커 기동/종료
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await gemini_service.check_portfolio_unique_key()
+    await browser_pool.start_pool()
+    await ingest_queue.start_workers()
+    try:
+        yield
+    finally:
+        await ingest_queue.stop_workers()
+        await browser_pool.stop_pool()
+        offload.shutdown()
+
+
+app = FastAPI(title="SpecGuard Python API", version="1.3.0", lifespan=lifespan)
 
 # 라우터 등록
 
@@ -19,6 +44,7 @@ app.include_router(keywords.router)
 
 app.include_router(velog_router)
 app.include_router(crawling_router)
+app.include_router(admin_router)
 
 if sys.platform.startswith("win"):
     try:
@@ -36,6 +62,31 @@ async def ensure_utf8_json(request: Request, call_next):
         resp.headers["content-type"] = "application/json; charset=utf-8"
     return resp
 
+# 라우트별 지연/처리 중 요청 수 (경로 템플릿 기준이라 라벨 수가 라우트 수로 제한됨)
+if METRICS_ENABLED:
+    @app.middleware("http")
+    async def record_metrics(request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        metrics.HTTP_INFLIGHT.inc()
+        try:
+            resp = await call_next(request)
+            status = resp.status_code
+            return resp
+        finally:
+            metrics.HTTP_INFLIGHT.dec()
+            route = request.scope.get("route")
+            metrics.HTTP_LATENCY.observe(
+                time.perf_counter() - start,
+                method=request.method,
+                route=getattr(route, "path", "unmatched"),
+                status=status,
+            )
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        return Response(metrics.registry.render(), media_type=metrics.METRICS_CONTENT_TYPE)
+
 # 라우터 등록
 
 @app.get("/")
@@ -46,6 +97,7 @@ async def root():
         "note": """
         Use {
         /api/v1/ingest/resumes/{resumeId}/velog/start,
+        /api/v1/ingest/resumes/{resumeId}/velog/status,
         /api/v1/nlp/summary,
         /api/v1/nlp/keywords
         }
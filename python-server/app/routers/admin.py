@@ -0,0 +1,57 @@
+from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi.responses import PlainTextResponse
+from typing import Optional
+import asyncio, hmac, os, time
+
+from app.core import profiler
+
+# 비어 있으면 관리자 엔드포인트 전체 비활성
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+router = APIRouter(prefix="/api/v1/admin", tags=["admin"])
+
+
+def _require_admin(token: Optional[str]) -> None:
+    if not ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=404,
+            detail={"errorCode": "NOT_FOUND", "message": "admin endpoints are disabled"},
+        )
+    if not token or not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(
+            status_code=403,
+            detail={"errorCode": "FORBIDDEN", "message": "invalid admin token"},
+        )
+
+
+@router.post("/profile")
+async def profile_process(
+    seconds: float = Query(10, gt=0, le=profiler.PROFILER_MAX_SEC, description="샘플링 시간(초)"),
+    hz: int = Query(100, ge=1, le=profiler.PROFILER_MAX_HZ, description="초당 샘플 수"),
+    idle: bool = Query(False, description="대기(select/락/큐) 중인 스택도 포함"),
+    x_admin_token: Optional[str] = Header(None),
+):
+    """
+    이 워커 프로세스의 모든 스레드를 seconds 동안 샘플링해 collapsed stack 파일로 돌려준다.
+    (flamegraph.pl profile.collapsed > flame.svg 또는 speedscope 에 업로드)
+    샘플러는 별도 스레드에서 돌아서 이벤트 루프는 그동안에도 요청을 처리한다.
+    """
+    _require_admin(x_admin_token)
+    try:
+        result = await asyncio.to_thread(profiler.sample, seconds, hz, idle)
+    except profiler.ProfilerBusy as e:
+        raise HTTPException(
+            status_code=409,
+            detail={"errorCode": "PROFILER_BUSY", "message": str(e)},
+        )
+
+    filename = f"profile-{os.getpid()}-{int(time.time())}.collapsed"
+    return PlainTextResponse(
+        result["collapsed"],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Profile-Samples": str(result["samples"]),
+            "X-Profile-Duration-Sec": str(result["duration_sec"]),
+            "X-Profile-Threads": str(result["threads"]),
+        },
+    )
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from app.schemas import KeywordRequest, BaseResponse
 from app.services.gemini_service import extract_keywords
+from app.services.llm_cache import cache as llm_cache
 import json
 import re
 
@@ -38,3 +39,10 @@ async def extract_keywords_(request: KeywordRequest):
 
     # 8) 최종 성공 응답
     return BaseResponse(status="success", data={"keywords" : keywords})
+
+
+@router.get("/cache/stats", response_model=BaseResponse)
+async def llm_cache_stats():
+    """LLM 응답 캐시 적중/미스 카운터"""
+    stats = llm_cache.stats() if llm_cache is not None else {"enabled": False}
+    return BaseResponse(status="success", data=stats)
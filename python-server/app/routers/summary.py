@@ -1,10 +1,15 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from app.services.gemini_client import client
+from app.services.gemini_client import generate_content
+from app.services.llm_cache import cache as llm_cache, make_key
 from app.schemas import BaseResponse
 
 router = APIRouter(prefix="/api/v1/nlp", tags=["summary"])
 
+SUMMARY_MODEL = "gemini-2.0-flash-001"
+# 프롬프트 문구를 바꾸면 올려서 이전 캐시를 무효화
+SUMMARY_PROMPT_VERSION = "sum-v1"
+
 # === 요청/응답 스키마 ===
 class SummaryRequest(BaseModel):
     type: str   # "resume" | "portfolio" | "cover_letter"
@@ -41,13 +46,18 @@ async def summarize_text(request: SummaryRequest):
     # 3) 프롬프트 생성
     prompt = f"다음 {request.type} 텍스트를 간단하게 요약해줘:\n\n{request.text.strip()}"
 
-    # 4) Gemini API 호출
+    # 4) 캐시 조회 → 없으면 Gemini API 호출
+    cache_key = make_key(SUMMARY_MODEL, SUMMARY_PROMPT_VERSION, f"{request.type}\x00{request.text.strip()}")
     try:
-        response = client.models.generate_content(
-            model="gemini-2.0-flash-001",
-            contents=prompt
-        )
-        summary_text = response.text
+        summary_text = await llm_cache.get(cache_key) if llm_cache is not None else None
+        if summary_text is None:
+            response = await generate_content(
+                model=SUMMARY_MODEL,
+                contents=prompt
+            )
+            summary_text = response.text
+            if llm_cache is not None and summary_text:
+                await llm_cache.set(cache_key, summary_text)
     except Exception as e:
         raise HTTPException(
             status_code=500,
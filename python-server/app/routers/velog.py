@@ -1,11 +1,16 @@
-from typing import Optional
+from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Path, Body, Query
+from fastapi.responses import StreamingResponse
+from fastapi import Response
 from pydantic import BaseModel, Field
 from app.services import crawler_service as svc
+from app.services import ingest_queue
 from app.crawlers import velog_crawler as vc      
+from app.crawlers.rate_limit import limiter as crawl_limiter
+from app.crawlers.result_cache import result_cache as crawl_cache
 from app.utils.dates import normalize_created_at 
 from base64 import b64encode
-import gzip, json
+import gzip, json, asyncio
 import tzdata
 from datetime import datetime, timedelta
 import os
@@ -44,6 +49,7 @@ async def debug_velog(url: str = Query(..., description="Velog 프로필 URL (
                 "base_url": url,
                 "post_count": int(crawled.get("post_count", len(posts))),
                 "recent_activity": recent_activity,
+                "cache_age_sec": crawled.get("cache_age_sec"),
                 "posts": posts,
             }
         }
@@ -56,19 +62,92 @@ async def debug_velog(url: str = Query(..., description="Velog 프로필 URL (
 class StartBody(BaseModel):
     url: Optional[str] = Field(None, description="Velog 프로필 URL (예: https://velog.io/@handle/posts)")
 
-@router.post("/ingest/resumes/{resumeId}/velog/start")
+@router.post("/ingest/resumes/{resumeId}/velog/start", status_code=202)
 async def start_velog_ingest(
+    response: Response,
     resumeId: str = Path(..., description="resume.id (UUID)"),
     body: StartBody = Body(...),
 ):
+    """
+    수집 작업을 백그라운드 큐에 넣고 즉시 202를 반환한다.
+    진행 상황은 /ingest/resumes/{resumeId}/velog/status 로 확인.
+    워커가 꺼져 있거나(INGEST_WORKERS=0) 디버그 반환 모드면 요청 안에서 끝까지 수집하고 200.
+    """
+    if svc.DEBUG_RETURN or ingest_queue.get_worker_pool() is None:
+        response.status_code = 200
     try:
-        result = await svc.ingest_velog_single(resumeId, body.url)
+        if svc.DEBUG_RETURN:
+            result = await svc.ingest_velog_single(resumeId, body.url)
+        else:
+            result = await ingest_queue.enqueue_velog_ingest(resumeId, body.url)
         return {"status": "success", "data": result}
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail={"errorCode":"INTERNAL_SERVER_ERROR", "message": str(e)})
-    
+
+
+class BatchBody(BaseModel):
+    resumeIds: List[str] = Field(..., min_length=1, description="resume.id (UUID) 목록")
+
+
+@router.post("/ingest/velog/batch")
+async def start_velog_ingest_batch(body: BatchBody = Body(...)):
+    """
+    여러 resume 를 한 번에 수집한다. 결과는 끝나는 순서대로
+    한 줄에 하나씩 NDJSON(application/x-ndjson)으로 스트리밍된다.
+    """
+    if len(body.resumeIds) > svc.BATCH_MAX_RESUMES:
+        raise HTTPException(
+            status_code=400,
+            detail={"errorCode": "INVALID_INPUT_VALUE",
+                    "message": f"resumeIds 는 최대 {svc.BATCH_MAX_RESUMES}개까지 가능합니다."},
+        )
+
+    async def _lines():
+        try:
+            async for item in svc.ingest_velog_batch(body.resumeIds):
+                yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+        except Exception as e:
+            yield json.dumps({"status": "ERROR", "message": str(e)}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(_lines(), media_type="application/x-ndjson")
+
+
+@router.get("/ingest/resumes/{resumeId}/velog/status")
+async def velog_ingest_status(
+    resumeId: str = Path(..., description="resume.id (UUID)"),
+):
+    """resume 의 VELOG 수집 상태(crawling_result) + 워커 큐 상태."""
+    try:
+        rows = await svc.find_velog_statuses(resumeId)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail={"errorCode":"INTERNAL_SERVER_ERROR", "message": str(e)})
+    if not rows:
+        raise HTTPException(
+            status_code=404,
+            detail={"errorCode": "NOT_FOUND", "message": "crawling_result(row) not found for given resume_id"},
+        )
+
+    pool = ingest_queue.get_worker_pool()
+    jobs = []
+    for r in rows:
+        jobs.append({
+            "resumeLinkId": r["resume_link_id"],
+            "url": r["url"],
+            "status": r["status"],
+            "queue": pool.state_of(resumeId, r["resume_link_id"]) if pool else None,
+            "updatedAt": r["updated_at"].isoformat() if r["updated_at"] else None,
+        })
+    return {
+        "status": "success",
+        "data": {
+            "resumeId": resumeId,
+            "jobs": jobs,
+            "workers": pool.stats() if pool else None,
+        },
+    }
+
 
 
 #압축 해제 확인
@@ -107,6 +186,7 @@ async def debug_get_payload(
             "post_count": post_count,
             "recent_count": recent_count,
             "recent_activity": recent_activity,
+            "cache_age_sec": crawled.get("cache_age_sec"),
             "posts": posts,
         }
 
@@ -116,4 +196,16 @@ async def debug_get_payload(
         raise HTTPException(
             status_code=500,
             detail={"errorCode": "CRAWLING_FAILED", "message": str(e)},
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/debug/crawler/limits")
+async def debug_crawler_limits():
+    """호스트별 레이트 리미터 현재 상태 (속도/동시성 한도/지연/에러 수)."""
+    return {"status": "debug", "data": crawl_limiter.snapshot()}
+
+
+@router.get("/debug/crawler/cache")
+async def debug_crawler_cache():
+    """크롤링 결과 캐시 상태 (백엔드/TTL/항목 수/적중 수)."""
+    return {"status": "debug", "data": await asyncio.to_thread(crawl_cache.stats)}
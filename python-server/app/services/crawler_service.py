@@ -1,12 +1,9 @@
-import os
-import httpx, logging, os
+import logging, os
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from fastapi import HTTPException
 import math
-
-from app.crawlers import velog_crawler as vc
-
+import asyncio
 
 
 DEBUG_RETURN = os.getenv("CRAWLER_DEBUG_RETURN", "0") == "1"  # 반환 토글
@@ -20,15 +17,43 @@ from app.db import (
     SQL_SET_NOTEXISTED_IF_NOT_TERMINAL,
     SQL_SAVE_COMPLETED,
     SQL_SET_FAILED_IF_RUNNING,
+    SQL_FIND_CRAWL_STATUS,
+    SQL_FIND_VELOG_STATUS_BY_RID,
+    SQL_FIND_VELOG_LINKS_BY_RIDS,
+    SQL_LOCK_PENDING_BY_LIDS,
+    SQL_CLAIM_RUNNING_BY_IDS,
+    SQL_SET_NOTEXISTED_BY_LIDS,
+    SQL_TOUCH_RUNNING,
+    SQL_REQUEUE_RUNNING,
 )
 from app.crawlers import velog_crawler as vc
+from app.crawlers import checkpoint
+from app.crawlers.stream import PostStream
 from app.utils.dates import normalize_created_at
-from app.utils.codec import to_gzip_bytes_from_json, to_gzip_bytes_from_text
+from app.utils.codec import ContentsWriter, encode_contents, load_json_contents
+from app.utils.offload import CPU_POOL_KIND, run_cpu, run_stateful
+from app.utils.text import POST_SEPARATOR
+from app.core.metrics import STAGE_LATENCY
 
 RECENT_WINDOW_DAYS = int(os.getenv("RECENT_WINDOW_DAYS", "365"))
 MAX_TEXT_LEN = int(os.getenv("MAX_TEXT_LEN", "200000"))
 RL_TYPE_VELOG = os.getenv("RL_VELOG_TYPE", "VELOG")
 LOCAL_TZ = os.getenv("LOCAL_TZ", "Asia/Seoul")
+# 큐 워커/일괄 수집이 공유하는 프로세스 전역 동시 크롤링 상한
+INGEST_MAX_CONCURRENCY = int(os.getenv("INGEST_MAX_CONCURRENCY", "4"))
+BATCH_MAX_RESUMES = int(os.getenv("BATCH_MAX_RESUMES", "500"))
+
+# 크롤러 → payload 빌더 사이에 쌓아 둘 수 있는 글 수 (작업당 메모리 상한)
+CRAWL_STREAM_BUFFER = int(os.getenv("CRAWL_STREAM_BUFFER", "16"))
+# 빌더에 한 번에 넘길 글 수 (CPU 풀 왕복 횟수를 줄임, CRAWL_STREAM_BUFFER 이하 권장)
+CRAWL_STREAM_BATCH = int(os.getenv("CRAWL_STREAM_BATCH", "8"))
+
+# RUNNING 작업의 updated_at 갱신 주기 (INGEST_STALE_RUNNING_SEC 보다 충분히 짧게)
+INGEST_HEARTBEAT_SEC = float(os.getenv("INGEST_HEARTBEAT_SEC", "60"))
+
+_crawl_sem = asyncio.Semaphore(max(1, INGEST_MAX_CONCURRENCY))
+
+logger = logging.getLogger(__name__)
 
 
 def _today_local_date():
@@ -39,48 +64,6 @@ def _today_local_date():
         return datetime.now().date()
 
 
-def _build_recent_activity(posts: list[dict]) -> str:
-    """
-    크롤링된 posts에서 최근 N일(RECENT_WINDOW_DAYS) 내 글만 뽑아
-    'YYYY-MM-DD | [제목]\n본문' 형태로 병합한 큰 텍스트를 만든다.
-    """
-    items: list[tuple[str, str, str]] = []
-
-    for p in posts:
-        iso = normalize_created_at(p.get("published_at"), tz=LOCAL_TZ)
-        if not iso:
-            continue
-        text = (p.get("text") or "").strip()
-        if not text:
-            continue  # 본문이 비어있으면 제외
-        if MAX_TEXT_LEN and len(text) > MAX_TEXT_LEN:
-            text = text[:MAX_TEXT_LEN]
-        title = (p.get("title") or "").strip()
-        items.append((iso, title, text))
-
-    if not items:
-        return ""
-
-    # 최근 N일 컷오프
-    cutoff = _today_local_date() - timedelta(days=RECENT_WINDOW_DAYS)
-
-    # 튜플 인덱싱으로 안전 필터
-    filtered: list[tuple[str, str, str]] = []
-    for (d, t, c) in items:
-        try:
-            if datetime.fromisoformat(d).date() >= cutoff:
-                filtered.append((d, t, c))
-        except Exception:
-            # 날짜 파싱 실패시 해당 항목 스킵
-            continue
-
-    if not filtered:
-        return ""
-
-    # 문자열 병합
-    return "\n---\n".join([f"{d} | [{t}]\n{c}".strip() for (d, t, c) in filtered])
-
-
 def _count_recent_posts(posts: list[dict], *, days: int, tz: str) -> int:
     try:
         z = ZoneInfo(tz) if tz else None
@@ -104,28 +87,33 @@ def _count_recent_posts(posts: list[dict], *, days: int, tz: str) -> int:
 
 
 
-async def ingest_velog_single(resume_id: str, url: str | None):
-    url = (url or "").strip()
-
-    # 대상 resume_link.id 찾기 (없으면 404)
+async def _find_velog_link_id(resume_id: str, url: str):
+    """대상 resume_link.id 찾기. 없으면 None."""
     async with SessionLocal() as s:
         res = await s.execute(
             SQL_FIND_RESUME_LINK_ID,
             {"rid": resume_id, "lt": RL_TYPE_VELOG, "url": url},
         )
         row = res.mappings().first()
+    return row["id"] if row else None
+
 
-    if not row:
+async def resolve_velog_job(resume_id: str, url: str):
+    """
+    (lid, 즉시 반환할 결과) 를 돌려준다.
+    링크가 없거나 URL이 공란이면 큐에 넣을 필요 없이 결과가 확정된다.
+    """
+    lid = await _find_velog_link_id(resume_id, url)
+
+    if not lid:
         if not url:   # url이 None → "" 변환된 케이스
-                    return {"claimed": False, "status": "NOTEXISTED"}
+            return None, {"claimed": False, "status": "NOTEXISTED"}
         # 주어진 resume_id/url로 VELOG 유형의 링크 행을 못 찾음
         raise HTTPException(
             status_code=404,
             detail={"errorCode": "NOT_FOUND", "message": "resume_link(row) not found for given resume_id/url"},
         )
 
-    lid = row["id"]
-
     # URL 공란이면: NOTEXISTED + 더미 gzip 후 종료
     if not url:
         payload = {
@@ -134,17 +122,24 @@ async def ingest_velog_single(resume_id: str, url: str | None):
             "post_count": 0,
             "recent_activity": ""
         }
-        dummy = to_gzip_bytes_from_json(payload)
+        dummy = encode_contents(payload)
 
-        
         async with SessionLocal() as s0:
             await s0.execute(
                 SQL_SET_NOTEXISTED_IF_NOT_TERMINAL,
                 {"rid": resume_id, "lid": lid, "contents": dummy},
             )
             await s0.commit()
-        return {"claimed": False, "status": "NOTEXISTED"}
+        return lid, {"claimed": False, "status": "NOTEXISTED"}
 
+    return lid, None
+
+
+async def run_velog_job(resume_id: str, lid, url: str):
+    """
+    PENDING -> RUNNING 선점(CAS) 후 크롤링/저장.
+    선점 실패 시 SKIPPED, 크롤링 실패 시 FAILED 로 전이하고 예외를 그대로 올린다.
+    """
     # RUNNING 선점 (PENDING -> RUNNING)
     async with SessionLocal() as s1:
         r = await s1.execute(SQL_CLAIM_RUNNING, {"rid": resume_id, "lid": lid})
@@ -153,38 +148,198 @@ async def ingest_velog_single(resume_id: str, url: str | None):
             # 이미 RUNNING/COMPLETED/FAILED/NOTEXISTED 등
             return {"claimed": False, "status": "SKIPPED"}
 
-    # 실제 크롤링
+    return await crawl_claimed_velog(resume_id, lid, url)
+
+
+async def _heartbeat(resume_id: str, lid) -> None:
+    """선점한 작업이 끝날 때까지 updated_at 을 갱신해 stale 복구 대상에서 빼 둔다."""
+    while True:
+        await asyncio.sleep(INGEST_HEARTBEAT_SEC)
+        try:
+            async with SessionLocal() as s:
+                await s.execute(SQL_TOUCH_RUNNING, {"rid": resume_id, "lid": lid})
+                await s.commit()
+        except Exception as e:
+            logger.warning("heartbeat for %s-%s failed: %s", resume_id, lid, e)
+
+
+async def _requeue_running(resume_id: str, lid) -> None:
     try:
-        crawled = await vc.crawl_all_with_url(url)
-        posts = crawled.get("posts", [])
-        post_count = int(crawled.get("post_count", len(posts)))
-
-        raw_count = _count_recent_posts(
-            posts,
-            days=RECENT_WINDOW_DAYS,
-            tz=LOCAL_TZ,
-        )
+        async with SessionLocal() as s:
+            await s.execute(SQL_REQUEUE_RUNNING, {"rid": resume_id, "lid": lid})
+            await s.commit()
+    except Exception as e:
+        logger.warning("requeue of %s-%s failed: %s", resume_id, lid, e)
 
-        recent_count = math.floor((raw_count+1)/2)
-        if(post_count < recent_count):
-            recent_count = post_count
 
-        recent_activity = _build_recent_activity(posts)
+async def crawl_claimed_velog(resume_id: str, lid, url: str):
+    """
+    RUNNING 으로 선점된 작업을 전역 동시성 상한 안에서 크롤링/저장.
+    슬롯 대기 중에도 생존 신호를 보내고, 종료/취소로 중단되면 PENDING 으로 되돌린다
+    (일반 예외는 _crawl_claimed_velog 에서 FAILED 처리).
+    """
+    beat = asyncio.create_task(_heartbeat(resume_id, lid))
+    try:
+        async with _crawl_sem:
+            return await _crawl_claimed_velog(resume_id, lid, url)
+    except asyncio.CancelledError:
+        await _requeue_running(resume_id, lid)
+        raise
+    finally:
+        beat.cancel()
 
-        payload = {
-            "source": "velog",
-            "base_url": url,
-            "post_count": post_count,
-            "recent_count": recent_count,
-            "recent_activity": recent_activity,
-        }
 
+def _recent_count(raw_count: int, post_count: int) -> int:
+    recent_count = math.floor((raw_count+1)/2)
+    if(post_count < recent_count):
+        recent_count = post_count
+    return recent_count
 
-        if DEBUG_RETURN:
-                    return {"status": "DEBUG", "data": payload}
 
+def velog_entries(posts: list[dict], cutoff) -> tuple[int, int, list[str]]:
+    """
+    글 묶음 → (받은 글 수, 최근 N일 글 수, recent_activity 항목들).
+    날짜 정규화/자르기/포맷만 하는 순수 함수라 run_cpu(프로세스 풀 포함)로 넘길 수 있다.
+    """
+    recent_raw = 0
+    entries = []
+    for post in posts:
+        iso = normalize_created_at(post.get("published_at"), tz=LOCAL_TZ)
+        if not iso:
+            continue
+        try:
+            if datetime.fromisoformat(iso).date() < cutoff:
+                continue
+        except Exception:
+            continue
+        recent_raw += 1
+
+        text = (post.get("text") or "").strip()
+        if not text:
+            continue
+        if MAX_TEXT_LEN and len(text) > MAX_TEXT_LEN:
+            text = text[:MAX_TEXT_LEN]
+        title = (post.get("title") or "").strip()
+        entries.append(f"{iso} | [{title}]\n{text}".strip())
+    return len(posts), recent_raw, entries
 
-        gz = to_gzip_bytes_from_json(payload)
+
+class VelogContentsStream:
+    """
+    스트리밍 ingest 용 payload 빌더.
+    글을 하나씩 받아 최근 N일 필터/자르기 후 recent_activity 를 압축 스트림에 바로 이어 쓴다.
+    글 본문은 모아 두지 않으므로 작성자의 글 수와 무관하게 작업당 메모리가 일정하다.
+    add()/write()/finish() 는 순서대로 한 번에 하나씩 호출한다(동시 호출 X).
+    """
+
+    def __init__(self, url: str):
+        self.cutoff = _today_local_date() - timedelta(days=RECENT_WINDOW_DAYS)
+        self.seen = 0
+        self.recent_raw = 0
+        self._entries = 0
+        self._w = ContentsWriter()
+        self._w.field("source", "velog")
+        self._w.field("base_url", url)
+        self._w.begin_string("recent_activity")
+
+    def add(self, post: dict) -> None:
+        self.add_many([post])
+
+    def add_many(self, posts: list[dict]) -> None:
+        self.write(*velog_entries(posts, self.cutoff))
+
+    def write(self, seen: int, recent_raw: int, entries: list[str]) -> None:
+        """velog_entries() 결과를 압축 스트림에 이어 쓴다 (상태 갱신만, 계산 없음)."""
+        self.seen += seen
+        self.recent_raw += recent_raw
+        for entry in entries:
+            if self._entries:
+                self._w.write_string(POST_SEPARATOR)
+            self._w.write_string(entry)
+            self._entries += 1
+
+    def finish(
+        self, post_count: int, stats: dict | None = None, cache_age_sec: int | None = None
+    ) -> bytes:
+        self._w.end_string()
+        self._w.field("post_count", post_count)
+        self._w.field("recent_count", _recent_count(self.recent_raw, post_count))
+        if stats:
+            self._w.field("fetch_stats", stats)
+        if cache_age_sec is not None:
+            self._w.field("cache_age_sec", cache_age_sec)
+        return self._w.close()
+
+
+async def feed_velog_contents(builder: VelogContentsStream, batch: list[dict]) -> None:
+    """글 묶음을 빌더에 반영. 포맷(순수 계산)은 CPU 풀, 압축 스트림 갱신은 상태가 있어 run_stateful."""
+    if CPU_POOL_KIND == "process":
+        counts = await run_cpu(velog_entries, batch, builder.cutoff)
+        await run_stateful(builder.write, *counts)
+    else:
+        await run_cpu(builder.add_many, batch)
+
+
+async def _stream_velog_contents(url: str, key: str) -> tuple[int, bytes]:
+    """
+    크롤러가 글을 확정하는 대로 받아(유한 큐) 바로 압축 payload 에 반영한다.
+    (post_count, 압축된 contents) 를 돌려준다.
+    """
+    stream = PostStream(CRAWL_STREAM_BUFFER)
+    builder = VelogContentsStream(url)
+
+    async def _produce():
+        try:
+            crawled = await vc.crawl_all_with_url(url, job_key=key, on_post=stream.put)
+        except BaseException as e:
+            await stream.close(e)
+            raise
+        await stream.close()
+        return crawled
+
+    producer = asyncio.create_task(_produce())
+    try:
+        batch: list[dict] = []
+        async for post in stream:
+            batch.append(post)
+            if len(batch) >= CRAWL_STREAM_BATCH:
+                await feed_velog_contents(builder, batch)
+                batch = []
+        if batch:
+            await feed_velog_contents(builder, batch)
+        crawled = await producer
+    finally:
+        if not producer.done():
+            # 소비 쪽 실패: 크롤러를 멈추고 막힌 put 을 풀어 준다
+            stream.abandon()
+            producer.cancel()
+        # 생산 쪽 예외는 스트림으로 이미 올라왔으니 여기선 회수만
+        await asyncio.gather(producer, return_exceptions=True)
+
+    post_count = int(crawled.get("post_count", builder.seen))
+    contents = await run_stateful(
+        builder.finish, post_count, crawled.get("stats"), crawled.get("cache_age_sec")
+    )
+    return post_count, contents
+
+
+def _job_key(resume_id: str, lid) -> str:
+    """크롤링 체크포인트 키 (같은 작업이 재시도/재기동되면 이어서 수집)"""
+    return f"{resume_id}-{lid}"
+
+
+@STAGE_LATENCY.timed(stage="ingest_velog")
+async def _crawl_claimed_velog(resume_id: str, lid, url: str):
+    # 실제 크롤링
+    key = _job_key(resume_id, lid)
+    try:
+        # 글 단위 스트리밍: 크롤링과 필터/자르기/압축이 함께 진행된다
+        post_count, gz = await _stream_velog_contents(url, key)
+
+        if DEBUG_RETURN:
+            payload = await run_cpu(load_json_contents, gz)
+            await asyncio.to_thread(checkpoint.discard, key)
+            return {"status": "DEBUG", "data": payload}
 
         # RUNNING -> COMPLETED + gzip 저장
         async with SessionLocal() as s2:
@@ -194,14 +349,122 @@ async def ingest_velog_single(resume_id: str, url: str | None):
             )
             await s2.commit()
 
+        # 저장까지 끝났으니 체크포인트 정리 (저장 실패 시엔 남겨서 재시도 때 재사용)
+        await asyncio.to_thread(checkpoint.discard, key)
         return {"claimed": True, "status": "COMPLETED", "post_count": post_count}
 
-    except Exception as e:
+    except Exception:
         # RUNNING -> FAILED
         async with SessionLocal() as s3:
             await s3.execute(SQL_SET_FAILED_IF_RUNNING, {"rid": resume_id, "lid": lid})
             await s3.commit()
+        raise
+
+
+async def ingest_velog_single(resume_id: str, url: str | None):
+    """요청 안에서 끝까지 크롤링하는 동기식 경로 (디버그/워커 미사용 시)."""
+    url = (url or "").strip()
+
+    lid, done = await resolve_velog_job(resume_id, url)
+    if done is not None:
+        return done
+
+    try:
+        return await run_velog_job(resume_id, lid, url)
+    except Exception as e:
         raise HTTPException(
             status_code=500,
             detail={"errorCode": "CRAWLING_FAILED", "message": str(e)},
         )
+
+
+async def find_crawl_status(resume_id: str, lid) -> str | None:
+    async with SessionLocal() as s:
+        res = await s.execute(SQL_FIND_CRAWL_STATUS, {"rid": resume_id, "lid": lid})
+        row = res.mappings().first()
+    return row["status"] if row else None
+
+
+async def find_velog_statuses(resume_id: str) -> list[dict]:
+    async with SessionLocal() as s:
+        res = await s.execute(
+            SQL_FIND_VELOG_STATUS_BY_RID, {"rid": resume_id, "lt": RL_TYPE_VELOG}
+        )
+        return [dict(r) for r in res.mappings().all()]
+
+
+# 일괄 수집에서 분리한 크롤링 태스크 (GC 방지용 참조)
+_background: set = set()
+
+
+async def ingest_velog_batch(resume_ids: list[str]):
+    """
+    여러 resume 의 VELOG 수집을 한 번에 처리하며, 끝나는 순서대로 결과를 yield 한다.
+    - 링크 조회: IN (...) 쿼리 1회
+    - 선점: 한 트랜잭션에서 PENDING 행 잠금 + UPDATE 1회
+    - 크롤링: 공유 브라우저 풀 위에서 전역 세마포어(INGEST_MAX_CONCURRENCY)로 동시 실행
+    """
+    rids = list(dict.fromkeys(r for r in resume_ids if r))
+
+    async with SessionLocal() as s:
+        res = await s.execute(SQL_FIND_VELOG_LINKS_BY_RIDS, {"rids": rids, "lt": RL_TYPE_VELOG})
+        links = [dict(r) for r in res.mappings().all()]
+
+    found = {str(l["resume_id"]) for l in links}
+    for rid in rids:
+        if str(rid) not in found:
+            yield {"resumeId": rid, "status": "NOT_FOUND"}
+
+    empty = [l for l in links if not (l["url"] or "").strip()]
+    targets = {l["resume_link_id"]: l for l in links if (l["url"] or "").strip()}
+
+    # URL 공란 -> NOTEXISTED (더미 gzip 공유)
+    if empty:
+        dummy = encode_contents({
+            "source": "velog",
+            "base_url": "",
+            "post_count": 0,
+            "recent_activity": "",
+        })
+        async with SessionLocal() as s0:
+            await s0.execute(
+                SQL_SET_NOTEXISTED_BY_LIDS,
+                {"lids": [l["resume_link_id"] for l in empty], "contents": dummy},
+            )
+            await s0.commit()
+        for l in empty:
+            yield {"resumeId": l["resume_id"], "resumeLinkId": l["resume_link_id"], "status": "NOTEXISTED"}
+
+    # PENDING -> RUNNING 일괄 선점
+    claimed = []
+    if targets:
+        async with SessionLocal() as s1:
+            async with s1.begin():
+                res = await s1.execute(SQL_LOCK_PENDING_BY_LIDS, {"lids": list(targets)})
+                rows = res.mappings().all()
+                if rows:
+                    await s1.execute(SQL_CLAIM_RUNNING_BY_IDS, {"ids": [r["id"] for r in rows]})
+        claimed = [r["resume_link_id"] for r in rows]
+
+    claimed_set = set(claimed)
+    for lid, l in targets.items():
+        if lid not in claimed_set:
+            yield {"resumeId": l["resume_id"], "resumeLinkId": lid, "status": "SKIPPED"}
+
+    async def _one(lid):
+        l = targets[lid]
+        base = {"resumeId": l["resume_id"], "resumeLinkId": lid}
+        try:
+            result = await crawl_claimed_velog(l["resume_id"], lid, l["url"].strip())
+            return base | result
+        except Exception as e:
+            return base | {"claimed": True, "status": "FAILED", "message": str(e)}
+
+    # 클라이언트가 끊겨도 선점한 작업은 끝까지 돌도록 태스크로 분리
+    tasks = [asyncio.create_task(_one(lid)) for lid in claimed]
+    _background.update(tasks)
+    for t in tasks:
+        t.add_done_callback(_background.discard)
+    for fut in asyncio.as_completed(tasks):
+        yield await fut
+
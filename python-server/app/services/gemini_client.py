@@ -1,11 +1,51 @@
 # app/routes/resume.py
 from google import genai
 from dotenv import load_dotenv
+import asyncio, time
 import os
+from app.core.metrics import STAGE_LATENCY, GEMINI_CALLS
 load_dotenv()
 
 # 환경 변수 로드
 API_KEY = os.getenv("GEMINI_API_KEY")
 
+# 동시 호출 상한 / 분당 호출 수(0이면 제한 없음)
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_RPM = int(os.getenv("GEMINI_RPM", "0"))
+
 client = genai.Client(api_key=API_KEY)
 
+_sem = asyncio.Semaphore(max(1, GEMINI_MAX_CONCURRENCY))
+_rate_lock = asyncio.Lock()
+_next_slot = 0.0
+
+
+async def _wait_rate_slot():
+    """GEMINI_RPM 기준으로 호출 시작 간격을 벌린다."""
+    global _next_slot
+    if GEMINI_RPM <= 0:
+        return
+    interval = 60.0 / GEMINI_RPM
+    async with _rate_lock:
+        now = time.monotonic()
+        wait = _next_slot - now
+        _next_slot = max(now, _next_slot) + interval
+    if wait > 0:
+        await asyncio.sleep(wait)
+
+
+async def generate_content(model: str, contents):
+    """
+    비동기 클라이언트(client.aio)로 Gemini 호출.
+    이벤트 루프를 막지 않고, 동시성/속도 상한 안에서만 실행된다.
+    """
+    async with _sem:
+        await _wait_rate_slot()
+        outcome = "error"
+        try:
+            with STAGE_LATENCY.time(stage="gemini_call"):
+                resp = await client.aio.models.generate_content(model=model, contents=contents)
+            outcome = "ok"
+            return resp
+        finally:
+            GEMINI_CALLS.inc(model=model, outcome=outcome)
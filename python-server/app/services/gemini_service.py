@@ -1,31 +1,143 @@
-from app.services.gemini_client import client
+from app.services.gemini_client import generate_content
+from app.services.llm_cache import cache as llm_cache, make_key
+from app.utils.text import split_by_token_budget
+import asyncio
 import re
 from fastapi import HTTPException
-from app.utils.codec import decompress_gzip
+from app.utils.codec import load_json_contents
+from app.core.metrics import STAGE_LATENCY
 import json
 import logging
+import os
 
 from app.db import (
     SessionLocal,
     SQL_FIND_CRAWLING_RESULTS_BY_RID,
-    SQL_UPSERT_PORTFOLIO_RESULT
+    PORTFOLIO_UPSERT_BATCH,
+    SQL_FIND_PORTFOLIO_UNIQUE_KEY,
+    sql_upsert_portfolio_results,
+    portfolio_upsert_params,
 )
 
 MODEL = "gemini-2.5-flash"
+# 프롬프트 문구를 바꾸면 올려서 이전 캐시를 무효화
+KEYWORD_PROMPT_VERSION = "kw-v1"
+# 한 번의 프롬프트에 넣을 입력 토큰 예산(대략치)과 글자/토큰 환산 비율
+KEYWORD_CHUNK_TOKENS = int(os.getenv("KEYWORD_CHUNK_TOKENS", "20000"))
+GEMINI_CHARS_PER_TOKEN = float(os.getenv("GEMINI_CHARS_PER_TOKEN", "1.5"))
+# 기동 시 portfolio_result UNIQUE(crawling_result_id) 확인: strict(없으면 기동 실패) | warn | off
+PORTFOLIO_UNIQUE_CHECK = os.getenv("PORTFOLIO_UNIQUE_CHECK", "strict").lower()
 
 logger = logging.getLogger(__name__)
 
-async def insert_failed_data(session, row):
+def failed_data(row) -> dict:
     processed_data = {"keywords": {}}
-    status = "FAILED"
-    await session.execute(
-        SQL_UPSERT_PORTFOLIO_RESULT,
-        {
-            "crawling_result_id": row.crawling_result_id,
-            "processed_contents": json.dumps(processed_data, ensure_ascii=False),
-            "status": status
-        }
+    return {
+        "crawling_result_id": row.crawling_result_id,
+        "processed_contents": json.dumps(processed_data, ensure_ascii=False),
+        "status": "FAILED",
+    }
+
+
+async def upsert_portfolio_results(session, rows: list[dict]) -> None:
+    """
+    portfolio_result 를 crawling_result_id 기준으로 upsert 한다(배치당 INSERT ... ON DUPLICATE KEY 한 문장).
+    호출자 트랜잭션 안에서 실행하므로 commit 전까지 원자적.
+    """
+    step = max(1, PORTFOLIO_UPSERT_BATCH)
+    for i in range(0, len(rows), step):
+        chunk = rows[i:i + step]
+        await session.execute(sql_upsert_portfolio_results(len(chunk)), portfolio_upsert_params(chunk))
+
+
+async def check_portfolio_unique_key() -> None:
+    """
+    upsert 가 기대는 UNIQUE(crawling_result_id) 가 있는지 기동 시 확인한다.
+    없으면 ON DUPLICATE KEY 가 동작하지 않아 재처리마다 행이 쌓이므로
+    migrations/001_portfolio_result_unique_crawling_result_id.sql 적용을 요구한다.
+    DB 에 연결할 수 없을 때는 경고만 남긴다(기동은 계속).
+    """
+    if PORTFOLIO_UNIQUE_CHECK == "off":
+        return
+    try:
+        async with SessionLocal() as session:
+            res = await session.execute(SQL_FIND_PORTFOLIO_UNIQUE_KEY)
+            found = res.first() is not None
+    except Exception as e:
+        logger.warning("portfolio_result unique key check skipped: %s", e)
+        return
+    if found:
+        return
+    msg = (
+        "portfolio_result has no UNIQUE(crawling_result_id); "
+        "apply migrations/001_portfolio_result_unique_crawling_result_id.sql"
     )
+    if PORTFOLIO_UNIQUE_CHECK == "strict":
+        raise RuntimeError(msg)
+    logger.error(msg)
+
+async def _process_row(row):
+    """
+    crawling_result 한 행을 키워드 처리한다.
+    반환: (processed_data, status) — 실패/스킵이면 status 가 "FAILED"/None
+    """
+    crawling_status = row.crawling_status
+
+    if crawling_status in ["FAILED", "NOTEXISTED"]:
+        return None, "FAILED"
+
+    elif crawling_status in ["RUNNING", "PENDING"]:
+        return None, None
+
+    try:
+        # 해제하면서 바로 JSON 으로 (해제 문자열 사본을 따로 들고 있지 않음)
+        data_json = load_json_contents(row.contents)
+    except Exception as e:
+        logger.error("Decompress/JSON parse error: {%s}", e)
+        return None, "FAILED"
+
+    try:
+        if row.link_type == "VELOG":
+            recent_activity = data_json.get("recent_activity") or ""
+            # 본문(사용자 글 전체)은 남기지 않는다
+            logger.debug("velog recent_activity: %d chars", len(recent_activity))
+            processed_data = {
+                "keywords": await extract_keywords_chunked(recent_activity),
+                "count": int(data_json.get("post_count", 0)),
+                "dateCount": int(data_json.get("recent_count", 0)),
+            }
+        elif row.link_type == "GITHUB":
+            readme = data_json.get("repoReadme", "") or ""
+            # 두 프롬프트는 서로 독립이라 동시에 호출
+            keywords, tech = await asyncio.gather(
+                extract_keywords_chunked(readme),
+                extract_keywords_chunked(readme, "기술 스택 키워드"),
+            )
+            processed_data = {
+                "keywords": keywords,
+                "tech": tech,
+                "commits": int(data_json.get("commitCount", 0)),
+                "repos": int(data_json.get("repositoryCount", 0)),
+            }
+        elif row.link_type == "NOTION":
+            processed_data = {
+                "keywords": await extract_keywords_chunked(data_json.get("content", "") or ""),
+            }
+        else:
+            logger.warning("Unsupported link type: {%s}", row.link_type)
+            return None, "FAILED"
+
+    except KeywordExtractionError as e:
+            logger.warning("키워드 추출 실패: %s", e)
+            return None, "FAILED"
+
+    except Exception as e:
+        # 지원하지 않는 타입
+            logger.error("Processing failed for row {%s}: {%s}", row.crawling_result_id, e)
+            return None, "FAILED"
+
+    return processed_data, "COMPLETED"
+
 
 async def extract_keywrods_with_resume_id(resume_id: str):
     async with SessionLocal() as session:
@@ -43,85 +155,32 @@ async def extract_keywrods_with_resume_id(resume_id: str):
                 status_code=404,
                 detail={"errorCode": "NOT_FOUND", "message": "resume_link(row) not found for given resume_id/url"},
             )
-        
-        portfolio_entries = []
 
-        for row in rows:
+        # 2. 모든 행을 동시에 처리 (모델 호출 동시성은 gemini_client 에서 제한)
+        results = await asyncio.gather(*(_process_row(row) for row in rows))
 
-            crawling_status = row.crawling_status
-            
-            if crawling_status in ["FAILED", "NOTEXISTED"]:
+        portfolio_entries = []
+        upserts = []
 
-                await insert_failed_data(session, row)
+        # 3. portfolio_result 기록 (성공/실패 모두 모아서 한 번에 upsert)
+        for row, (processed_data, status) in zip(rows, results):
+            if status is None:
                 continue
 
-            elif crawling_status in ["RUNNING", "PENDING"]:
+            if status == "FAILED":
+                upserts.append(failed_data(row))
                 continue
 
-            try:
-                raw_contents = await decompress_gzip(row.contents)
-
-                print(raw_contents[:100])
-                data_json = json.loads(raw_contents)
-            except Exception as e:
-                logger.error("Decompress/JSON parse error: {%s}", e)
-                await insert_failed_data(session, row)
-                continue  # 해당 row 스킵
-            
-            try:
-                if row.link_type == "VELOG":
-                    dumped_data = json.dumps(data_json.get("recent_activity", []), ensure_ascii=False)
-                    logger.warning("===== VELOG raw_contents ===== %s", raw_contents)
-                    logger.warning("===== VELOG dumped_data ===== %s", dumped_data)
-                    processed_data = {
-                        "keywords": await extract_keywords(dumped_data),
-                        "count": int(data_json.get("post_count", 0)),
-                        "dateCount": int(data_json.get("recent_count", 0)),
-                        # "dateCount": await extract_dateCount(dumped_data),
-                    }
-                elif row.link_type == "GITHUB":
-                    dumped_data = json.dumps(data_json.get("repoReadme", ""), ensure_ascii=False)
-                    processed_data = {
-                        "keywords": await extract_keywords(dumped_data),
-                        "tech": await extract_keywords(dumped_data, "기술 스택 키워드"),
-                        "commits": int(data_json.get("commitCount", 0)),
-                        "repos": int(data_json.get("repositoryCount", 0)),
-                    }
-                elif row.link_type == "NOTION":
-                    dumped_data = json.dumps(data_json.get("content", ""), ensure_ascii=False)
-                    processed_data = {
-                        "keywords": await extract_keywords(dumped_data),
-                    }
-                else:
-                    logger.warning("Unsupported link type: {%s}", row.link_type)
-                    await insert_failed_data(session, row)
-                    continue
-
-                status = "COMPLETED"
-
-            except KeywordExtractionError as e:
-                    logger.warning("키워드 추출 실패: %s", e)
-                    await insert_failed_data(session, row)
-                    continue
-            
-            except Exception as e:
-                # 지원하지 않는 타입
-                    logger.error("Processing failed for row {%s}: {%s}", row.crawling_result, e)
-                    await insert_failed_data(session, row)
-                    continue
-            
-            # 4. portfolio_result 삽입
-            await session.execute(
-                SQL_UPSERT_PORTFOLIO_RESULT,
-                {
-                    "crawling_result_id": row.crawling_result_id,
-                    "processed_contents": json.dumps(processed_data, indent=2, ensure_ascii=False),
-                    "status": status
-                }
-            )
+            upserts.append({
+                "crawling_result_id": row.crawling_result_id,
+                "processed_contents": json.dumps(processed_data, indent=2, ensure_ascii=False),
+                "status": status,
+            })
 
             portfolio_entries.append({"crawling_result_id": row.crawling_result_id, "contents": processed_data})
 
+        if upserts:
+            await upsert_portfolio_results(session, upserts)
         await session.commit()
 
     return {"resumeId": resume_id, "processed": portfolio_entries}
@@ -152,7 +211,14 @@ async def extract_keywrods_with_resume_id(resume_id: str):
 
 
 
+@STAGE_LATENCY.timed(stage="extract_keywords")
 async def extract_keywords(text: str, type="기술 키워드") -> list:
+    cache_key = make_key(MODEL, KEYWORD_PROMPT_VERSION, f"{type}\x00{text.strip()}")
+    if llm_cache is not None:
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
+
     prompt = f"""
     다음은 조건들이야. 이 조건들을 활용해서 '텍스트:' 이후 내용에서 {type} 위주로 모두 뽑아줘.
     - 출력은 JSON 배열 형식으로만 반환해.
@@ -164,11 +230,12 @@ async def extract_keywords(text: str, type="기술 키워드") -> list:
     '텍스트': {text.strip()}
     """
 
-    print(prompt)
+    # 프롬프트에는 이력서/블로그 본문이 들어 있으므로 길이만 남긴다
+    logger.debug("keyword prompt (%s): %d chars", type, len(prompt))
 
     try:
         # 4) Gemini API 호출
-        response = client.models.generate_content(
+        response = await generate_content(
             model=MODEL,
             contents=prompt
         )
@@ -177,7 +244,7 @@ async def extract_keywords(text: str, type="기술 키워드") -> list:
         # 5) 전처리: 코드블록 제거
         clean_output = re.sub(r"```(?:json)?", "", raw_output)
         clean_output = clean_output.replace("```", "").strip()
-        print(clean_output)
+        logger.debug("keyword raw output: %s", clean_output)
         # 6) JSON 배열 파싱
         try:
             keywords = json.loads(clean_output)
@@ -189,13 +256,63 @@ async def extract_keywords(text: str, type="기술 키워드") -> list:
         if not isinstance(keywords, list):
             logger.error("키워드 응답이 배열 형식이 아닙니다.")
             raise KeywordExtractionError("리턴값이 리스트 아님")
-        
+
+        if llm_cache is not None:
+            await llm_cache.set(cache_key, json.dumps(keywords, ensure_ascii=False))
         return keywords
     
     except Exception as e:
         logger.error("키워드 추출에 실패했습니다. : %s", e)
         raise KeywordExtractionError(e) from e
 
+def merge_keywords(lists: list[list]) -> list:
+    """
+    청크별 키워드 목록을 합친다.
+    대소문자/공백 무시 중복 제거, 등장한 청크 수가 많은 순(동률이면 먼저 나온 순).
+    """
+    counts: dict[str, int] = {}
+    first: dict[str, tuple[int, str]] = {}
+    order = 0
+    for kws in lists:
+        seen_here = set()
+        for kw in kws:
+            if not isinstance(kw, str) or not kw.strip():
+                continue
+            norm = " ".join(kw.split()).casefold()
+            if norm in seen_here:
+                continue
+            seen_here.add(norm)
+            counts[norm] = counts.get(norm, 0) + 1
+            if norm not in first:
+                first[norm] = (order, kw.strip())
+                order += 1
+    ranked = sorted(counts, key=lambda n: (-counts[n], first[n][0]))
+    return [first[n][1] for n in ranked]
+
+
+async def extract_keywords_chunked(text: str, type="기술 키워드") -> list:
+    """
+    큰 텍스트를 글 경계 기준 토큰 예산 청크로 나눠 병렬 추출(map) 후 병합(reduce).
+    청크가 하나면 기존과 같은 단일 호출이다.
+    """
+    chunks = split_by_token_budget(
+        text, KEYWORD_CHUNK_TOKENS, chars_per_token=GEMINI_CHARS_PER_TOKEN
+    ) or [text]
+    if len(chunks) == 1:
+        return await extract_keywords(json.dumps(chunks[0], ensure_ascii=False), type)
+
+    results = await asyncio.gather(
+        *(extract_keywords(json.dumps(c, ensure_ascii=False), type) for c in chunks),
+        return_exceptions=True,
+    )
+    ok = [r for r in results if isinstance(r, list)]
+    if not ok:
+        raise KeywordExtractionError(f"모든 청크({len(chunks)}개) 추출 실패")
+    if len(ok) < len(chunks):
+        logger.warning("키워드 청크 %d/%d 실패, 나머지로 병합", len(chunks) - len(ok), len(chunks))
+    return merge_keywords(ok)
+
+
 class KeywordExtractionError(Exception):
     """키워드 추출 실패 예외"""
     pass
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Velog 수집 백그라운드 큐.
+
+crawling_result 의 PENDING 행이 곧 durable job 이다.
+- 엔드포인트는 submit()으로 작업을 바로 큐에 넣고 202를 반환
+- 디스패처가 주기적으로 PENDING 행을 조회해 큐를 채운다(재기동/유실 복구)
+- 워커 N개가 작업을 꺼내 SQL_CLAIM_RUNNING(CAS)으로 선점 후 크롤링
+  → 전체 동시 수집 수 = 워커 수
+"""
+from typing import Optional, Set, Tuple
+import asyncio, logging, os
+
+from app.db import SessionLocal, SQL_FIND_PENDING_VELOG_JOBS, SQL_REQUEUE_STALE_RUNNING
+from app.services import crawler_service as svc
+
+logger = logging.getLogger(__name__)
+
+INGEST_WORKERS = int(os.getenv("INGEST_WORKERS", "2"))
+INGEST_POLL_SEC = float(os.getenv("INGEST_POLL_SEC", "10"))
+INGEST_POLL_PENDING = os.getenv("INGEST_POLL_PENDING", "1") == "1"
+# 이 시간 이상 생존 신호(updated_at 갱신, INGEST_HEARTBEAT_SEC 주기)가 없는 RUNNING 행은
+# 죽은 작업으로 보고 PENDING 으로 되돌림
+INGEST_STALE_RUNNING_SEC = int(os.getenv("INGEST_STALE_RUNNING_SEC", "1800"))
+
+JobKey = Tuple[str, str]
+
+
+class IngestWorkerPool:
+    def __init__(self, workers: int, poll_sec: float):
+        self.workers = max(1, workers)
+        self.poll_sec = poll_sec
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._wakeup = asyncio.Event()
+        self._known: Set[JobKey] = set()     # 큐 대기 + 실행 중
+        self._running: Set[JobKey] = set()
+        self._tasks: list[asyncio.Task] = []
+
+    def submit(self, resume_id: str, lid, url: str) -> bool:
+        key = (str(resume_id), str(lid))
+        if key in self._known:
+            return False
+        self._known.add(key)
+        self._queue.put_nowait((resume_id, lid, url))
+        return True
+
+    def state_of(self, resume_id: str, lid) -> Optional[str]:
+        key = (str(resume_id), str(lid))
+        if key in self._running:
+            return "RUNNING"
+        if key in self._known:
+            return "QUEUED"
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "running": len(self._running),
+        }
+
+    async def start(self) -> None:
+        self._tasks = [
+            asyncio.create_task(self._worker(i), name=f"ingest-worker-{i}")
+            for i in range(self.workers)
+        ]
+        if INGEST_POLL_PENDING:
+            self._tasks.append(asyncio.create_task(self._dispatcher(), name="ingest-dispatcher"))
+
+    async def stop(self) -> None:
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _poll_once(self) -> None:
+        async with SessionLocal() as s:
+            await s.execute(
+                SQL_REQUEUE_STALE_RUNNING,
+                {"lt": svc.RL_TYPE_VELOG, "stale_sec": INGEST_STALE_RUNNING_SEC},
+            )
+            await s.commit()
+            res = await s.execute(
+                SQL_FIND_PENDING_VELOG_JOBS,
+                {"lt": svc.RL_TYPE_VELOG, "limit": self.workers * 4},
+            )
+            rows = res.mappings().all()
+        for r in rows:
+            self.submit(r["resume_id"], r["resume_link_id"], (r["url"] or "").strip())
+
+    async def _dispatcher(self) -> None:
+        while True:
+            try:
+                # 큐가 비어 있을 때만 DB에서 채운다
+                if self._queue.empty():
+                    await self._poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("ingest dispatcher poll failed: %s", e)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_sec)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            resume_id, lid, url = await self._queue.get()
+            key = (str(resume_id), str(lid))
+            self._running.add(key)
+            try:
+                result = await svc.run_velog_job(resume_id, lid, url)
+                logger.info("ingest job %s done: %s", key, result)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("ingest job %s failed: %s", key, e)
+            finally:
+                self._running.discard(key)
+                self._known.discard(key)
+                self._queue.task_done()
+                if self._queue.empty():
+                    self._wakeup.set()
+
+
+_POOL: Optional[IngestWorkerPool] = None
+
+
+def get_worker_pool() -> Optional[IngestWorkerPool]:
+    return _POOL
+
+
+async def start_workers() -> Optional[IngestWorkerPool]:
+    global _POOL
+    if INGEST_WORKERS <= 0 or _POOL is not None:
+        return _POOL
+    _POOL = IngestWorkerPool(INGEST_WORKERS, INGEST_POLL_SEC)
+    await _POOL.start()
+    return _POOL
+
+
+async def stop_workers() -> None:
+    global _POOL
+    pool, _POOL = _POOL, None
+    if pool is not None:
+        await pool.stop()
+
+
+async def enqueue_velog_ingest(resume_id: str, url: str | None) -> dict:
+    """
+    작업을 백그라운드 큐에 넣고 바로 반환한다.
+    워커가 꺼져 있으면(INGEST_WORKERS=0) 기존처럼 요청 안에서 크롤링한다.
+    """
+    pool = get_worker_pool()
+    if pool is None:
+        return await svc.ingest_velog_single(resume_id, url)
+
+    url = (url or "").strip()
+    lid, done = await svc.resolve_velog_job(resume_id, url)
+    if done is not None:
+        return done
+
+    status = await svc.find_crawl_status(resume_id, lid)
+    if status != "PENDING":
+        return {"queued": False, "status": status or "NOTFOUND", "resume_link_id": lid}
+
+    pool.submit(resume_id, lid, url)
+    return {"queued": True, "status": "PENDING", "resume_link_id": lid}
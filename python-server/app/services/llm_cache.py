@@ -0,0 +1,160 @@
+"""
+LLM 응답 캐시.
+
+키 = sha256(모델명, 프롬프트 템플릿 버전, 입력 텍스트).
+- 1차: 프로세스 메모리 LRU
+- 2차(선택): SQLite 파일 (LLM_CACHE_SQLITE_PATH 지정 시), TTL + 행 수 상한으로 정리
+같은 텍스트를 다시 처리하면 모델 호출 없이 이전 결과를 돌려준다.
+"""
+from collections import OrderedDict
+from typing import Optional
+import asyncio, hashlib, logging, os, sqlite3, threading, time
+
+from app.core.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+LLM_CACHE_MAX_ITEMS = int(os.getenv("LLM_CACHE_MAX_ITEMS", "1024"))
+LLM_CACHE_TTL_SEC = int(os.getenv("LLM_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+LLM_CACHE_SQLITE_PATH = os.getenv("LLM_CACHE_SQLITE_PATH", "")
+LLM_CACHE_SQLITE_MAX_ROWS = int(os.getenv("LLM_CACHE_SQLITE_MAX_ROWS", "50000"))
+
+
+def make_key(model: str, version: str, text: str) -> str:
+    h = hashlib.sha256()
+    for part in (model, version, text or ""):
+        h.update(part.encode("utf-8", "ignore"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class _SqliteTier:
+    def __init__(self, path: str, ttl: int, max_rows: int):
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._writes = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+            " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+        self._conn.execute(
+            "DELETE FROM llm_cache WHERE key IN ("
+            " SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_rows,),
+        )
+
+
+class LLMCache:
+    def __init__(self, max_items: int, ttl: int, sqlite_path: str = "", sqlite_max_rows: int = 0):
+        self.max_items = max(1, max_items)
+        self.ttl = ttl
+        self._mem: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._disk: Optional[_SqliteTier] = None
+        if sqlite_path:
+            try:
+                self._disk = _SqliteTier(sqlite_path, ttl, sqlite_max_rows)
+            except sqlite3.Error as e:
+                logger.error("llm cache sqlite tier disabled: %s", e)
+        self.counters = {"mem_hits": 0, "disk_hits": 0, "misses": 0, "sets": 0}
+
+    def _mem_get(self, key: str) -> Optional[str]:
+        item = self._mem.get(key)
+        if item is None:
+            return None
+        created, value = item
+        if time.time() - created > self.ttl:
+            del self._mem[key]
+            return None
+        self._mem.move_to_end(key)
+        return value
+
+    def _mem_set(self, key: str, value: str) -> None:
+        self._mem[key] = (time.time(), value)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_items:
+            self._mem.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self._mem_get(key)
+        if value is not None:
+            self.counters["mem_hits"] += 1
+            CACHE_LOOKUPS.inc(cache="llm", result="mem_hit")
+            return value
+        if self._disk is not None:
+            try:
+                value = await asyncio.to_thread(self._disk.get, key)
+            except sqlite3.Error as e:
+                logger.warning("llm cache sqlite get failed: %s", e)
+                value = None
+            if value is not None:
+                self.counters["disk_hits"] += 1
+                CACHE_LOOKUPS.inc(cache="llm", result="disk_hit")
+                self._mem_set(key, value)
+                return value
+        self.counters["misses"] += 1
+        CACHE_LOOKUPS.inc(cache="llm", result="miss")
+        return None
+
+    async def set(self, key: str, value: str) -> None:
+        self.counters["sets"] += 1
+        self._mem_set(key, value)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.set, key, value)
+            except sqlite3.Error as e:
+                logger.warning("llm cache sqlite set failed: %s", e)
+
+    def stats(self) -> dict:
+        hits = self.counters["mem_hits"] + self.counters["disk_hits"]
+        total = hits + self.counters["misses"]
+        return {
+            **self.counters,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "mem_items": len(self._mem),
+            "persistent": self._disk is not None,
+        }
+
+
+cache: Optional[LLMCache] = (
+    LLMCache(LLM_CACHE_MAX_ITEMS, LLM_CACHE_TTL_SEC, LLM_CACHE_SQLITE_PATH, LLM_CACHE_SQLITE_MAX_ROWS)
+    if LLM_CACHE_ENABLED else None
+)
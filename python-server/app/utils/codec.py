@@ -1,19 +1,234 @@
-import gzip, json
+import gzip, io, json, os
 from io import BytesIO
 
+try:
+    import zstandard as zstd
+except ImportError:  # 선택 의존성: 없으면 gzip 만 사용
+    zstd = None
+
+# crawling_result.contents 압축 방식: gzip(기본) | zstd
+CONTENTS_CODEC = os.getenv("CONTENTS_CODEC", "gzip")
+ZSTD_LEVEL = int(os.getenv("ZSTD_LEVEL", "6"))
+# train_zstd_dictionary()로 만든 사전 파일 (한국어 블로그 본문처럼 반복이 많은 텍스트에 유리)
+ZSTD_DICT_PATH = os.getenv("ZSTD_DICT_PATH", "")
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_READ_CHUNK = 1 << 16
+
+_zstd_dict = None
+
+
+def _get_zstd_dict():
+    global _zstd_dict
+    if _zstd_dict is None and zstd is not None and ZSTD_DICT_PATH:
+        with open(ZSTD_DICT_PATH, "rb") as f:
+            _zstd_dict = zstd.ZstdCompressionDict(f.read())
+    return _zstd_dict
+
+
+def _write_json(fp, data) -> None:
+    """JSON 을 문자열 전체로 만들지 않고 조각 단위로 바이너리 스트림에 쓴다."""
+    w = io.TextIOWrapper(fp, encoding="utf-8")
+    for chunk in json.JSONEncoder(ensure_ascii=False).iterencode(data):
+        w.write(chunk)
+    w.flush()
+    w.detach()
+
+
 def to_gzip_bytes_from_json(data: dict) -> bytes:
-    raw = json.dumps(data, ensure_ascii=False).encode("utf-8")
-    return gzip.compress(raw, compresslevel=6)
+    buf = BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=6) as gz:
+        _write_json(gz, data)
+    return buf.getvalue()
+
+
+def to_zstd_bytes_from_json(data: dict, level: int = ZSTD_LEVEL) -> bytes:
+    if zstd is None:
+        raise RuntimeError("zstandard is not installed")
+    buf = BytesIO()
+    cctx = zstd.ZstdCompressor(level=level, dict_data=_get_zstd_dict())
+    with cctx.stream_writer(buf, closefd=False) as w:
+        _write_json(w, data)
+    return buf.getvalue()
+
+
+def encode_contents(data: dict) -> bytes:
+    """CONTENTS_CODEC 설정대로 압축. zstd 미설치면 gzip 으로 폴백."""
+    if CONTENTS_CODEC == "zstd" and zstd is not None:
+        return to_zstd_bytes_from_json(data)
+    return to_gzip_bytes_from_json(data)
+
+
+class ContentsWriter:
+    """
+    payload JSON 객체를 필드 단위로 압축 스트림에 바로 써 나간다.
+    긴 문자열 값(recent_activity 등)은 begin_string/write_string/end_string 으로 이어 쓰므로
+    값 전체를 메모리에 만들지 않는다. close() 가 압축된 bytes 를 돌려준다.
+    """
+
+    def __init__(self, codec: str = CONTENTS_CODEC):
+        self._buf = BytesIO()
+        if codec == "zstd" and zstd is not None:
+            cctx = zstd.ZstdCompressor(level=ZSTD_LEVEL, dict_data=_get_zstd_dict())
+            self._raw = cctx.stream_writer(self._buf, closefd=False)
+        else:
+            self._raw = gzip.GzipFile(fileobj=self._buf, mode="wb", compresslevel=6)
+        self._w = io.TextIOWrapper(self._raw, encoding="utf-8")
+        self._enc = json.JSONEncoder(ensure_ascii=False)
+        self._first = True
+        self._w.write("{")
+
+    def _key(self, key: str) -> None:
+        if not self._first:
+            self._w.write(", ")
+        self._first = False
+        self._w.write(self._enc.encode(key))
+        self._w.write(": ")
+
+    def field(self, key: str, value) -> None:
+        self._key(key)
+        for chunk in self._enc.iterencode(value):
+            self._w.write(chunk)
+
+    def begin_string(self, key: str) -> None:
+        self._key(key)
+        self._w.write('"')
+
+    def write_string(self, part: str) -> None:
+        # 따옴표를 뗀 JSON 이스케이프 본문만 이어 붙인다
+        self._w.write(self._enc.encode(part)[1:-1])
+
+    def end_string(self) -> None:
+        self._w.write('"')
+
+    def close(self) -> bytes:
+        self._w.write("}")
+        self._w.flush()
+        self._w.detach()
+        self._raw.close()
+        return self._buf.getvalue()
+
+
+def open_contents(data: bytes):
+    """압축 형식(gzip/zstd)을 매직 바이트로 판별해 해제 스트림을 연다."""
+    if data[:4] == _ZSTD_MAGIC:
+        if zstd is None:
+            raise RuntimeError("zstd contents but zstandard is not installed")
+        dctx = zstd.ZstdDecompressor(dict_data=_get_zstd_dict())
+        return dctx.stream_reader(BytesIO(data))
+    return gzip.GzipFile(fileobj=BytesIO(data))
+
+
+class _TextBuffer:
+    """
+    해제 스트림 위에서 조각 단위로 UTF-8 디코딩하며 읽는 버퍼.
+    이미 파싱한 앞부분은 다음 조각을 읽을 때 버리므로, 버퍼에는 파싱 중인 값 하나만 남는다.
+    """
+
+    def __init__(self, stream):
+        self._reader = io.TextIOWrapper(stream, encoding="utf-8")
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def more(self, size: int = _READ_CHUNK) -> bool:
+        if self.eof:
+            return False
+        s = self._reader.read(size)
+        if not s:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + s
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """공백을 건너뛴 다음 글자 (끝이면 "")."""
+        while True:
+            n = len(self.buf)
+            while self.pos < n and self.buf[self.pos] in " \t\n\r":
+                self.pos += 1
+            if self.pos < n or not self.more():
+                return self.buf[self.pos:self.pos + 1]
+
+    def take(self, ch: str) -> None:
+        if self.peek() != ch:
+            raise json.JSONDecodeError(f"Expecting {ch!r}", self.buf, self.pos)
+        self.pos += 1
+
+    def value(self, dec: json.JSONDecoder):
+        """
+        다음 JSON 값 하나. 값이 버퍼 끝에 걸려 있으면 더 읽고 다시 시도한다
+        (읽는 양을 두 배씩 늘려 긴 문자열도 재시도 횟수가 로그 수준).
+        """
+        self.peek()
+        size = _READ_CHUNK
+        while True:
+            try:
+                value, end = dec.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self.more(size):
+                    raise
+                size *= 2
+                continue
+            # 숫자/리터럴은 버퍼 끝에서 잘렸어도 파싱되므로 끝에 닿았으면 더 읽어 확인
+            if end == len(self.buf) and self.more(size):
+                size *= 2
+                continue
+            self.pos = end
+            return value
+
+
+def _iter_members(tb: _TextBuffer, dec: json.JSONDecoder):
+    """최상위 객체의 (키, 값)을 하나씩 파싱해 내보낸다."""
+    tb.take("{")
+    if tb.peek() == "}":
+        tb.pos += 1
+        return
+    while True:
+        key = tb.value(dec)
+        if not isinstance(key, str):
+            raise json.JSONDecodeError("Expecting property name", tb.buf, tb.pos)
+        tb.take(":")
+        yield key, tb.value(dec)
+        if tb.peek() == ",":
+            tb.pos += 1
+            continue
+        tb.take("}")
+        return
+
+
+def load_json_contents(data: bytes):
+    """
+    압축된 contents 를 바로 JSON 객체로 푼다.
+    최상위 필드 단위로 해제/디코딩하므로 문서 전체 텍스트를 한 번에 만들지 않는다
+    (가장 큰 필드 하나 - 보통 recent_activity - 의 원문과 값만 동시에 메모리에 있다).
+    """
+    dec = json.JSONDecoder()
+    with open_contents(data) as f:
+        tb = _TextBuffer(f)
+        if tb.peek() == "{":
+            result = dict(_iter_members(tb, dec))
+        else:
+            result = tb.value(dec)
+        if tb.peek():
+            raise json.JSONDecodeError("Extra data", tb.buf, tb.pos)
+        return result
+
+
+def train_zstd_dictionary(samples: list[bytes], dict_size: int = 112_640) -> bytes:
+    """압축 전 JSON 페이로드 샘플들로 zstd 사전을 학습해 bytes 로 반환."""
+    if zstd is None:
+        raise RuntimeError("zstandard is not installed")
+    return zstd.train_dictionary(dict_size, samples).as_bytes()
+
 
 def to_gzip_bytes_from_text(text: str) -> bytes:
     return gzip.compress((text or "").encode("utf-8"), compresslevel=6)
 
-async def decompress_gzip(data: bytes) -> str:
-    with gzip.GzipFile(fileobj=BytesIO(data)) as f:
-        return f.read().decode("utf-8")
-    
 def compress_gzip(data: str) -> bytes:
     buf = BytesIO()
     with gzip.GzipFile(fileobj=buf, mode="wb") as f:
         f.write(data.encode("utf-8"))
-    return buf.getvalue()
\ No newline at end of file
+    return buf.getvalue()
@@ -93,3 +93,25 @@ def normalize_created_at(
         return (base - timedelta(minutes=minutes)).date().strftime("%Y-%m-%d")
 
     return None
+
+
+def older_than(
+    raw: Optional[str],
+    days: int,
+    *,
+    tz: Optional[str] = None,
+    now: Optional[datetime] = None,
+) -> bool:
+    """
+    raw 날짜가 오늘(tz 기준)로부터 days 일보다 이전이면 True.
+    날짜를 알 수 없으면 False (판단 보류 → 호출 측에서 수집 대상으로 둠).
+    """
+    iso = normalize_created_at(raw, tz=tz, now=now)
+    if not iso:
+        return False
+    try:
+        d = datetime.fromisoformat(iso).date()
+    except ValueError:
+        return False
+    today = (now or _now_in_tz(tz)).date()
+    return d < today - timedelta(days=days)
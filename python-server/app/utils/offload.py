@@ -0,0 +1,52 @@
+"""
+CPU 작업(날짜 정규화/정규식, 본문 병합, 해시, 압축, HTML 파싱)을
+이벤트 루프 밖에서 돌리기 위한 공용 실행기.
+
+- CPU_POOL_KIND=thread (기본): zlib/hashlib 은 GIL 을 놓고, 나머지도 루프가
+  switch interval 마다 끼어들 수 있어 지연이 크게 줄어든다.
+- CPU_POOL_KIND=process: 순수 파이썬 구간까지 완전히 분리. 인자/결과가 pickle 가능해야 한다.
+"""
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+import asyncio, os
+
+CPU_POOL_KIND = os.getenv("CPU_POOL_KIND", "thread")
+CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", "2"))
+
+_executor: Optional[Executor] = None
+
+
+def get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        workers = max(1, CPU_POOL_WORKERS)
+        if CPU_POOL_KIND == "process":
+            _executor = ProcessPoolExecutor(max_workers=workers)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cpu")
+    return _executor
+
+
+async def run_cpu(fn, *args, **kwargs):
+    """fn(*args, **kwargs) 를 CPU 풀에서 실행하고 결과를 기다린다."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(fn, *args, **kwargs))
+
+
+async def run_stateful(fn, *args, **kwargs):
+    """
+    상태를 가진 객체(압축 스트림 등)를 건드리는 작업용.
+    스레드 풀이면 같은 CPU 풀에서, 프로세스 풀이면(객체를 넘길 수 없음) 스레드로 실행한다.
+    순수 계산 부분은 run_cpu 로 따로 넘기고 여기엔 상태 갱신만 남기는 것이 좋다.
+    """
+    if CPU_POOL_KIND == "process":
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    return await run_cpu(fn, *args, **kwargs)
+
+
+def shutdown() -> None:
+    global _executor
+    ex, _executor = _executor, None
+    if ex is not None:
+        ex.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,58 @@
+"""
+같은 키로 동시에 들어온 비동기 작업을 한 번만 실행하고 결과를 나눠 갖는다.
+
+- 먼저 온 호출이 작업을 시작하고, 진행 중에 같은 키로 온 호출은 그 작업을 기다린다.
+- 기다리던 호출 하나가 취소돼도 작업은 계속된다. 마지막 대기자까지 떠나면 그때 취소한다.
+- 끝난 작업은 바로 레지스트리에서 빠진다(결과 캐시 아님).
+한 이벤트 루프 안에서만 쓴다.
+"""
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+import asyncio
+
+
+class Call:
+    def __init__(self, key: Hashable):
+        self.key = key
+        self.task: Optional[asyncio.Future] = None
+        self.waiters = 0
+        # 작업별로 같이 들고 다닐 상태 (예: 결과 팬아웃 대상)
+        self.data: Dict[str, Any] = {}
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, Call] = {}
+
+    def start(self, key: Hashable, factory: Callable[[Call], Awaitable]) -> Tuple[Call, bool]:
+        """진행 중인 작업이 있으면 (그 작업, False), 없으면 factory(call) 로 시작해 (call, True)."""
+        call = self._calls.get(key)
+        if call is not None:
+            return call, False
+        call = Call(key)
+        call.task = asyncio.ensure_future(factory(call))
+        self._calls[key] = call
+
+        def _done(_):
+            if self._calls.get(key) is call:
+                del self._calls[key]
+
+        call.task.add_done_callback(_done)
+        return call, True
+
+    async def wait(self, call: Call):
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+            raise
+        finally:
+            call.waiters -= 1
+
+    async def do(self, key: Hashable, factory: Callable[[Call], Awaitable]):
+        call, _ = self.start(key, factory)
+        return await self.wait(call)
+
+    def inflight(self) -> list:
+        return [{"key": c.key, "waiters": c.waiters} for c in self._calls.values()]
@@ -18,3 +18,63 @@ def content_hash(text: str, fallback: str = "") -> str:
     """
     data = (text or fallback).encode("utf-8", "ignore")
     return hashlib.md5(data).hexdigest()
+
+
+# recent_activity 에서 글과 글 사이 구분자 (crawler_service.VelogContentsStream)
+POST_SEPARATOR = "\n---\n"
+
+
+def estimate_tokens(text: str, chars_per_token: float = 1.5) -> int:
+    """토크나이저 없이 쓰는 대략치. 한국어는 글자당 토큰이 많아 보수적으로 잡는다."""
+    return int(len(text or "") / max(chars_per_token, 0.1)) + 1
+
+
+def split_by_token_budget(
+    text: str,
+    max_tokens: int,
+    *,
+    sep: str = POST_SEPARATOR,
+    chars_per_token: float = 1.5,
+) -> list[str]:
+    """
+    text 를 sep(글 경계) 단위로 묶어 청크당 max_tokens 이하가 되도록 나눈다.
+    글 하나가 예산보다 크면 줄 단위, 그래도 크면 글자 수로 자른다.
+    """
+    if not text:
+        return []
+    max_chars = max(1, int(max_tokens * chars_per_token))
+    if len(text) <= max_chars:
+        return [text]
+
+    def _pieces(block: str):
+        if len(block) <= max_chars:
+            yield block
+            return
+        buf = ""
+        for line in block.split("\n"):
+            while len(line) > max_chars:
+                if buf:
+                    yield buf
+                    buf = ""
+                yield line[:max_chars]
+                line = line[max_chars:]
+            if buf and len(buf) + 1 + len(line) > max_chars:
+                yield buf
+                buf = line
+            else:
+                buf = f"{buf}\n{line}" if buf else line
+        if buf:
+            yield buf
+
+    chunks: list[str] = []
+    cur = ""
+    for post in text.split(sep):
+        for piece in _pieces(post):
+            if cur and len(cur) + len(sep) + len(piece) > max_chars:
+                chunks.append(cur)
+                cur = piece
+            else:
+                cur = f"{cur}{sep}{piece}" if cur else piece
+    if cur:
+        chunks.append(cur)
+    return chunks
@@ -0,0 +1,201 @@
+"""
+Velog 크롤러 오프라인 벤치마크.
+
+로컬 픽스처 서버(bench.fixture_server)에 프로필/글/GraphQL 을 띄워 놓고
+crawl_all_with_url 을 돌려 처리량과 자원 사용량을 잰다. 실제 velog.io 는 호출하지 않는다.
+
+출력: posts/sec, 글 1개당 fetch 지연 p50/p95, 최대 RSS(자식 프로세스 포함),
+최대 Chromium 프로세스 수, 픽스처 서버가 받은 요청 수.
+
+    cd python-server
+    python -m bench.bench_crawler --posts 200 --latency-ms 30 --engine browser
+    python -m bench.bench_crawler --posts 200 --engine http --runs 3
+    python -m bench.bench_crawler --engine browser --pool --concurrent 4
+"""
+import argparse, asyncio, os, threading, time
+
+from app.crawlers import CONF, browser_pool, velog_crawler as vc, velog_http
+from bench.fixture_server import FixtureSite, serve
+
+
+# ---- 프로세스 샘플링 (/proc 기반, psutil 있으면 사용) ----
+
+def _children_map() -> dict:
+    out: dict = {}
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        out.setdefault(ppid, []).append(int(pid))
+    return out
+
+
+def _descendants(root: int) -> list:
+    tree, out, stack = _children_map(), [], [root]
+    while stack:
+        for c in tree.get(stack.pop(), []):
+            out.append(c)
+            stack.append(c)
+    return out
+
+
+def _rss_kb(pid: int) -> int:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def _is_chromium(pid: int) -> bool:
+    try:
+        with open(f"/proc/{pid}/comm") as f:
+            name = f.read().strip().lower()
+    except OSError:
+        return False
+    return "chrom" in name or "headless_shell" in name
+
+
+def sample_tree() -> tuple[int, int]:
+    """(자신+자손 RSS 합계 MB, 자손 중 Chromium 프로세스 수)"""
+    me = os.getpid()
+    try:
+        import psutil
+        proc = psutil.Process(me)
+        kids = proc.children(recursive=True)
+        rss = proc.memory_info().rss
+        chrome = 0
+        for k in kids:
+            try:
+                rss += k.memory_info().rss
+                name = k.name().lower()
+                chrome += "chrom" in name or "headless_shell" in name
+            except psutil.Error:
+                continue
+        return rss // (1024 * 1024), chrome
+    except ImportError:
+        kids = _descendants(me)
+        rss = _rss_kb(me) + sum(_rss_kb(k) for k in kids)
+        return rss // 1024, sum(1 for k in kids if _is_chromium(k))
+
+
+class Sampler:
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.peak_rss_mb = 0
+        self.peak_chromium = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="bench-sampler", daemon=True)
+
+    def _run(self):
+        while not self._stop.is_set():
+            rss, chrome = sample_tree()
+            self.peak_rss_mb = max(self.peak_rss_mb, rss)
+            self.peak_chromium = max(self.peak_chromium, chrome)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+# ---- 글 단위 fetch 지연 계측 ----
+
+_latencies: list = []
+_lat_lock = threading.Lock()
+
+
+def _timed(fn):
+    async def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            with _lat_lock:
+                _latencies.append(time.perf_counter() - t0)
+    return wrapper
+
+
+def _pct(values: list, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+async def run_once(origin: str, concurrent: int, expected_posts: int) -> dict:
+    _latencies.clear()
+    urls = [f"{origin}/@bench{i}/posts" for i in range(concurrent)]
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*(vc.crawl_all_with_url(u) for u in urls))
+    wall = time.perf_counter() - t0
+    # 처리량이 --posts 전체에 대한 값이 되도록, 빠짐없이 받았는지 확인
+    for u, r in zip(urls, results):
+        fetched = (r.get("stats") or {}).get("fetched", len(r.get("posts", [])))
+        if fetched != expected_posts:
+            raise RuntimeError(f"{u}: fetched {fetched} posts, expected {expected_posts} ({r.get('stats')})")
+    posts = sum(len(r.get("posts", [])) for r in results)
+    return {
+        "wall_s": round(wall, 3),
+        "posts": posts,
+        "posts_per_sec": round(posts / wall, 2) if wall else 0.0,
+        "fetch_p50_ms": round(_pct(_latencies, 0.50) * 1000, 1),
+        "fetch_p95_ms": round(_pct(_latencies, 0.95) * 1000, 1),
+    }
+
+
+async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--posts", type=int, default=100, help="프로필당 글 수")
+    ap.add_argument("--body-chars", type=int, default=4000)
+    ap.add_argument("--latency-ms", type=int, default=20, help="픽스처 응답 지연")
+    ap.add_argument("--fixtures", default="", help="녹화한 {slug}.html 디렉터리")
+    ap.add_argument("--engine", choices=["browser", "http", "auto"], default="browser")
+    ap.add_argument("--pool", action="store_true", help="공유 브라우저 풀 사용")
+    ap.add_argument("--concurrent", type=int, default=1, help="동시에 크롤링할 프로필 수")
+    ap.add_argument("--runs", type=int, default=1)
+    args = ap.parse_args()
+
+    site = FixtureSite(args.posts, args.body_chars, args.latency_ms, args.fixtures)
+    server, origin = serve(site)
+
+    # 벤치 설정: 픽스처 서버로 향하게, 증분 인덱스/결과 캐시/날짜 컷오프는 끔(매번 --posts 전체 수집)
+    CONF["engine"] = args.engine
+    CONF["http"]["graphql_url"] = f"{origin}/graphql"
+    CONF["index"]["enabled"] = False
+    CONF["result_cache"]["enabled"] = False
+    CONF["cutoff"]["enabled"] = False
+    CONF["list"]["scroll_wait_ms"] = 500
+    vc.fetch_post = _timed(vc.fetch_post)
+    velog_http.fetch_post = _timed(velog_http.fetch_post)
+
+    if args.pool:
+        await browser_pool.start_pool()
+    try:
+        print(f"origin={origin} engine={args.engine} pool={bool(browser_pool.get_pool())} "
+              f"posts={args.posts} latency={args.latency_ms}ms concurrent={args.concurrent}")
+        for i in range(args.runs):
+            site.requests = 0
+            with Sampler() as s:
+                r = await run_once(origin, args.concurrent, args.posts)
+            r.update(run=i + 1, peak_rss_mb=s.peak_rss_mb,
+                     peak_chromium=s.peak_chromium, server_requests=site.requests)
+            print(r)
+    finally:
+        await browser_pool.stop_pool()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
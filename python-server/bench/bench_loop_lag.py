@@ -0,0 +1,101 @@
+"""
+ingest 후처리(최근 글 집계/본문 병합/해시/압축)가 이벤트 루프를 얼마나 막는지 측정.
+
+동시 ingest N개를 흉내 내며 5ms 틱 태스크의 지연(event-loop lag)을 기록하고,
+실제 ingest 경로와 같은 VelogContentsStream 빌더에 글을 CRAWL_STREAM_BATCH 개씩 넣으며,
+루프에서 바로 돌릴 때(inline)와 CPU 풀로 넘길 때(offload, feed_velog_contents)를 비교한다.
+
+    cd python-server
+    python -m bench.bench_loop_lag --ingests 8 --posts 300 --post-chars 8000
+    CPU_POOL_KIND=process python -m bench.bench_loop_lag
+"""
+import argparse, asyncio, random, statistics, time
+from datetime import datetime, timedelta
+
+from app.services.crawler_service import (
+    CRAWL_STREAM_BATCH, VelogContentsStream, feed_velog_contents,
+)
+from app.utils import offload
+from app.utils.text import content_hash
+
+_WORDS = ["스프링", "도커", "쿠버네티스", "자료구조", "알고리즘", "리액트", "FastAPI",
+          "트러블슈팅", "배포", "테스트", "회고", "프로젝트", "데이터베이스", "인덱스"]
+
+
+def make_posts(n: int, chars: int) -> list[dict]:
+    today = datetime.now()
+    posts = []
+    for i in range(n):
+        text = " ".join(random.choice(_WORDS) for _ in range(chars // 5))[:chars]
+        url = f"https://velog.io/@bench/post-{i}"
+        posts.append({
+            "url": url,
+            "title": f"벤치 글 {i}",
+            "published_at": (today - timedelta(days=i * 3)).strftime("%Y년 %m월 %d일"),
+            "text": text,
+            "tags": ["bench"],
+            "content_hash": content_hash(text, fallback=url),
+        })
+    return posts
+
+
+async def _ticker(stop: asyncio.Event, lags: list, interval: float = 0.005):
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        t0 = loop.time()
+        await asyncio.sleep(interval)
+        lags.append((loop.time() - t0 - interval) * 1000)
+
+
+async def run_mode(mode: str, ingests: int, posts: list[dict]) -> dict:
+    lags: list = []
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_ticker(stop, lags))
+
+    async def one(i: int):
+        await asyncio.sleep(random.uniform(0, 0.05))  # 크롤링 I/O 대기 흉내
+        builder = VelogContentsStream(f"https://velog.io/@bench{i}")
+        for j in range(0, len(posts), CRAWL_STREAM_BATCH):
+            batch = posts[j:j + CRAWL_STREAM_BATCH]
+            if mode == "inline":
+                builder.add_many(batch)
+            else:
+                await feed_velog_contents(builder, batch)
+        if mode == "inline":
+            builder.finish(len(posts))
+        else:
+            await offload.run_stateful(builder.finish, len(posts))
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(ingests)))
+    wall = time.perf_counter() - t0
+    stop.set()
+    await ticker
+
+    lags.sort()
+    return {
+        "mode": mode,
+        "wall_s": round(wall, 3),
+        "lag_p50_ms": round(statistics.median(lags), 2) if lags else 0.0,
+        "lag_p99_ms": round(lags[int(len(lags) * 0.99) - 1], 2) if lags else 0.0,
+        "lag_max_ms": round(lags[-1], 2) if lags else 0.0,
+    }
+
+
+async def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ingests", type=int, default=8)
+    ap.add_argument("--posts", type=int, default=300)
+    ap.add_argument("--post-chars", type=int, default=8000)
+    args = ap.parse_args()
+
+    posts = make_posts(args.posts, args.post_chars)
+    print(f"ingests={args.ingests} posts={args.posts} chars/post={args.post_chars} "
+          f"pool={offload.CPU_POOL_KIND}x{offload.CPU_POOL_WORKERS}")
+    for mode in ("inline", "offload"):
+        print(await run_mode(mode, args.ingests, posts))
+    offload.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
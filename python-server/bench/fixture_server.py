@@ -0,0 +1,215 @@
+"""
+Velog 를 흉내 내는 로컬 픽스처 서버 (크롤러 벤치마크/오프라인 확인용).
+
+- GET  /@{handle}, /@{handle}/posts : 프로필. '전체보기 (N)' + 첫 페이지 카드,
+                                     스크롤하면 /__feed 로 다음 카드를 붙이는 스크립트 포함
+- GET  /__feed?handle=&offset=&limit= : 프로필 무한 스크롤용 JSON
+- GET  /@{handle}/{slug}            : 글 (h1, article, 태그, time[datetime])
+- POST /graphql                     : posts(cursor) / userTags 쿼리 (HTTP 엔진용)
+
+녹화한 실제 페이지가 있으면 --fixtures 디렉터리의 {slug}.html 을 그대로 돌려준다.
+
+    python -m bench.fixture_server --posts 300 --latency-ms 50 --port 8765
+"""
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+import argparse, html, json, os, re, threading, time
+
+PAGE_SIZE = 20
+
+_PROFILE_TPL = """<!doctype html>
+<html><head><meta charset="utf-8"><title>@{handle}</title></head>
+<body>
+<aside><ul><li><a href="/@{handle}/posts">전체보기 ({total})</a></li></ul></aside>
+<main id="feed">{cards}</main>
+<script>
+let offset = {first}, loading = false, done = {done};
+window.addEventListener("scroll", async () => {{
+  if (loading || done) return;
+  if (window.innerHeight + window.scrollY < document.body.scrollHeight - 50) return;
+  loading = true;
+  const r = await fetch("/__feed?handle={handle}&offset=" + offset + "&limit={page}");
+  const items = await r.json();
+  const feed = document.getElementById("feed");
+  for (const it of items) {{
+    const div = document.createElement("div");
+    div.innerHTML = it.html;
+    feed.appendChild(div.firstElementChild);
+  }}
+  offset += items.length;
+  done = items.length < {page};
+  loading = false;
+}});
+</script>
+</body></html>"""
+
+_CARD_TPL = (
+    '<div class="post-card" style="height:240px">'
+    '<a href="/@{handle}/{slug}"><h2>{title}</h2></a>'
+    '<span class="date">{date_ko}</span></div>'
+)
+
+_POST_TPL = """<!doctype html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<meta property="article:tag" content="{tag}">
+</head><body>
+<div id="root"><h1>{title}</h1>
+<div class="info"><time datetime="{iso}">{date_ko}</time></div>
+<div class="tags"><a href="/tags/{tag}">{tag}</a></div>
+<article>{body}</article></div>
+</body></html>"""
+
+_WORDS = ["스프링", "도커", "쿠버네티스", "자료구조", "알고리즘", "리액트", "FastAPI",
+          "트러블슈팅", "배포", "테스트", "회고", "프로젝트", "데이터베이스", "인덱스"]
+
+
+class FixtureSite:
+    def __init__(self, posts: int, body_chars: int, latency_ms: int,
+                 fixtures_dir: str = "", days_between: int = 3):
+        self.total = posts
+        self.body_chars = body_chars
+        self.latency = latency_ms / 1000
+        self.fixtures_dir = fixtures_dir
+        self.days_between = days_between
+        self.today = datetime.now()
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def hit(self):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def post_meta(self, i: int) -> dict:
+        d = self.today - timedelta(days=i * self.days_between)
+        return {
+            "id": f"id-{i}",
+            "slug": f"post-{i}",
+            "title": f"픽스처 글 {i}",
+            "iso": d.strftime("%Y-%m-%dT09:00:00.000Z"),
+            "date_ko": d.strftime("%Y년 %m월 %d일"),
+            "tag": _WORDS[i % len(_WORDS)],
+        }
+
+    def card(self, handle: str, i: int) -> str:
+        return _CARD_TPL.format(handle=handle, **self.post_meta(i))
+
+    def profile(self, handle: str) -> str:
+        first = min(PAGE_SIZE, self.total)
+        return _PROFILE_TPL.format(
+            handle=handle, total=self.total, page=PAGE_SIZE, first=first,
+            done="true" if first >= self.total else "false",
+            cards="".join(self.card(handle, i) for i in range(first)),
+        )
+
+    def feed(self, handle: str, offset: int, limit: int) -> list:
+        end = min(self.total, offset + limit)
+        return [{"html": self.card(handle, i)} for i in range(offset, end)]
+
+    def post(self, slug: str) -> str | None:
+        if self.fixtures_dir:
+            path = os.path.join(self.fixtures_dir, f"{slug}.html")
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    return f.read()
+        m = re.fullmatch(r"post-(\d+)", slug)
+        if not m or int(m.group(1)) >= self.total:
+            return None
+        meta = self.post_meta(int(m.group(1)))
+        words = " ".join(_WORDS[(int(m.group(1)) + k) % len(_WORDS)] for k in range(self.body_chars // 5))
+        body = "".join(f"<p>{html.escape(words[k:k + 400])}</p>"
+                       for k in range(0, min(len(words), self.body_chars), 400))
+        return _POST_TPL.format(body=body, **meta)
+
+    def graphql(self, payload: dict) -> dict:
+        q = payload.get("query") or ""
+        v = payload.get("variables") or {}
+        if "userTags" in q:
+            return {"data": {"userTags": {"posts_count": self.total}}}
+        if "posts" in q:
+            limit = int(v.get("limit") or PAGE_SIZE)
+            cursor = v.get("cursor")
+            start = int(cursor.split("-")[1]) + 1 if cursor else 0
+            items = []
+            for i in range(start, min(self.total, start + limit)):
+                meta = self.post_meta(i)
+                items.append({
+                    "id": meta["id"], "title": meta["title"], "url_slug": meta["slug"],
+                    "released_at": meta["iso"], "updated_at": meta["iso"], "tags": [meta["tag"]],
+                })
+            return {"data": {"posts": items}}
+        return {"errors": [{"message": "unsupported query"}]}
+
+
+def make_handler(site: FixtureSite):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send(self, code: int, body: str, ctype: str = "text/html; charset=utf-8"):
+            data = body.encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", ctype)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            site.hit()
+            u = urlparse(self.path)
+            path = unquote(u.path)
+            if path == "/__feed":
+                qs = parse_qs(u.query)
+                items = site.feed(qs.get("handle", [""])[0],
+                                  int(qs.get("offset", ["0"])[0]),
+                                  int(qs.get("limit", [str(PAGE_SIZE)])[0]))
+                return self._send(200, json.dumps(items, ensure_ascii=False), "application/json")
+            m = re.fullmatch(r"/@([A-Za-z0-9_]+)(?:/posts)?/?", path)
+            if m:
+                return self._send(200, site.profile(m.group(1)))
+            m = re.fullmatch(r"/@([A-Za-z0-9_]+)/([^/]+)", path)
+            if m:
+                page = site.post(m.group(2))
+                if page is not None:
+                    return self._send(200, page)
+            self._send(404, "not found", "text/plain")
+
+        def do_POST(self):
+            site.hit()
+            if urlparse(self.path).path != "/graphql":
+                return self._send(404, "not found", "text/plain")
+            n = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(n) or b"{}")
+            except ValueError:
+                return self._send(400, "bad json", "text/plain")
+            self._send(200, json.dumps(site.graphql(payload), ensure_ascii=False), "application/json")
+
+    return Handler
+
+
+def serve(site: FixtureSite, host: str = "127.0.0.1", port: int = 0):
+    """백그라운드 스레드로 서버를 띄우고 (server, origin) 을 반환."""
+    server = ThreadingHTTPServer((host, port), make_handler(site))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="fixture-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--posts", type=int, default=100)
+    ap.add_argument("--body-chars", type=int, default=4000)
+    ap.add_argument("--latency-ms", type=int, default=0)
+    ap.add_argument("--fixtures", default="")
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+    server, origin = serve(FixtureSite(args.posts, args.body_chars, args.latency_ms, args.fixtures),
+                           port=args.port)
+    print(f"serving {origin}/@bench  (graphql: {origin}/graphql)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,16 @@
+-- portfolio_result: crawling_result_id 당 한 행
+-- gemini_service.upsert_portfolio_results 의 INSERT ... ON DUPLICATE KEY UPDATE 가 이 키로 동작한다.
+-- 앱은 기동 시 이 인덱스가 있는지 확인한다 (PORTFOLIO_UNIQUE_CHECK=strict|warn|off).
+-- 테이블/컬럼 이름을 ENV 로 바꿔 쓰는 경우(PORTFOLIO_TABLE, PR_COL_*) 아래 이름도 맞춰서 실행.
+-- MySQL 5.7+/8.x, MariaDB 공용.
+
+-- 1) 이전 INSERT 방식이 쌓아 둔 중복 행 정리: crawling_result_id 별로 가장 최근 행만 남긴다
+DELETE p
+FROM portfolio_result AS p
+JOIN portfolio_result AS q
+  ON q.crawling_result_id = p.crawling_result_id
+ AND (q.updated_at > p.updated_at OR (q.updated_at = p.updated_at AND q.id > p.id));
+
+-- 2) UNIQUE 인덱스
+ALTER TABLE portfolio_result
+  ADD UNIQUE KEY uk_portfolio_result_crawling_result_id (crawling_result_id);
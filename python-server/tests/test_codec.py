@@ -0,0 +1,61 @@
+import gzip
+import json
+
+import pytest
+
+from app.utils import codec
+
+
+_DOCS = [
+    {
+        "source": "velog",
+        "base_url": "https://velog.io/@a",
+        "recent_activity": "2025-01-01 | [제목 \"따옴표\"]\n본문 \\ 역슬래시 😀\n---\n" * 50,
+        "post_count": 123456,
+        "recent_count": 7,
+        "fetch_stats": {"fetched": 10, "failed": 0, "ratio": 0.125, "urls": [1, 2.5e3, None]},
+        "cache_age_sec": None,
+        "ok": True,
+    },
+    {},
+    {"n": 1234567890123},
+    [1, {"a": "b"}, "c"],
+    "just a string",
+]
+
+
+@pytest.fixture(params=[1, 3, 64, 1 << 16])
+def chunk(request, monkeypatch):
+    # 조각 크기를 줄여 값/숫자/이스케이프가 조각 경계에 걸리는 경우를 만든다
+    monkeypatch.setattr(codec, "_READ_CHUNK", request.param)
+    return request.param
+
+
+@pytest.mark.parametrize("doc", _DOCS)
+def test_load_matches_json_loads(chunk, doc):
+    assert codec.load_json_contents(codec.to_gzip_bytes_from_json(doc)) == doc
+
+
+def test_load_streamed_writer_output(chunk):
+    w = codec.ContentsWriter(codec="gzip")
+    w.field("source", "velog")
+    w.begin_string("recent_activity")
+    for i in range(20):
+        w.write_string(f"글 {i}\n본문\t\"{i}\"")
+    w.end_string()
+    w.field("post_count", 20)
+    data = codec.load_json_contents(w.close())
+
+    assert data["post_count"] == 20
+    assert data["recent_activity"].startswith("글 0\n본문\t\"0\"글 1")
+
+
+def test_whitespace_between_members():
+    text = ' \n{ "a" : 1 ,\n "b" :[ 2 ] }\n '
+    assert codec.load_json_contents(gzip.compress(text.encode())) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", ['{"a": 1', '{"a" 1}', '{"a": 1} x', '{1: 2}', '{"a": "unterminated'])
+def test_invalid_json_raises(chunk, text):
+    with pytest.raises(json.JSONDecodeError):
+        codec.load_json_contents(gzip.compress(text.encode()))
@@ -0,0 +1,56 @@
+import re
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("dotenv")
+pytest.importorskip("asyncmy")
+
+from app.db import (  # noqa: E402
+    PR_COL_PROCESSED,
+    PR_COL_STATUS,
+    SQL_FIND_PORTFOLIO_UNIQUE_KEY,
+    sql_upsert_portfolio_results,
+    portfolio_upsert_params,
+)
+
+
+def test_upsert_statement_has_one_tuple_per_row():
+    sql = str(sql_upsert_portfolio_results(3))
+    tuples = re.findall(r"\(UUID\(\), :crawling_result_id_(\d+), :processed_contents_\1, :status_\1, NOW\(\), NOW\(\)\)", sql)
+    assert tuples == ["0", "1", "2"]
+
+
+def test_upsert_is_one_statement_keyed_on_duplicate():
+    sql = str(sql_upsert_portfolio_results(2))
+    assert sql.count("INSERT INTO") == 1
+    assert "DELETE" not in sql
+    # 행 별칭(AS new)은 MySQL 8.0.19+ 전용이라 VALUES(col) 형식을 쓴다
+    assert re.search(r"\)\s*ON DUPLICATE KEY UPDATE", sql)
+    assert f"{PR_COL_PROCESSED} = VALUES({PR_COL_PROCESSED})" in sql
+    assert f"{PR_COL_STATUS} = VALUES({PR_COL_STATUS})" in sql
+    assert "AS new" not in sql
+
+
+def test_migration_adds_the_unique_key_the_check_looks_for():
+    ddl = (Path(__file__).parents[1] / "migrations" / "001_portfolio_result_unique_crawling_result_id.sql").read_text(encoding="utf-8")
+    assert re.search(r"ADD UNIQUE KEY \w+ \(crawling_result_id\)", ddl)
+    check = str(SQL_FIND_PORTFOLIO_UNIQUE_KEY)
+    assert "NON_UNIQUE" in check and "crawling_result_id" in check
+
+
+def test_upsert_statement_is_cached_per_row_count():
+    assert sql_upsert_portfolio_results(4) is sql_upsert_portfolio_results(4)
+    assert sql_upsert_portfolio_results(4) is not sql_upsert_portfolio_results(5)
+
+
+def test_params_match_statement_binds():
+    rows = [
+        {"crawling_result_id": f"cr-{i}", "processed_contents": "{}", "status": "COMPLETED"}
+        for i in range(3)
+    ]
+    params = portfolio_upsert_params(rows)
+    binds = set(sql_upsert_portfolio_results(3).compile().params)
+    assert set(params) == binds
+    assert params["crawling_result_id_2"] == "cr-2"
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+for _mod in ("fastapi", "sqlalchemy", "dotenv", "asyncmy", "google.genai"):
+    pytest.importorskip(_mod)
+
+# gemini_client 가 import 시점에 클라이언트를 만들므로 키만 채워 둔다(호출은 하지 않음)
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+from app.services.gemini_service import merge_keywords  # noqa: E402
+
+
+def test_merges_case_and_whitespace_insensitively():
+    merged = merge_keywords([["Docker", "Spring  Boot"], ["docker", "spring boot"]])
+    assert merged == ["Docker", "Spring  Boot"]
+
+
+def test_ranks_by_number_of_chunks_then_first_seen():
+    merged = merge_keywords([
+        ["Java", "Redis"],
+        ["Kafka", "Redis", "redis"],   # 같은 청크 안의 중복은 한 번만 센다
+        ["Kafka", "Redis"],
+    ])
+    assert merged == ["Redis", "Kafka", "Java"]
+
+
+def test_skips_blank_and_non_string_items():
+    assert merge_keywords([["", "  ", None, 3, "AWS"], []]) == ["AWS"]
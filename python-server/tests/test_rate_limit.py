@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from app.crawlers import rate_limit
+from app.crawlers.rate_limit import HostLimiter, RateLimiter
+
+_CFG = {
+    "enabled": True,
+    "rate": 4.0,
+    "burst": 2.0,
+    "min_rate": 0.5,
+    "max_rate": 5.0,
+    "concurrency": 4,
+    "min_concurrency": 1,
+    "max_concurrency": 6,
+    "target_latency_ms": 1000,
+}
+
+
+@pytest.fixture
+def lim(monkeypatch):
+    # 감소 쿨다운은 실제 시간 대신 0 으로
+    monkeypatch.setattr(rate_limit, "_DECREASE_COOLDOWN_SEC", 0.0)
+    return HostLimiter("example.com", dict(_CFG))
+
+
+def _request(lim: HostLimiter, latency: float = 0.1, status=200, failed=False):
+    lim.tokens = lim.cfg["burst"]
+    assert lim.try_acquire() == 0.0
+    lim.release(latency, status, failed)
+
+
+def test_success_grows_limit_additively(lim):
+    _request(lim)
+    assert lim.limit == pytest.approx(4.25)
+    assert lim.rate == pytest.approx(4.1)
+    for _ in range(100):
+        _request(lim)
+    assert lim.limit == _CFG["max_concurrency"]
+    assert lim.rate == _CFG["max_rate"]
+
+
+@pytest.mark.parametrize("status,failed,latency", [
+    (429, False, 0.1),
+    (503, False, 0.1),
+    (None, True, 0.1),
+    (200, False, 2.0),   # 목표 지연 초과
+])
+def test_congestion_halves_limit_and_rate(lim, status, failed, latency):
+    _request(lim, latency=latency, status=status, failed=failed)
+    assert lim.limit == pytest.approx(2.0)
+    assert lim.rate == pytest.approx(2.0)
+
+
+def test_decrease_is_floored(lim):
+    for _ in range(20):
+        _request(lim, status=503)
+    assert lim.limit == _CFG["min_concurrency"]
+    assert lim.rate == _CFG["min_rate"]
+    assert lim.errors == 20
+
+
+def test_decrease_cooldown_absorbs_bursts(monkeypatch):
+    monkeypatch.setattr(rate_limit, "_DECREASE_COOLDOWN_SEC", 60.0)
+    lim = HostLimiter("example.com", dict(_CFG))
+    for _ in range(3):
+        _request(lim, status=429)
+    assert lim.limit == pytest.approx(2.0)
+    assert lim.throttled == 3
+
+
+def test_acquire_waits_for_tokens_and_concurrency(lim):
+    assert lim.try_acquire() == 0.0
+    assert lim.try_acquire() == 0.0
+    # burst(2) 를 다 써서 토큰을 기다려야 한다
+    assert lim.try_acquire() > 0.0
+
+    lim.tokens = 10.0
+    lim.limit = 2.0
+    assert lim.try_acquire() > 0.0  # 동시성 한도 도달
+    assert lim.inflight == 2
+
+
+def test_slot_records_status_and_errors():
+    limiter = RateLimiter(dict(_CFG))
+
+    async def main():
+        async with limiter.slot("https://velog.io/@a") as ticket:
+            ticket.status = 200
+        with pytest.raises(RuntimeError):
+            async with limiter.slot("https://velog.io/@b"):
+                raise RuntimeError("boom")
+
+    asyncio.run(main())
+    snap = limiter.snapshot()["velog.io"]
+    assert (snap["requests"], snap["errors"], snap["inflight"]) == (2, 1, 0)
+
+
+def test_limits_are_exported_as_gauges(lim):
+    from app.core.metrics import registry
+
+    _request(lim, status=503)
+    text = registry.render()
+    assert 'specguard_crawler_host_rate{host="example.com"} 2' in text
+    assert 'specguard_crawler_host_concurrency_limit{host="example.com"} 2' in text
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from app.crawlers import CONF
+from app.crawlers.retry import FetchStats, RetryBudget, fetch_all
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.response = type("R", (), {"status_code": status})()
+
+
+@pytest.fixture(autouse=True)
+def fast_retry(monkeypatch):
+    monkeypatch.setitem(CONF["retry"], "base_backoff_sec", 0.001)
+    monkeypatch.setitem(CONF["retry"], "max_backoff_sec", 0.002)
+    monkeypatch.setitem(CONF["retry"], "attempts", 3)
+    monkeypatch.setitem(CONF["retry"], "budget", 30)
+    monkeypatch.setitem(CONF["retry"], "second_pass_attempts", 2)
+
+
+def _fetcher(plan: dict):
+    """url → 순서대로 낼 결과 목록 (예외면 raise, 나머지는 반환)"""
+    calls = {u: 0 for u in plan}
+
+    async def fetch_one(u):
+        outcomes = plan[u]
+        out = outcomes[min(calls[u], len(outcomes) - 1)]
+        calls[u] += 1
+        if isinstance(out, BaseException):
+            raise out
+        return out
+
+    return fetch_one, calls
+
+
+def test_flaky_post_is_retried_until_success():
+    fetch_one, calls = _fetcher({
+        "a": [{"url": "a"}],
+        "b": [RuntimeError("x"), RuntimeError("y"), {"url": "b"}],
+    })
+    stats = FetchStats()
+    out = asyncio.run(fetch_all(["a", "b"], fetch_one, 2, stats))
+
+    assert sorted(p["url"] for p in out) == ["a", "b"]
+    assert calls == {"a": 1, "b": 3}
+    assert (stats.fetched, stats.failed, stats.retried) == (2, 0, 2)
+
+
+def test_permanent_http_error_is_not_retried():
+    fetch_one, calls = _fetcher({"gone": [_HTTPError(404)], "busy": [_HTTPError(429), {"url": "busy"}]})
+    stats = FetchStats()
+    asyncio.run(fetch_all(["gone", "busy"], fetch_one, 2, stats))
+
+    assert calls == {"gone": 1, "busy": 2}
+    assert stats.failed_urls == ["gone"]
+    assert stats.fetched == 1
+
+
+def test_empty_body_counts_as_failure_without_retry():
+    fetch_one, calls = _fetcher({"empty": [None]})
+    stats = FetchStats()
+    assert asyncio.run(fetch_all(["empty"], fetch_one, 1, stats)) == []
+    assert calls == {"empty": 1}
+    assert (stats.failed, stats.retried) == (1, 0)
+
+
+def test_second_pass_recovers_after_first_pass_gives_up():
+    # 1차 3회 모두 실패 → 2차 패스 첫 시도에서 성공
+    fetch_one, calls = _fetcher({"a": [RuntimeError()] * 3 + [{"url": "a"}]})
+    stats = FetchStats()
+    out = asyncio.run(fetch_all(["a"], fetch_one, 4, stats))
+
+    assert out == [{"url": "a"}]
+    assert calls == {"a": 4}
+    assert stats.retried == 3  # 1차 재시도 2 + 2차 패스 1
+
+
+def test_exhausted_budget_fails_without_more_attempts():
+    fetch_one, calls = _fetcher({u: [RuntimeError()] for u in "abc"})
+    stats = FetchStats()
+    asyncio.run(fetch_all(list("abc"), fetch_one, 3, stats, budget=RetryBudget(1)))
+
+    assert sum(calls.values()) == 4
+    assert stats.retried == 1
+    assert sorted(stats.failed_urls) == ["a", "b", "c"]
+
+
+def test_on_post_streams_instead_of_collecting():
+    fetch_one, _ = _fetcher({"a": [{"url": "a"}], "b": [{"url": "b"}]})
+    got = []
+
+    async def on_post(post):
+        got.append(post["url"])
+
+    stats = FetchStats()
+    assert asyncio.run(fetch_all(["a", "b"], fetch_one, 2, stats, on_post=on_post)) == []
+    assert sorted(got) == ["a", "b"]
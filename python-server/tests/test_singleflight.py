@@ -0,0 +1,100 @@
+import asyncio
+
+from app.utils.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_run():
+    async def main():
+        sf = SingleFlight()
+        runs = 0
+
+        async def work(call):
+            nonlocal runs
+            runs += 1
+            await asyncio.sleep(0.01)
+            return "done"
+
+        results = await asyncio.gather(*(sf.do("k", work) for _ in range(5)))
+        assert results == ["done"] * 5
+        assert runs == 1
+        # 끝난 작업은 레지스트리에서 빠지므로 다음 호출은 새로 실행한다
+        assert sf.inflight() == []
+        assert await sf.do("k", work) == "done"
+        assert runs == 2
+
+    asyncio.run(main())
+
+
+def test_different_keys_run_separately():
+    async def main():
+        sf = SingleFlight()
+        seen = []
+
+        async def work(call):
+            seen.append(call.key)
+            return call.key
+
+        assert await asyncio.gather(sf.do("a", work), sf.do("b", work)) == ["a", "b"]
+        assert sorted(seen) == ["a", "b"]
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_does_not_cancel_shared_work():
+    async def main():
+        sf = SingleFlight()
+        release = asyncio.Event()
+
+        async def work(call):
+            await release.wait()
+            return 42
+
+        first = asyncio.create_task(sf.do("k", work))
+        second = asyncio.create_task(sf.do("k", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == 42
+        assert first.cancelled()
+
+    asyncio.run(main())
+
+
+def test_last_waiter_leaving_cancels_work():
+    async def main():
+        sf = SingleFlight()
+        cancelled = asyncio.Event()
+
+        async def work(call):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiter = asyncio.create_task(sf.do("k", work))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.wait_for(cancelled.wait(), 1)
+        await asyncio.sleep(0)
+        assert sf.inflight() == []
+
+    asyncio.run(main())
+
+
+def test_error_is_shared_by_all_waiters():
+    async def main():
+        sf = SingleFlight()
+
+        async def work(call):
+            await asyncio.sleep(0)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            sf.do("k", work), sf.do("k", work), return_exceptions=True
+        )
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    asyncio.run(main())
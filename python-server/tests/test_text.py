@@ -0,0 +1,35 @@
+from app.utils.text import POST_SEPARATOR, split_by_token_budget
+
+
+def _post(i: int, n: int) -> str:
+    return f"2025-01-{i + 1:02d} | [글 {i}]\n" + "가" * n
+
+
+def test_empty_text_has_no_chunks():
+    assert split_by_token_budget("", 100) == []
+
+
+def test_small_text_is_single_chunk():
+    text = POST_SEPARATOR.join(_post(i, 10) for i in range(3))
+    assert split_by_token_budget(text, 10_000) == [text]
+
+
+def test_chunks_respect_budget_and_post_boundaries():
+    posts = [_post(i, 300) for i in range(10)]
+    text = POST_SEPARATOR.join(posts)
+    chunks = split_by_token_budget(text, 700, chars_per_token=1.5)
+
+    assert len(chunks) > 1
+    assert all(len(c) <= 700 * 1.5 for c in chunks)
+    # 글 하나가 예산보다 작으면 청크 경계에서 잘리지 않는다
+    assert [p for c in chunks for p in c.split(POST_SEPARATOR)] == posts
+    assert POST_SEPARATOR.join(chunks) == text
+
+
+def test_oversized_post_is_split_by_lines_then_chars():
+    lines = ["나" * 40 for _ in range(10)] + ["다" * 250]
+    text = "\n".join(lines)
+    chunks = split_by_token_budget(text, 100, chars_per_token=1.0)
+
+    assert all(len(c) <= 100 for c in chunks)
+    assert "".join(c.replace("\n", "") for c in chunks) == text.replace("\n", "")
@@ -0,0 +1,79 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+for _mod in ("fastapi", "sqlalchemy", "dotenv", "asyncmy", "playwright"):
+    pytest.importorskip(_mod)
+
+from app.services import crawler_service as svc  # noqa: E402
+from app.utils.codec import load_json_contents  # noqa: E402
+
+URL = "https://velog.io/@a"
+
+POSTS = [
+    {"url": f"{URL}/new", "title": " 첫 글 ", "published_at": "2025-06-01T09:00:00.000Z",
+     "text": " 본문 \"1\" \\ 끝\n"},
+    {"url": f"{URL}/old", "title": "오래된 글", "published_at": "2024-01-01", "text": "범위 밖"},
+    {"url": f"{URL}/empty", "title": "빈 글", "published_at": "2025-05-01", "text": "  "},
+    {"url": f"{URL}/nodate", "title": "날짜 없음", "published_at": "", "text": "본문"},
+    {"url": f"{URL}/long", "title": "긴 글", "published_at": "2025년 3월 2일", "text": "가" * 20},
+]
+
+EXPECTED_ACTIVITY = (
+    "2025-06-01 | [첫 글]\n본문 \"1\" \\ 끝"
+    "\n---\n"
+    "2025-03-02 | [긴 글]\n" + "가" * 10
+)
+
+
+@pytest.fixture(autouse=True)
+def fixed_window(monkeypatch):
+    # 최근 365일 = 2024-06-30 ~ 2025-06-30, 본문은 10자로 자른다
+    monkeypatch.setattr(svc, "_today_local_date", lambda: date(2025, 6, 30))
+    monkeypatch.setattr(svc, "RECENT_WINDOW_DAYS", 365)
+    monkeypatch.setattr(svc, "MAX_TEXT_LEN", 10)
+
+
+@pytest.mark.parametrize("batch", [1, 2, 100])
+def test_stream_builds_expected_payload(batch):
+    builder = svc.VelogContentsStream(URL)
+    for i in range(0, len(POSTS), batch):
+        builder.add_many(POSTS[i:i + batch])
+    stats = {"fetched": 4, "failed": 1}
+    payload = load_json_contents(builder.finish(10, stats, cache_age_sec=30))
+
+    assert payload == {
+        "source": "velog",
+        "base_url": URL,
+        "recent_activity": EXPECTED_ACTIVITY,
+        "post_count": 10,
+        "recent_count": 2,     # 최근 글 3개(빈 본문 포함) → (3+1)//2
+        "fetch_stats": stats,
+        "cache_age_sec": 30,
+    }
+    assert builder.seen == len(POSTS)
+
+
+def test_recent_count_is_capped_by_post_count():
+    builder = svc.VelogContentsStream(URL)
+    builder.add_many(POSTS)
+    assert load_json_contents(builder.finish(1))["recent_count"] == 1
+
+
+def test_empty_stream():
+    payload = load_json_contents(svc.VelogContentsStream(URL).finish(0))
+    assert payload == {
+        "source": "velog", "base_url": URL, "recent_activity": "",
+        "post_count": 0, "recent_count": 0,
+    }
+
+
+def test_feed_batches_through_cpu_pool():
+    async def main():
+        builder = svc.VelogContentsStream(URL)
+        await svc.feed_velog_contents(builder, POSTS[:2])
+        await svc.feed_velog_contents(builder, POSTS[2:])
+        return load_json_contents(builder.finish(10))
+
+    assert asyncio.run(main())["recent_activity"] == EXPECTED_ACTIVITY
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("bs4")
+
+from app.crawlers import CONF, velog_http  # noqa: E402
+from bench.fixture_server import FixtureSite, serve  # noqa: E402
+
+
+@pytest.fixture
+def site(monkeypatch):
+    site = FixtureSite(posts=45, body_chars=600, latency_ms=0, days_between=1)
+    server, origin = serve(site)
+    monkeypatch.setitem(CONF["http"], "graphql_url", f"{origin}/graphql")
+    monkeypatch.setitem(CONF["http"], "page_size", 20)
+    # 디스크 상태(인덱스/체크포인트) 없이 매번 전체 수집
+    monkeypatch.setitem(CONF["index"], "enabled", False)
+    monkeypatch.setitem(CONF["checkpoint"], "enabled", False)
+    # 로컬 서버라 호스트 레이트 리미터는 끈다 (공용 limiter 가 같은 dict 를 본다)
+    monkeypatch.setitem(CONF["rate"], "enabled", False)
+    try:
+        yield site, origin
+    finally:
+        server.shutdown()
+
+
+def test_parse_post_html_extracts_fields():
+    site = FixtureSite(posts=1, body_chars=200, latency_ms=0)
+    title, text, tags, published = velog_http.parse_post_html(site.post("post-0"))
+
+    meta = site.post_meta(0)
+    assert title == meta["title"]
+    assert text and meta["title"] not in text
+    assert tags == [meta["tag"]]
+    assert published == meta["iso"]
+
+
+def test_crawls_every_post_from_fixture_server(site):
+    site, origin = site
+    result = asyncio.run(velog_http.crawl_all_with_url(f"{origin}/@bench", "bench"))
+
+    assert result["post_count"] == 45
+    assert result["stats"]["fetched"] == 45
+    assert result["stats"]["failed"] == 0
+    urls = {p["url"] for p in result["posts"]}
+    assert urls == {f"{origin}/@bench/post-{i}" for i in range(45)}
+    post = next(p for p in result["posts"] if p["url"].endswith("/post-3"))
+    assert post["title"] == site.post_meta(3)["title"]
+    assert post["published_at"] == site.post_meta(3)["iso"]
+    assert post["text"] and post["content_hash"]
+
+
+def test_streams_posts_through_on_post(site):
+    _, origin = site
+    got = []
+
+    async def on_post(post):
+        got.append(post["url"])
+
+    result = asyncio.run(velog_http.crawl_all_with_url(f"{origin}/@bench", "bench", on_post=on_post))
+    assert result["posts"] == []
+    assert result["streamed"] == len(got) == 45
+
+
+def test_missing_handle_falls_back():
+    with pytest.raises(velog_http.HttpCrawlError):
+        asyncio.run(velog_http.crawl_all_with_url("https://velog.io/", ""))
+
+
+class _EditableSite(FixtureSite):
+    """글 수정(목록 updated_at + 본문 변경)을 흉내 낼 수 있는 픽스처."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.edited = set()
+
+    def graphql(self, payload):
+        out = super().graphql(payload)
+        for it in (out.get("data") or {}).get("posts") or []:
+            if it["url_slug"] in self.edited:
+                it["updated_at"] = "2099-01-01T00:00:00.000Z"
+        return out
+
+    def post(self, slug):
+        page = super().post(slug)
+        if page is not None and slug in self.edited:
+            page = page.replace("</article>", "<p>수정된 문단</p></article>")
+        return page
+
+
+def test_index_revalidates_edits_beyond_first_page_and_drops_deleted(monkeypatch, tmp_path):
+    site = _EditableSite(posts=45, body_chars=200, latency_ms=0, days_between=1)
+    server, origin = serve(site)
+    monkeypatch.setitem(CONF["http"], "graphql_url", f"{origin}/graphql")
+    monkeypatch.setitem(CONF["http"], "page_size", 20)
+    monkeypatch.setitem(CONF["index"], "enabled", True)
+    monkeypatch.setitem(CONF["index"], "dir", str(tmp_path))
+    monkeypatch.setitem(CONF["checkpoint"], "enabled", False)
+    monkeypatch.setitem(CONF["rate"], "enabled", False)
+
+    def crawl():
+        return asyncio.run(velog_http.crawl_all_with_url(f"{origin}/@bench", "bench"))
+
+    try:
+        assert crawl()["stats"]["fetched"] == 45
+
+        # 재검증 주기 안: 첫 페이지에서 목록을 멈추고 전부 인덱스에서 재사용
+        r = crawl()
+        assert (r["stats"]["fetched"], r["stats"]["reused"]) == (0, 45)
+
+        # 두 번째 페이지 너머의 글 수정 + 가장 오래된 글 삭제, 재검증 주기 경과
+        site.edited.add("post-30")
+        site.total = 44
+        monkeypatch.setitem(CONF["index"], "revalidate_sec", 1e-9)
+        r = crawl()
+        stats = r["stats"]
+        assert stats["fetched"] == 1
+        assert (stats["revalidated"], stats["changed"]) == (44, 1)
+        urls = {p["url"] for p in r["posts"]}
+        assert f"{origin}/@bench/post-44" not in urls
+        assert len(urls) == r["post_count"] == 44
+        edited = next(p for p in r["posts"] if p["url"].endswith("/post-30"))
+        assert "수정된 문단" in edited["text"]
+    finally:
+        server.shutdown()